@@ -0,0 +1,124 @@
+#!/usr/bin/env python
+from __future__ import unicode_literals
+
+# Measures the throughput of HttpFD downloading from a local HTTP server
+
+import multiprocessing
+import optparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from youtube_dl import YoutubeDL
+from youtube_dl.compat import (
+    compat_http_server,
+    compat_socketserver,
+)
+from youtube_dl.downloader.http import HttpFD
+
+CHUNK = b'\0' * (1024 * 1024)
+
+
+class BenchmarkServer(compat_socketserver.ThreadingMixIn, compat_http_server.HTTPServer):
+    daemon_threads = True
+
+
+class BenchmarkRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        size = self.server.size
+        start, end = 0, size
+        range_header = self.headers.get('Range')
+        if range_header:
+            first, last = range_header.split('=')[1].split('-')
+            start, end = int(first), int(last) + 1
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, end - 1, size))
+        else:
+            self.send_response(200)
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', '%d' % (end - start))
+        self.end_headers()
+        try:
+            while start < end:
+                n = min(len(CHUNK), end - start)
+                self.wfile.write(CHUNK[:n])
+                start += n
+        except (IOError, OSError):
+            pass
+
+
+def serve(size, port_queue):
+    httpd = BenchmarkServer(('localhost', 0), BenchmarkRequestHandler)
+    httpd.size = size
+    port_queue.put(httpd.server_address[1])
+    httpd.serve_forever()
+
+
+def cpu_time():
+    return time.process_time() if hasattr(time, 'process_time') else time.clock()
+
+
+def main():
+    parser = optparse.OptionParser(usage='%prog [OPTIONS]')
+    parser.add_option(
+        '--size', type=int, default=512, metavar='MIB',
+        help='Size of the downloaded file in MiB (default is %default)')
+    parser.add_option(
+        '--runs', type=int, default=3,
+        help='Number of downloads (default is %default)')
+    parser.add_option(
+        '--buffer-size', type=int, default=1024, dest='buffersize', metavar='SIZE',
+        help='Initial size of the download buffer (default is %default)')
+    parser.add_option(
+        '--no-resize-buffer', action='store_true', dest='noresizebuffer', default=False,
+        help='Do not adjust the buffer size')
+    parser.add_option(
+        '--http-connections', type=int, default=1, dest='http_connections', metavar='N',
+        help='Number of connections (default is %default)')
+    parser.add_option(
+        '--disk-write-buffer', type=int, dest='disk_write_buffer', metavar='SIZE',
+        help='Write from a separate thread, with up to SIZE bytes buffered')
+    opts, args = parser.parse_args()
+
+    # The server runs in its own process, so that it doesn't take the GIL
+    # from the downloader
+    port_queue = multiprocessing.Queue()
+    server = multiprocessing.Process(target=serve, args=(opts.size * 1024 * 1024, port_queue))
+    server.daemon = True
+    server.start()
+    url = 'http://localhost:%d/file' % port_queue.get()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        filename = os.path.join(tmp_dir, 'file')
+        ydl = YoutubeDL({'quiet': True})
+        params = {
+            'quiet': True,
+            'noprogress': True,
+            'buffersize': opts.buffersize,
+            'noresizebuffer': opts.noresizebuffer,
+            'http_connections': opts.http_connections,
+            'disk_write_buffer': opts.disk_write_buffer,
+        }
+        for run in range(opts.runs):
+            start, start_cpu = time.time(), cpu_time()
+            HttpFD(ydl, params).download(filename, {'url': url})
+            elapsed, cpu = time.time() - start, cpu_time() - start_cpu
+            os.remove(filename)
+            print('run %d: %.1f MiB/s, %.2f s, %.2f s of CPU' % (
+                run + 1, opts.size / elapsed, elapsed, cpu))
+    finally:
+        shutil.rmtree(tmp_dir)
+        server.terminate()
+
+
+if __name__ == '__main__':
+    main()
@@ -31,6 +31,12 @@ def get_params(override=None):
     if os.path.exists(LOCAL_PARAMETERS_FILE):
         with io.open(LOCAL_PARAMETERS_FILE, encoding='utf-8') as pf:
             parameters.update(json.load(pf))
+    # Run the tests offline with responses recorded with YTDL_TEST_CASSETTE_MODE=record
+    if os.environ.get('YTDL_TEST_CASSETTE'):
+        parameters.update({
+            'cassette': os.environ['YTDL_TEST_CASSETTE'],
+            'cassette_mode': os.environ.get('YTDL_TEST_CASSETTE_MODE', 'replay'),
+        })
     if override:
         parameters.update(override)
     return parameters
@@ -0,0 +1,443 @@
+#!/usr/bin/env python
+
+from __future__ import unicode_literals
+
+# Allow direct execution
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import re
+import socket
+import threading
+import time
+
+from test.test_http import FakeLogger, http_server_port
+from youtube_dl import YoutubeDL
+from youtube_dl.compat import (
+    compat_http_client,
+    compat_http_server,
+    compat_socketserver,
+    compat_urllib_error,
+)
+from youtube_dl.downloader import common as downloader_common
+from youtube_dl.downloader.common import (
+    CombinedProgress,
+    FileDownloader,
+    SpeedMeter,
+)
+from youtube_dl.downloader.dash import DashSegmentsFD
+from youtube_dl.downloader import http as downloader_http
+from youtube_dl.downloader.http import HttpFD, _WriterThread
+from youtube_dl.utils import DownloadError
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class TestCombinedProgress(unittest.TestCase):
+    def test_combined_progress(self):
+        reported = []
+        progress = CombinedProgress(reported.append, ['video', 'audio'])
+        video_hook, audio_hook = progress.hook('video'), progress.hook('audio')
+
+        video_hook({
+            'status': 'downloading', 'filename': 'video',
+            'downloaded_bytes': 100, 'total_bytes': 1000,
+            'speed': 10, 'eta': 90, 'elapsed': 10,
+        })
+        self.assertEqual(reported[-1]['status'], 'downloading')
+        self.assertEqual(reported[-1]['downloaded_bytes'], 100)
+        # The audio size is not known yet
+        self.assertTrue('total_bytes' not in reported[-1])
+
+        audio_hook({
+            'status': 'downloading', 'filename': 'audio',
+            'downloaded_bytes': 50, 'total_bytes_estimate': 200,
+            'speed': 5, 'eta': 30, 'elapsed': 10,
+        })
+        self.assertEqual(reported[-1]['downloaded_bytes'], 150)
+        self.assertEqual(reported[-1]['total_bytes_estimate'], 1200)
+        self.assertEqual(reported[-1]['speed'], 15)
+        self.assertEqual(reported[-1]['eta'], 90)
+
+        audio_hook({
+            'status': 'finished', 'filename': 'audio',
+            'downloaded_bytes': 200, 'total_bytes': 200, 'elapsed': 12,
+        })
+        self.assertEqual(reported[-1]['status'], 'downloading')
+        self.assertEqual(reported[-1]['total_bytes'], 1200)
+        self.assertEqual(reported[-1]['speed'], 10)
+
+        video_hook({
+            'status': 'finished', 'filename': 'video',
+            'total_bytes': 1000, 'elapsed': 20,
+        })
+        self.assertEqual(reported[-1], {
+            'status': 'finished',
+            'downloaded_bytes': 1200,
+            'total_bytes': 1200,
+            'speed': None,
+            'eta': None,
+            'elapsed': 20,
+        })
+
+    def test_error(self):
+        reported = []
+        progress = CombinedProgress(reported.append, ['video', 'audio'])
+        progress.hook('video')({'status': 'error'})
+        self.assertEqual(reported, [{'status': 'error'}])
+
+
+class TestProgressThrottling(unittest.TestCase):
+    def _hook_statuses(self, progress_rate):
+        fd = FileDownloader(None, {'progress_rate': progress_rate})
+        fd._progress_hooks = []
+        reported = []
+        fd.add_progress_hook(reported.append)
+        for i in range(100):
+            fd._hook_progress({'status': 'downloading', 'downloaded_bytes': i})
+        fd._hook_progress({'status': 'finished', 'downloaded_bytes': 100})
+        fd._hook_progress({'status': 'error'})
+        return [s['status'] for s in reported]
+
+    def test_progress_rate(self):
+        self.assertEqual(self._hook_statuses(1), ['downloading', 'finished', 'error'])
+        self.assertEqual(self._hook_statuses(0), ['downloading'] * 100 + ['finished', 'error'])
+
+    def test_speed_meter(self):
+        meter = SpeedMeter(window=3)
+        self.assertEqual(meter.update(0, 0), None)
+        for t in range(1, 4):
+            self.assertEqual(meter.update(t, 100 * t), 100)
+        # The first seconds are forgotten
+        for t in range(4, 8):
+            speed = meter.update(t, 300 + 1000 * (t - 3))
+        self.assertEqual(speed, 1000)
+        self.assertEqual(SpeedMeter.eta(5000, speed), 5)
+        self.assertEqual(SpeedMeter.eta(5000, None), None)
+
+
+class FlakyRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        # /<status>-<failures>/...: fails with status the first failures times
+        status, failures = self.path.split('/')[1].split('-')
+        if self.server.requests.count(self.path) <= int(failures):
+            self.send_response(int(status))
+            self.send_header('Retry-After', '0')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        body = self.path.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', '%d' % len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestRetries(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), FlakyRequestHandler)
+        self.httpd.requests = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        testdata_dir = os.path.join(TEST_DIR, 'testdata')
+        if not os.path.exists(testdata_dir):
+            os.mkdir(testdata_dir)
+        self.filename = os.path.join(testdata_dir, 'retries_test.mp4')
+
+    def tearDown(self):
+        if os.path.exists(self.filename):
+            os.remove(self.filename)
+
+    def _download(self, fd_class, info_dict, **params):
+        ydl = YoutubeDL({'logger': FakeLogger(), 'retry_backoff': 0})
+        params = dict({
+            'quiet': True, 'noprogress': True, 'retries': 2, 'fragment_retries': 2,
+        }, **params)
+        return fd_class(ydl, params).download(self.filename, info_dict)
+
+    def _read(self):
+        with open(self.filename, 'rb') as f:
+            return f.read()
+
+    def test_http(self):
+        url = 'http://localhost:%d/503-2/video' % self.port
+        self.assertTrue(self._download(HttpFD, {'url': url}))
+        self.assertEqual(self._read(), b'/503-2/video')
+        self.assertEqual(len(self.httpd.requests), 3)
+        os.remove(self.filename)
+
+        url = 'http://localhost:%d/403-1/video' % self.port
+        self.assertRaises(
+            compat_urllib_error.HTTPError, self._download, HttpFD, {'url': url})
+
+    def test_dash_segments(self):
+        base_url = 'http://localhost:%d' % self.port
+        self.assertTrue(self._download(DashSegmentsFD, {
+            'url': base_url,
+            'segment_urls': ['404-2/seg0', '429-1/seg1'],
+        }))
+        self.assertEqual(self._read(), b'/404-2/seg0/429-1/seg1')
+        self.assertEqual(len(self.httpd.requests), 5)
+
+    def test_fragment_retries(self):
+        base_url = 'http://localhost:%d' % self.port
+        # Only fragment_retries applies to the fragments
+        self.assertTrue(self._download(DashSegmentsFD, {
+            'url': base_url,
+            'segment_urls': ['503-2/seg0'],
+        }, retries=0))
+        self.assertEqual(self._read(), b'/503-2/seg0')
+        os.remove(self.filename)
+        self.assertRaises(DownloadError, self._download, DashSegmentsFD, {
+            'url': base_url,
+            'segment_urls': ['503-3/seg0'],
+        }, retries=10)
+        self.assertEqual(len(self.httpd.requests), 6)
+
+    def test_fragments_sleep_interval(self):
+        ydl = YoutubeDL({'logger': FakeLogger(), 'sleep_interval': 1})
+        params = {'quiet': True, 'noprogress': True, 'sleep_interval': 1}
+        start = time.time()
+        # Only the first download from the host could sleep, the fragments don't
+        self.assertTrue(DashSegmentsFD(ydl, params).download(self.filename, {
+            'url': 'http://localhost:%d/' % self.port,
+            'segment_urls': ['404-0/seg0', '404-0/seg1', '404-0/seg2'],
+        }))
+        self.assertTrue(time.time() - start < 1)
+
+    def test_preallocated_dash_segments(self):
+        base_url = 'http://localhost:%d' % self.port
+        # The size estimated from the first segment is too big
+        self.assertTrue(self._download(DashSegmentsFD, {
+            'url': base_url,
+            'segment_urls': ['404-0/segment0', '404-0/s1'],
+        }, preallocate=True))
+        self.assertEqual(self._read(), b'/404-0/segment0/404-0/s1')
+
+
+RANGES_DATA = (bytes(bytearray(range(251))) * 33)[:8200]
+
+
+class ThreadingHTTPServer(compat_socketserver.ThreadingMixIn, compat_http_server.HTTPServer):
+    daemon_threads = True
+
+
+class RangeRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        range_header = self.headers.get('Range')
+        self.server.requests.append((self.path, range_header))
+        range_m = re.match(r'bytes=(\d+)-(\d+)', range_header or '')
+        if range_m and self.path != '/no-ranges':
+            start, end = int(range_m.group(1)), int(range_m.group(2)) + 1
+            self.send_response(206)
+            self.send_header('Content-Range', 'bytes %d-%d/%d' % (start, end - 1, len(RANGES_DATA)))
+        else:
+            start, end = 0, len(RANGES_DATA)
+            self.send_response(200)
+        if self.path != '/no-ranges':
+            self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('Content-Type', 'video/mp4')
+        self.send_header('Content-Length', '%d' % (end - start))
+        self.end_headers()
+        if self.path == '/interrupted' and len(self.server.requests) == 1:
+            # The connection is lost in the middle of the first download
+            self.wfile.write(RANGES_DATA[:3000])
+            return
+        # The whole file is sent slowly from /slow
+        chunk_size = 512 if self.path == '/slow' and not range_m else end - start
+        try:
+            for pos in range(start, end, chunk_size):
+                self.wfile.write(RANGES_DATA[pos:min(pos + chunk_size, end)])
+                if chunk_size < end - start:
+                    time.sleep(0.05)
+        except socket.error:
+            # The client stopped reading a range that was split
+            pass
+
+
+class SmallRangesFD(HttpFD):
+    _MIN_RANGE_SIZE = 1024
+
+
+class TestSegmentedDownload(unittest.TestCase):
+    def setUp(self):
+        self.httpd = ThreadingHTTPServer(('localhost', 0), RangeRequestHandler)
+        self.httpd.requests = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        testdata_dir = os.path.join(TEST_DIR, 'testdata')
+        if not os.path.exists(testdata_dir):
+            os.mkdir(testdata_dir)
+        self.filename = os.path.join(testdata_dir, 'segmented_test.mp4')
+
+    def tearDown(self):
+        for fn in (self.filename, self.filename + '.part', self.filename + '.part.ranges'):
+            if os.path.exists(fn):
+                os.remove(fn)
+
+    def _download(self, path, connections, **params):
+        ydl = YoutubeDL({'logger': FakeLogger(), 'retry_backoff': 0})
+        params.update({'quiet': True, 'noprogress': True, 'http_connections': connections})
+        url = 'http://localhost:%d%s' % (self.port, path)
+        self.assertTrue(SmallRangesFD(ydl, params).download(self.filename, {'url': url}))
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read(), RANGES_DATA)
+        self.assertFalse(os.path.exists(self.filename + '.part.ranges'))
+        return sorted(
+            (r for _, r in self.httpd.requests if r),
+            key=lambda r: int(r[len('bytes='):].split('-')[0]))
+
+    def test_segmented(self):
+        ranges = self._download('/video', 4)
+        # The first range is read from the response without a Range header,
+        # the others can be split again when a connection is done first
+        for r in ['bytes=2050-4099', 'bytes=4100-6149', 'bytes=6150-8199']:
+            self.assertTrue(r in ranges)
+        self.assertFalse(any(r.startswith('bytes=0-') for r in ranges))
+
+    def test_no_ranges(self):
+        self.assertEqual(self._download('/no-ranges', 4), [])
+        self.assertEqual(len(self.httpd.requests), 1)
+
+    def test_disk_write_buffer(self):
+        # Written from another thread, two blocks at a time
+        self._download('/no-ranges', 1, disk_write_buffer=2048, buffersize=1024)
+
+    def test_preallocate(self):
+        # A single range, read from the first response
+        self.assertEqual(self._download('/video', 1, preallocate=True), [])
+        self.assertEqual(self._download('/no-ranges', 1, preallocate=True), [])
+
+    def test_resume_preallocated(self):
+        ydl = YoutubeDL({'logger': FakeLogger(), 'retry_backoff': 0})
+        params = {'quiet': True, 'noprogress': True, 'preallocate': True, 'retries': 0}
+        url = 'http://localhost:%d/interrupted' % self.port
+        self.assertRaises(
+            compat_http_client.IncompleteRead, HttpFD(ydl, params).download, self.filename, {'url': url})
+        self.assertEqual(os.path.getsize(self.filename + '.part'), len(RANGES_DATA))
+        # Resumed without --preallocate
+        self.assertEqual(self._download('/interrupted', 1), ['bytes=3000-8199'])
+
+    def test_disk_full(self):
+        free_disk_space = downloader_common.free_disk_space
+        downloader_common.free_disk_space = lambda filename: 8000
+        try:
+            ydl = YoutubeDL({'logger': FakeLogger(), 'ignoreerrors': True})
+            params = {'quiet': True, 'noprogress': True, 'preallocate': True}
+            for path in ('/video', '/no-ranges'):
+                url = 'http://localhost:%d%s' % (self.port, path)
+                self.assertFalse(HttpFD(ydl, params).download(self.filename, {'url': url}))
+                for fn in (self.filename, self.filename + '.part', self.filename + '.part.ranges'):
+                    self.assertFalse(os.path.exists(fn))
+        finally:
+            downloader_common.free_disk_space = free_disk_space
+
+    def test_work_stealing(self):
+        ranges = self._download('/slow', 2)
+        # The second connection took over a part of the slow first range
+        self.assertEqual(ranges[-1], 'bytes=4100-8199')
+        self.assertTrue(len(ranges) > 1)
+        self.assertTrue(all(int(r[len('bytes='):].split('-')[0]) < 4100 for r in ranges[:-1]))
+
+    def _write_part(self, state):
+        with open(self.filename + '.part', 'wb') as f:
+            f.write(RANGES_DATA[:3000])
+            f.write(b'\0' * 1100)
+            f.write(RANGES_DATA[4100:])
+        with open(self.filename + '.part.ranges', 'w') as f:
+            f.write(state)
+
+    def test_resume(self):
+        state = '{"size": 8200, "ranges": [[0, 3000, 4100], [4100, 8200, 8200]]}'
+        self._write_part(state)
+        # The remaining 1100 bytes are too few to be split
+        self.assertEqual(self._download('/video', 2), ['bytes=3000-4099'])
+
+        # Resumed from its state, not from the size of the .part file, with
+        # a single connection too
+        self.httpd.requests = []
+        os.remove(self.filename)
+        self._write_part(state)
+        self.assertEqual(self._download('/video', 1), ['bytes=3000-4099'])
+
+    def test_resume_invalid_state(self):
+        # The file changed on the server, the download is started over
+        self._write_part('{"size": 9000, "ranges": [[0, 3000, 4100], [4100, 9000, 9000]]}')
+        self.assertEqual(self._download('/video', 1), ['bytes=3000-4099'])
+        self.assertEqual(len(self.httpd.requests), 2)
+
+        self.httpd.requests = []
+        os.remove(self.filename)
+        self._write_part('{"size": 8200, "ranges": ')
+        self.assertEqual(self._download('/video', 1), [])
+        self.assertEqual(len(self.httpd.requests), 1)
+
+
+class SlowStream(object):
+    def __init__(self, fail_after=None, error=IOError('No space left on device')):
+        self.data = b''
+        self.fail_after = fail_after
+        self.error = error
+
+    def write(self, data):
+        if self.fail_after is not None and len(self.data) >= self.fail_after:
+            raise self.error
+        time.sleep(0.01)
+        self.data += bytes(bytearray(data))
+
+
+class TestWriterThread(unittest.TestCase):
+    def _write(self, writer, count):
+        for i in range(count):
+            buf = writer.get_buffer(100)
+            self.assertTrue(writer._allocated <= 300)
+            buf[:100] = bytes(bytearray([i])) * 100
+            writer.write(buf, 100)
+
+    def test_writer_thread(self):
+        stream = SlowStream()
+        writer = _WriterThread(300)
+        writer.start(stream)
+        self._write(writer, 20)
+        self.assertEqual(writer.close(), None)
+        self.assertEqual(stream.data, b''.join(bytes(bytearray([i])) * 100 for i in range(20)))
+
+    def test_without_memoryview(self):
+        # Python 2.6
+        old_memoryview = downloader_http.compat_memoryview
+        downloader_http.compat_memoryview = None
+        try:
+            self.test_writer_thread()
+        finally:
+            downloader_http.compat_memoryview = old_memoryview
+
+    def test_error(self):
+        writer = _WriterThread(300)
+        writer.start(SlowStream(fail_after=500))
+        self.assertRaises(IOError, self._write, writer, 20)
+        self.assertTrue(isinstance(writer.close(), IOError))
+
+    def test_unexpected_error(self):
+        writer = _WriterThread(300)
+        writer.start(SlowStream(fail_after=500, error=ValueError('closed file')))
+        self.assertRaises(ValueError, self._write, writer, 20)
+        self.assertTrue(isinstance(writer.close(), ValueError))
+
+
+if __name__ == '__main__':
+    unittest.main()
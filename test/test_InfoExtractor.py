@@ -10,7 +10,10 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from test.helper import FakeYDL
 from youtube_dl.extractor.common import InfoExtractor
-from youtube_dl.extractor import YoutubeIE, get_info_extractor
+from youtube_dl.extractor import YoutubeIE, get_info_extractor, gen_extractor_classes
+from youtube_dl.extractor.dailymotion import DailymotionIE
+from youtube_dl.extractor.generic import _EmbedNeedles
+from youtube_dl.extractor.vimeo import VimeoIE
 from youtube_dl.utils import encode_data_uri, strip_jsonp, ExtractorError, RegexNotFoundError
 
 
@@ -84,5 +87,17 @@ class TestInfoExtractor(unittest.TestCase):
         self.assertRaises(ExtractorError, self.ie._download_json, uri, None)
         self.assertEqual(self.ie._download_json(uri, None, fatal=False), None)
 
+    def test_embed_needles(self):
+        for ie in gen_extractor_classes():
+            for needle in ie._EMBED_NEEDLES or []:
+                self.assertEqual(needle, needle.lower(), ie.ie_key())
+
+        webpage = '<IFRAME SRC="https://player.Vimeo.com/video/12345"></iframe>'
+        needles = _EmbedNeedles(webpage)
+        self.assertTrue(needles.hit(VimeoIE))
+        self.assertFalse(needles.hit(DailymotionIE, 'wistia'))
+        self.assertTrue(needles.hit('wistia', 'player.vimeo.com'))
+        self.assertTrue(needles.hit(TestIE))
+
 if __name__ == '__main__':
     unittest.main()
@@ -9,6 +9,9 @@ import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import copy
+import re
+import threading
+import time
 
 from test.helper import FakeYDL, assertRegexpMatches
 from youtube_dl import YoutubeDL
@@ -16,7 +19,7 @@ from youtube_dl.compat import compat_str, compat_urllib_error
 from youtube_dl.extractor import YoutubeIE
 from youtube_dl.extractor.common import InfoExtractor
 from youtube_dl.postprocessor.common import PostProcessor
-from youtube_dl.utils import ExtractorError, match_filter_func
+from youtube_dl.utils import ExtractorError, match_filter_func, MaxDownloadsReached, OnDemandPagedList
 
 TEST_URL = 'http://localhost/sample.mp4'
 
@@ -695,6 +698,216 @@ class TestYoutubeDL(unittest.TestCase):
         result = get_ids({'playlist_items': '10'})
         self.assertEqual(result, [])
 
+    def test_lazy_playlist(self):
+        def get_entries():
+            for i in range(1, 10):
+                read.append(i)
+                yield {
+                    'id': compat_str(i),
+                    'title': compat_str(i),
+                    'url': TEST_URL,
+                    'formats': [{'url': TEST_URL}],
+                }
+
+        def process_playlist(params):
+            ydl = YDL(dict(params, lazy_playlist=True, outtmpl='%(playlist_index)s'))
+            res = ydl.process_ie_result({
+                '_type': 'playlist',
+                'id': 'test',
+                'entries': get_entries(),
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+            })
+            return ydl, res
+
+        read = []
+        ydl, res = process_playlist({'playlist_items': '4,2-3'})
+        self.assertEqual(read, [1, 2, 3, 4])
+        self.assertEqual([v['id'] for v in ydl.downloaded_info_dicts], ['2', '3', '4'])
+        self.assertEqual(ydl.downloaded_info_dicts[0]['n_entries'], None)
+        self.assertEqual(ydl.prepare_filename(ydl.downloaded_info_dicts[0]), '1')
+        # Only a summary of the processed entries is kept
+        self.assertEqual(res['entries'][0], {
+            'id': '2',
+            'title': '2',
+            'extractor': 'test:playlist',
+            'extractor_key': 'test:playlist',
+            'webpage_url': 'http://example.com',
+            'playlist_index': 1,
+        })
+
+        read = []
+        ydl, res = process_playlist({'playliststart': 2, 'playlistend': 3, 'dump_single_json': True})
+        self.assertEqual(read, [1, 2, 3])
+        self.assertEqual([v['id'] for v in ydl.downloaded_info_dicts], ['2', '3'])
+        self.assertTrue('formats' in res['entries'][0])
+
+    def test_concurrent_entries(self):
+        class SimulateYDL(YDL):
+            def process_info(self, info_dict):
+                super(YDL, self).process_info(info_dict)
+                self.downloaded_info_dicts.append(info_dict)
+
+        class SlowIE(InfoExtractor):
+            _VALID_URL = r'slow:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                # Later entries finish first
+                time.sleep(0.01 * (5 - int(video_id)))
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        def make_playlist():
+            return {
+                '_type': 'playlist',
+                'id': 'test',
+                'entries': [{
+                    '_type': 'url',
+                    'url': 'slow:%d' % i,
+                    'ie_key': 'Slow',
+                } for i in range(1, 5)],
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+            }
+
+        def make_ydl(params):
+            params = dict(params, simulate=True, concurrent_entries=4)
+            ydl = SimulateYDL(params)
+            ydl.add_info_extractor(SlowIE(ydl))
+            return ydl
+
+        ydl = make_ydl({'playliststart': 2})
+        res = ydl.process_ie_result(make_playlist())
+        self.assertEqual(
+            [(e['id'], e['playlist_index']) for e in res['entries']],
+            [('2', 2), ('3', 3), ('4', 4)])
+        self.assertEqual(len(ydl.downloaded_info_dicts), 3)
+
+        ydl = make_ydl({'max_downloads': 2})
+        self.assertRaises(
+            MaxDownloadsReached, ydl.process_ie_result, make_playlist())
+        self.assertEqual(len(ydl.downloaded_info_dicts), 2)
+
+    def test_stop_after_archived(self):
+        archive_fn = os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'testdata', 'archive_ydl_test.txt')
+        if not os.path.exists(os.path.dirname(archive_fn)):
+            os.mkdir(os.path.dirname(archive_fn))
+        with open(archive_fn, 'w') as f:
+            f.write(''.join('foo %d\n' % i for i in range(3, 10)))
+        self.addCleanup(os.remove, archive_fn)
+
+        class FooIE(InfoExtractor):
+            _VALID_URL = r'foo:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                extracted.append(video_id)
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        def get_page(pagenum):
+            fetched_pages.append(pagenum)
+            for i in range(pagenum * 2, min(pagenum * 2 + 2, 11)):
+                # Neither the id nor the extractor are known for some entries
+                entry = {'_type': 'url', 'url': 'foo:%d' % i}
+                if i % 2:
+                    entry['ie_key'] = 'Foo'
+                yield entry
+
+        def process_playlist(**params):
+            ydl = YDL(dict(params, download_archive=archive_fn))
+            ydl.add_info_extractor(FooIE(ydl))
+            return ydl.process_ie_result({
+                '_type': 'playlist',
+                'id': 'test',
+                'entries': OnDemandPagedList(get_page, 2),
+                'extractor': 'test:playlist',
+                'extractor_key': 'test:playlist',
+                'webpage_url': 'http://example.com',
+            })
+
+        # Archived entries are skipped before they are extracted
+        extracted, fetched_pages = [], []
+        res = process_playlist()
+        self.assertEqual(extracted, ['0', '1', '2', '10'])
+        self.assertEqual([e['id'] for e in res['entries']], extracted)
+        self.assertEqual(fetched_pages, [0, 1, 2, 3, 4, 5])
+
+        extracted, fetched_pages = [], []
+        res = process_playlist(stop_after_archived=3)
+        self.assertEqual(extracted, ['0', '1', '2'])
+        self.assertEqual(fetched_pages, [0, 1, 2])
+
+        extracted, fetched_pages = [], []
+        # Entries that other workers started are not in the results
+        res = process_playlist(stop_after_archived=3, concurrent_entries=3)
+        self.assertEqual([e['id'] for e in res['entries']], ['0', '1', '2'])
+
+    def test_pipeline(self):
+        class PipelineYDL(YDL):
+            def process_info(self, info_dict):
+                super(YDL, self).process_info(info_dict)
+
+            def _download_info(self, info_dict):
+                time.sleep(0.01)
+                self.downloaded_info_dicts.append(info_dict)
+                self._postprocess_queue.put((info_dict['_filename'], info_dict))
+
+            def _post_process_info(self, filename, info_dict):
+                self.postprocessed.append(info_dict['id'])
+
+        class FooIE(InfoExtractor):
+            _VALID_URL = r'foo:(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                video_id = self._match_id(url)
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        def download(urls, **params):
+            ydl = PipelineYDL(dict(params, outtmpl='%(id)s', pipeline=(2, 2, 1)))
+            ydl.postprocessed = []
+            ydl.add_info_extractor(FooIE(ydl))
+            try:
+                YoutubeDL.download(ydl, urls)
+            finally:
+                self.assertEqual(ydl._download_queue, None)
+                self.assertEqual(
+                    sorted(v['id'] for v in ydl.downloaded_info_dicts),
+                    sorted(ydl.postprocessed))
+            return ydl
+
+        urls = ['foo:%d' % i for i in range(10)]
+        ydl = download(urls)
+        self.assertEqual(sorted(ydl.postprocessed), sorted(compat_str(i) for i in range(10)))
+
+        self.assertRaises(MaxDownloadsReached, download, urls, max_downloads=3)
+
+    def test_jobs(self):
+        class SlowIE(InfoExtractor):
+            _VALID_URL = r'https?://(?P<host>[^/]+)/(?P<id>\d+)'
+
+            def _real_extract(self, url):
+                host, video_id = re.match(self._VALID_URL, url).groups()
+                with lock:
+                    running.append(host)
+                    max_running[host] = max(max_running.get(host, 0), running.count(host))
+                time.sleep(0.05)
+                with lock:
+                    running.remove(host)
+                return _make_result([{'url': TEST_URL}], id=video_id, title=video_id)
+
+        lock = threading.Lock()
+        running, max_running = [], {}
+        ydl = YDL({'jobs': 4, 'jobs_per_host': 2, 'outtmpl': '%(id)s'})
+        ydl.add_info_extractor(SlowIE(ydl))
+        urls = ['http://%s.example.com/%d' % (host, i) for i in range(3) for host in 'ab']
+        self.assertEqual(YoutubeDL.download(ydl, urls), 0)
+        self.assertEqual(
+            sorted(v['id'] for v in ydl.downloaded_info_dicts), sorted('001122'))
+        self.assertEqual(max_running, {'a.example.com': 2, 'b.example.com': 2})
+
     def test_urlopen_no_file_protocol(self):
         # see https://github.com/rg3/youtube-dl/issues/8227
         ydl = YDL()
@@ -17,6 +17,7 @@ from youtube_dl.extractor import (
     gen_extractors,
     YoutubeIE,
 )
+from youtube_dl.extractor.dispatch import ExtractorDispatchIndex
 
 
 class TestAllURLsMatching(unittest.TestCase):
@@ -138,6 +139,24 @@ class TestAllURLsMatching(unittest.TestCase):
                 len(ie_list), 1,
                 'Multiple extractors with the same IE_NAME "%s" (%s)' % (ie_name, ', '.join(ie_list)))
 
+    def test_dispatch_index(self):
+        index = ExtractorDispatchIndex(self.ies)
+        urls = [tc['url'] for tc in gettestcases(include_onlymatching=True)]
+        urls.extend([
+            ':ytsubs', 'PL63F0C78739B09958', 'BaW_jenozKc',
+            'HTTPS://WWW.YOUTUBE.COM/watch?v=BaW_jenozKc',
+            '//www.youtube.com/embed/BaW_jenozKc',
+            'http://tatianamaslanydaily.tumblr.com/post/54196191430',
+            'http://video.pbs.org/viralplayer/2365173446/',
+            'https://vimeo.com/channels/31259/53576664',
+            'http://example.com/\u00e4\u00f6\u00fc.mp4',
+        ])
+        for url in urls:
+            self.assertEqual(
+                [ie.IE_NAME for ie in index.candidates(url) if ie.suitable(url)],
+                [ie.IE_NAME for ie in self.ies if ie.suitable(url)],
+                'Dispatch index and linear scan disagree for %r' % url)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from __future__ import unicode_literals
+
+import io
+
+# Allow direct execution
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from youtube_dl.archive import DownloadArchive
+
+
+class TestDownloadArchive(unittest.TestCase):
+    def setUp(self):
+        TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+        TESTDATA_DIR = os.path.join(TEST_DIR, 'testdata')
+        if not os.path.exists(TESTDATA_DIR):
+            os.mkdir(TESTDATA_DIR)
+        self.fn = os.path.join(TESTDATA_DIR, 'archive_test.txt')
+        self.tearDown()
+
+    def tearDown(self):
+        if os.path.exists(self.fn):
+            os.remove(self.fn)
+
+    def _append(self, data):
+        with io.open(self.fn, 'a', encoding='utf-8') as f:
+            f.write(data)
+
+    def test_archive(self):
+        archive = DownloadArchive(self.fn)
+        self.assertFalse('youtube BaW_jenozKc' in archive)
+
+        archive.add('youtube BaW_jenozKc')
+        self.assertTrue('youtube BaW_jenozKc' in archive)
+        with io.open(self.fn, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'youtube BaW_jenozKc\n')
+
+        # Lines appended by another process
+        self._append('vimeo 56015672\nvimeo 6801')
+        self.assertTrue('vimeo 56015672' in archive)
+        self.assertFalse('vimeo 6801' in archive)
+        self._append('3\n')
+        self.assertTrue('vimeo 68013' in archive)
+        self.assertTrue('youtube BaW_jenozKc' in DownloadArchive(self.fn))
+
+        # The file is replaced
+        os.remove(self.fn)
+        self.assertFalse('vimeo 56015672' in archive)
+        self._append('ärchive id\n')
+        self.assertTrue('ärchive id' in archive)
+        self.assertFalse('youtube BaW_jenozKc' in archive)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import shutil
+import threading
+import time
+
+from test.test_http import FakeLogger, _gzip, http_server_port
+from youtube_dl import YoutubeDL
+from youtube_dl.compat import (
+    compat_http_server,
+    compat_urllib_error,
+)
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CASSETTE_DIR = os.path.join(TEST_DIR, 'testdata', 'cassette_test')
+
+
+class CassetteTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == '/redirect':
+            self.send_response(302)
+            self.send_header('Location', '/page')
+            self.end_headers()
+            return
+        if self.path == '/missing':
+            body = b'not found'
+            self.send_response(404)
+        else:
+            body = ('%s %d' % (self.path, len(self.server.requests))).encode('utf-8')
+            self.send_response(200)
+        if self.path == '/gzip':
+            body = _gzip(body)
+            self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', '%d' % len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists(CASSETTE_DIR):
+            shutil.rmtree(CASSETTE_DIR)
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), CassetteTestRequestHandler)
+        self.httpd.requests = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        if os.path.exists(CASSETTE_DIR):
+            shutil.rmtree(CASSETTE_DIR)
+
+    def _fetch_all(self, ydl):
+        url = 'http://localhost:%d' % self.port
+        results = [
+            ydl.urlopen(url + '/page').read(),
+            ydl.urlopen(url + '/page').read(),
+            ydl.urlopen(url + '/gzip').read(),
+            ydl.urlopen(url + '/redirect').read(),
+        ]
+        try:
+            ydl.urlopen(url + '/missing')
+        except compat_urllib_error.HTTPError as err:
+            results.append((err.code, err.read()))
+        return results
+
+    def test_record_and_replay(self):
+        ydl = YoutubeDL({
+            'logger': FakeLogger(),
+            'cassette': CASSETTE_DIR,
+            'cassette_mode': 'record',
+        })
+        recorded = self._fetch_all(ydl)
+        self.assertEqual(recorded, [
+            b'/page 1', b'/page 2', b'/gzip 3', b'/page 5', (404, b'not found')])
+        self.assertEqual(len(self.httpd.requests), 6)
+
+        ydl = YoutubeDL({
+            'logger': FakeLogger(),
+            'cassette': CASSETTE_DIR,
+            'cassette_latency': 0.05,
+        })
+        start = time.time()
+        self.assertEqual(self._fetch_all(ydl), recorded)
+        self.assertTrue(time.time() - start >= 0.3)
+        # Nothing was sent to the server
+        self.assertEqual(len(self.httpd.requests), 6)
+
+        self.assertRaises(
+            compat_urllib_error.URLError, ydl.urlopen,
+            'http://localhost:%d/other' % self.port)
+
+    def test_replay_rate(self):
+        url = 'http://localhost:%d/page' % self.port
+        ydl = YoutubeDL({
+            'logger': FakeLogger(),
+            'cassette': CASSETTE_DIR,
+            'cassette_mode': 'record',
+        })
+        self.assertEqual(ydl.urlopen(url).read(), b'/page 1')
+
+        ydl = YoutubeDL({
+            'logger': FakeLogger(),
+            'cassette': CASSETTE_DIR,
+            'cassette_rate': 35,
+        })
+        start = time.time()
+        # Each body takes 0.2 seconds
+        for _ in range(3):
+            self.assertEqual(ydl.urlopen(url).read(), b'/page 1')
+        self.assertTrue(time.time() - start >= 0.35)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -9,9 +9,19 @@ import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from youtube_dl import YoutubeDL
-from youtube_dl.compat import compat_http_server, compat_urllib_request
+from youtube_dl.compat import (
+    compat_http_client,
+    compat_http_server,
+    compat_urllib_request,
+)
+from youtube_dl.extractor.common import InfoExtractor
+from youtube_dl.utils import ExtractorError, _DecompressingReader
+import gzip
+import io
 import ssl
 import threading
+import time
+import zlib
 
 TEST_DIR = os.path.dirname(os.path.abspath(__file__))
 
@@ -25,6 +35,24 @@ def http_server_port(httpd):
     return sock.getsockname()[1]
 
 
+def _gzip(data):
+    buf = io.BytesIO()
+    f = gzip.GzipFile(fileobj=buf, mode='wb')
+    f.write(data)
+    f.close()
+    return buf.getvalue()
+
+
+_CONTENT = b'0123456789' * 10000
+_ENCODED_CONTENTS = {
+    'gzip': ('gzip', _gzip(_CONTENT)),
+    'gzip-junk': ('gzip', _gzip(_CONTENT) + b'\x00junk'),
+    'gzip-members': ('gzip', _gzip(_CONTENT[:50000]) + _gzip(_CONTENT[50000:])),
+    'deflate': ('deflate', zlib.compress(_CONTENT)),
+    'deflate-raw': ('deflate', zlib.compress(_CONTENT)[2:-4]),
+}
+
+
 class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
     def log_message(self, format, *args):
         pass
@@ -51,6 +79,13 @@ class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
             self.send_response(302)
             self.send_header(b'Location', new_url.encode('utf-8'))
             self.end_headers()
+        elif self.path.startswith('/encoded/'):
+            encoding, data = _ENCODED_CONTENTS[self.path[len('/encoded/'):]]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain')
+            self.send_header('Content-Encoding', encoding)
+            self.end_headers()
+            self.wfile.write(data)
         elif self.path == '/%E4%B8%AD%E6%96%87.html':
             self.send_response(200)
             self.send_header('Content-Type', 'text/html; charset=utf-8')
@@ -71,6 +106,33 @@ class FakeLogger(object):
         pass
 
 
+class TestDecompressingReader(unittest.TestCase):
+    def test_small_reads(self):
+        size = 16 * 1024 * 1024
+        reader = _DecompressingReader(io.BytesIO(_gzip(b'\0' * size)), 'gzip')
+        buf = bytearray(1024)
+        total = 0
+        while True:
+            n = reader.readinto(buf)
+            if not n:
+                break
+            total += n
+            # Highly compressed data is decoded a chunk at a time
+            self.assertTrue(len(reader._buf) <= reader._CHUNK_SIZE)
+        self.assertEqual(total, size)
+
+    def test_invalid_data(self):
+        reader = _DecompressingReader(io.BytesIO(b'\x78\x9c\xff\xff\xff\xff'), 'deflate')
+        self.assertRaises(IOError, reader.read)
+
+    def test_truncated_data(self):
+        if not hasattr(zlib.decompressobj(), 'eof'):  # Python < 3.3
+            return
+        for encoding, data in (('gzip', _gzip(_CONTENT)), ('deflate', zlib.compress(_CONTENT))):
+            reader = _DecompressingReader(io.BytesIO(data[:len(data) // 2]), encoding)
+            self.assertRaises(IOError, reader.read)
+
+
 class TestHTTP(unittest.TestCase):
     def setUp(self):
         self.httpd = compat_http_server.HTTPServer(
@@ -90,6 +152,145 @@ class TestHTTP(unittest.TestCase):
         self.assertEqual(r['url'], 'http://localhost:%d/vid.mp4' % self.port)
 
 
+class TestContentEncoding(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), HTTPTestRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def test_decoding(self):
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        for name in sorted(_ENCODED_CONTENTS):
+            resp = ydl.urlopen('http://localhost:%d/encoded/%s' % (self.port, name))
+            self.assertEqual(resp.headers.get('Content-Encoding'), None)
+            self.assertEqual(resp.read(10), _CONTENT[:10], name)
+            self.assertEqual(resp.read(), _CONTENT[10:], name)
+            resp.close()
+
+
+class SlowRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        time.sleep(0.2)
+        self.send_response(404 if self.path == '/missing' else 200)
+        self.send_header('Content-Type', 'text/plain')
+        self.end_headers()
+        self.wfile.write(self.path.encode('utf-8'))
+
+
+class TestRequestCoalescing(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), SlowRequestHandler)
+        self.httpd.requests = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def _download_concurrently(self, path):
+        ydl = YoutubeDL({'logger': FakeLogger(), 'quiet': True})
+        ie = InfoExtractor(ydl)
+        results = []
+
+        def download():
+            try:
+                results.append(ie._download_webpage(
+                    'http://localhost:%d%s' % (self.port, path), None))
+            except ExtractorError as e:
+                results.append(e.cause.read())
+
+        threads = [threading.Thread(target=download) for _ in range(3)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_coalescing(self):
+        self.assertEqual(self._download_concurrently('/page'), ['/page'] * 3)
+        self.assertEqual(self.httpd.requests, ['/page'])
+
+        # Each caller gets its own error, with its own body
+        self.assertEqual(self._download_concurrently('/missing'), [b'/missing'] * 3)
+        self.assertEqual(self.httpd.requests, ['/page', '/missing'])
+
+
+class KeepAliveRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        payload = ('%d\n' % self.client_address[1]).encode('ascii') * 100
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        if self.path == '/chunked':
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for i in range(0, len(payload), 128):
+                chunk = payload[i:i + 128]
+                self.wfile.write(b'%x\r\n' % len(chunk) + chunk + b'\r\n')
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', '%d' % len(payload))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    def do_POST(self):
+        self.server.posts.append(self.rfile.read(int(self.headers['Content-Length'])))
+        # Closed without an answer, as if it was idle for too long
+        self.close_connection = True
+
+
+class TestHTTPKeepAlive(unittest.TestCase):
+    def setUp(self):
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), KeepAliveRequestHandler)
+        self.httpd.posts = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def test_keep_alive(self):
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        url = 'http://localhost:%d/' % self.port
+
+        def client_port(path=''):
+            return ydl.urlopen(url + path).read().split(b'\n')[0]
+
+        first = client_port()
+        # The connection is reused once the body was read
+        self.assertEqual(client_port(), first)
+        if sys.version_info >= (3, 0):
+            self.assertEqual(client_port('chunked'), first)
+
+        # Responses that are closed early close their connection
+        resp = ydl.urlopen(url)
+        resp.read(10)
+        resp.close()
+        self.assertNotEqual(client_port(), first)
+
+    def test_no_post_retry(self):
+        ydl = YoutubeDL({'logger': FakeLogger()})
+        url = 'http://localhost:%d/' % self.port
+        ydl.urlopen(url).read()
+        # The server may have processed the request, it isn't sent again
+        # on a new connection
+        self.assertRaises(
+            compat_http_client.BadStatusLine, ydl.urlopen,
+            compat_urllib_request.Request(url + 'post', data=b'data'))
+        self.assertEqual(self.httpd.posts, [b'data'])
+
+
 class TestHTTPS(unittest.TestCase):
     def setUp(self):
         certfn = os.path.join(TEST_DIR, 'testcert.pem')
@@ -113,6 +314,16 @@ class TestHTTPS(unittest.TestCase):
         r = ydl.extract_info('https://localhost:%d/video.html' % self.port)
         self.assertEqual(r['url'], 'https://localhost:%d/vid.mp4' % self.port)
 
+    def test_session_resumption(self):
+        if not hasattr(ssl.SSLSocket, 'session'):  # Python < 3.6
+            return
+        ydl = YoutubeDL({'logger': FakeLogger(), 'nocheckcertificate': True})
+        # The server closes each connection, so every request does a handshake
+        for _ in range(3):
+            ydl.urlopen('https://localhost:%d/video.html' % self.port).read()
+        self.assertEqual(ydl.ssl_session_cache.full, 1)
+        self.assertEqual(ydl.ssl_session_cache.resumed, 2)
+
 
 def _build_proxy_handler(name):
     class HTTPTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+# coding: utf-8
+from __future__ import unicode_literals
+
+# Allow direct execution
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import gzip
+import io
+import shutil
+import threading
+
+from test.test_http import FakeLogger, http_server_port
+from youtube_dl import YoutubeDL
+from youtube_dl.compat import compat_http_server
+from youtube_dl.extractor.common import InfoExtractor
+from youtube_dl.http_cache import HTTPCache
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(TEST_DIR, 'testdata', 'http_cache_test')
+
+
+def _gzip(data):
+    buf = io.BytesIO()
+    f = gzip.GzipFile(fileobj=buf, mode='wb')
+    f.write(data)
+    f.close()
+    return buf.getvalue()
+
+
+class CacheTestRequestHandler(compat_http_server.BaseHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.headers.get('Ytdl-http-cache') is not None:
+            self.server.markers.append(self.path)
+        body = ('%s %d' % (self.path, len(self.server.requests))).encode('utf-8')
+        if self.path == '/etag' and self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.send_header('ETag', '"v1"')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        if self.path == '/fresh':
+            self.send_header('Cache-Control', 'public, max-age=3600')
+        elif self.path == '/etag':
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('ETag', '"v1"')
+        elif self.path == '/no-store':
+            self.send_header('Cache-Control', 'no-store')
+        elif self.path == '/set-cookie':
+            self.send_header('Cache-Control', 'max-age=3600')
+            self.send_header('Set-Cookie', 'session=1')
+        elif self.path == '/vary':
+            self.send_header('Cache-Control', 'max-age=3600')
+            self.send_header('Vary', 'Accept-Language')
+        elif self.path == '/gzip':
+            self.send_header('Cache-Control', 'max-age=3600')
+            self.send_header('Content-Encoding', 'gzip')
+            body = _gzip(body)
+        self.send_header('Content-Length', '%d' % len(body))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class TestHTTPCache(unittest.TestCase):
+    def setUp(self):
+        if os.path.exists(CACHE_DIR):
+            shutil.rmtree(CACHE_DIR)
+        self.httpd = compat_http_server.HTTPServer(
+            ('localhost', 0), CacheTestRequestHandler)
+        self.httpd.requests = []
+        self.httpd.markers = []
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def tearDown(self):
+        if os.path.exists(CACHE_DIR):
+            shutil.rmtree(CACHE_DIR)
+
+    def _download(self, path, ttl=None, http_cache=True, headers={}, cachedir=CACHE_DIR):
+        ydl = YoutubeDL({
+            'logger': FakeLogger(),
+            'quiet': True,
+            'cachedir': cachedir,
+            'http_cache': http_cache,
+        })
+        ie = InfoExtractor(ydl)
+        ie._HTTP_CACHE_TTL = ttl
+        return ie._download_webpage(
+            'http://localhost:%d%s' % (self.port, path), None, headers=headers)
+
+    def test_http_cache(self):
+        self.assertEqual(self._download('/fresh'), '/fresh 1')
+        self.assertEqual(self._download('/fresh'), '/fresh 1')
+
+        self.assertEqual(self._download('/gzip'), '/gzip 2')
+        self.assertEqual(self._download('/gzip'), '/gzip 2')
+
+        # Revalidated, the server answers 304
+        self.assertEqual(self._download('/etag'), '/etag 3')
+        self.assertEqual(self._download('/etag'), '/etag 3')
+        self.assertEqual(len(self.httpd.requests), 4)
+
+        self.assertEqual(self._download('/no-store'), '/no-store 5')
+        self.assertEqual(self._download('/no-store'), '/no-store 6')
+
+        # No caching headers, but a TTL set by the extractor
+        self.assertEqual(self._download('/plain'), '/plain 7')
+        self.assertEqual(self._download('/plain'), '/plain 8')
+        self.assertEqual(self._download('/plain', ttl=3600), '/plain 9')
+        self.assertEqual(self._download('/plain', ttl=3600), '/plain 9')
+
+        self.assertEqual(self._download('/fresh', http_cache=False), '/fresh 10')
+
+        # The cache is disabled, the marker header isn't sent
+        self.assertEqual(self._download('/fresh', cachedir=False), '/fresh 11')
+        self.assertEqual(self.httpd.markers, [])
+
+    def test_request_headers(self):
+        self.assertEqual(self._download('/set-cookie'), '/set-cookie 1')
+        self.assertEqual(self._download('/set-cookie'), '/set-cookie 2')
+
+        self.assertEqual(self._download('/fresh'), '/fresh 3')
+        self.assertEqual(self._download('/fresh', headers={'Cookie': 'a=1'}), '/fresh 4')
+        self.assertEqual(
+            self._download('/fresh', headers={'Authorization': 'Basic YTpi'}), '/fresh 5')
+        self.assertEqual(self._download('/fresh', headers={'Cookie': 'a=1'}), '/fresh 4')
+        self.assertEqual(self._download('/fresh'), '/fresh 3')
+
+        self.assertEqual(
+            self._download('/vary', headers={'Accept-Language': 'fr'}), '/vary 6')
+        self.assertEqual(
+            self._download('/vary', headers={'Accept-Language': 'fr'}), '/vary 6')
+        self.assertEqual(
+            self._download('/vary', headers={'Accept-Language': 'de'}), '/vary 7')
+
+    def test_eviction(self):
+        cache = HTTPCache(CACHE_DIR, 10)
+
+        def put(url, data):
+            f, fn = cache.new_body_file()
+            with f:
+                f.write(data)
+            cache.put(url, {'url': url}, fn)
+
+        put('http://a', b'aaaa')
+        put('http://b', b'bbbb')
+        self.assertNotEqual(cache.get('http://a'), None)
+        # b is the least recently used
+        put('http://c', b'cccc')
+        self.assertEqual(cache.get('http://b'), None)
+        self.assertNotEqual(cache.get('http://a'), None)
+        # Too big to be stored
+        put('http://d', b'd' * 11)
+        self.assertEqual(cache.get('http://d'), None)
+
+        # The index is read back from the directory
+        cache = HTTPCache(CACHE_DIR, 10)
+        meta, body_fn = cache.get('http://c')
+        self.assertEqual(meta, {'url': 'http://c'})
+        with open(body_fn, 'rb') as f:
+            self.assertEqual(f.read(), b'cccc')
+
+
+if __name__ == '__main__':
+    unittest.main()
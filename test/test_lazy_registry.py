@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from __future__ import unicode_literals
+
+import io
+import json
+import re
+import shutil
+
+# Allow direct execution
+import os
+import sys
+import unittest
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+from youtube_dl import YoutubeDL
+from youtube_dl.compat import compat_getenv
+from youtube_dl.extractor import (
+    ArteTVPlaylistIE,
+    ArteTVPlus7IE,
+    GenericIE,
+    YoutubeIE,
+    YoutubeSearchIE,
+    gen_extractor_classes,
+)
+from youtube_dl.extractor import lazy_registry
+from youtube_dl.utils import write_json_file
+
+
+def _mkdir(d):
+    if not os.path.exists(d):
+        os.mkdir(d)
+
+
+class TestLazyRegistry(unittest.TestCase):
+    def setUp(self):
+        TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+        TESTDATA_DIR = os.path.join(TEST_DIR, 'testdata')
+        _mkdir(TESTDATA_DIR)
+        self.test_dir = os.path.join(TESTDATA_DIR, 'lazy_registry_test')
+        self.old_cache_home = compat_getenv('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = self.test_dir
+        lazy_registry._registry_stored = False
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+
+    def tearDown(self):
+        if os.path.exists(self.test_dir):
+            shutil.rmtree(self.test_dir)
+        if self.old_cache_home is None:
+            os.environ.pop('XDG_CACHE_HOME', None)
+        else:
+            os.environ['XDG_CACHE_HOME'] = self.old_cache_home
+        lazy_registry._registry_stored = True
+
+    def _store(self, all_classes, cachedir=None):
+        if cachedir is None:
+            cachedir = os.path.join(self.test_dir, 'youtube-dl')
+        ydl = YoutubeDL({'quiet': True, 'cachedir': cachedir})
+        lazy_registry.store_lazy_registry(ydl.cache, all_classes)
+
+    def test_store_and_load(self):
+        all_classes = [
+            YoutubeIE, ArteTVPlaylistIE, ArteTVPlus7IE, YoutubeSearchIE, GenericIE]
+        self.assertEqual(lazy_registry.load_lazy_registry(), None)
+        self._store(all_classes)
+        registry = lazy_registry.load_lazy_registry()
+        self.assertNotEqual(registry, None)
+
+        class Registry(object):
+            pass
+        mod = Registry()
+        mod.__dict__.update(registry)
+        self.assertEqual(
+            [c.__name__ for c in mod._ALL_CLASSES],
+            ['YoutubeIE', 'ArteTVPlaylistIE', 'ArteTVPlus7IE', 'YoutubeSearchIE', 'GenericIE'])
+        self.assertEqual(mod.YoutubeIE.ie_key(), 'Youtube')
+        self.assertTrue(mod.YoutubeIE.suitable('https://www.youtube.com/watch?v=BaW_jenozKc'))
+        self.assertTrue(mod.YoutubeSearchIE.suitable('ytsearch5:youtube-dl test video'))
+        # custom suitable() is rebuilt from the excluded extractors, without
+        # importing the real classes
+        playlist_url = 'http://www.arte.tv/guide/de/plus7/?country=DE#collection/PL-013263/ARTETV'
+        self.assertTrue(re.match(mod.ArteTVPlus7IE._VALID_URL, playlist_url))
+        self.assertFalse(mod.ArteTVPlus7IE.suitable(playlist_url))
+        self.assertTrue(mod.ArteTVPlaylistIE.suitable(playlist_url))
+        self.assertFalse('_real_class' in mod.ArteTVPlus7IE.__dict__)
+        self.assertFalse('_real_class' in mod.YoutubeSearchIE.__dict__)
+        # Instances and missing attributes come from the real class
+        self.assertEqual(type(mod.YoutubeIE()).__module__, 'youtube_dl.extractor.youtube')
+        self.assertEqual(
+            mod.YoutubeIE.extract_id('https://www.youtube.com/watch?v=BaW_jenozKc'),
+            'BaW_jenozKc')
+
+    def test_stamp(self):
+        self._store(list(gen_extractor_classes()))
+        fn = lazy_registry._registry_filename()
+        self.assertNotEqual(lazy_registry.load_lazy_registry(), None)
+        with io.open(fn, 'r', encoding='utf-8') as f:
+            registry = json.load(f)
+        registry['stamp'] = '0' + registry['stamp']
+        write_json_file(registry, fn)
+        self.assertEqual(lazy_registry.load_lazy_registry(), None)
+
+    def test_suitable_excludes(self):
+        registry = lazy_registry.build_lazy_registry(list(gen_extractor_classes()))
+        extractors = dict((ie['name'], ie) for ie in registry['extractors'])
+        self.assertEqual(extractors['DaumClipIE']['suitable_excludes'], ['DaumPlaylistIE', 'DaumUserIE'])
+        self.assertEqual(extractors['YoutubeIE']['suitable_excludes'], None)
+        self.assertFalse(extractors['YoutubeIE']['real_suitable'])
+        # Only these can't be described as data
+        self.assertEqual(
+            sorted(ie['name'] for ie in registry['extractors'] if ie['real_suitable']),
+            ['BBCIE', 'YoutubeUserIE'])
+
+    def test_cache_disabled(self):
+        self._store(list(gen_extractor_classes()), cachedir=False)
+        self.assertFalse(os.path.exists(lazy_registry._registry_filename()))
+
+
+if __name__ == '__main__':
+    unittest.main()
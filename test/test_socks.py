@@ -9,16 +9,28 @@ import unittest
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import random
+import socket
+import struct
 import subprocess
+import threading
 
 from test.helper import (
     FakeYDL,
     get_params,
 )
+from test.test_http import (
+    FakeLogger,
+    http_server_port,
+    KeepAliveRequestHandler,
+)
+from youtube_dl import YoutubeDL
 from youtube_dl.compat import (
+    compat_http_server,
     compat_str,
     compat_urllib_request,
 )
+from youtube_dl import socks
+from youtube_dl.socks import sockssocket
 
 
 class TestMultipleSocks(unittest.TestCase):
@@ -114,5 +126,102 @@ class TestSocks(unittest.TestCase):
         self.assertTrue(isinstance(self._get_ip('socks5'), compat_str))
 
 
+class Socks5Server(threading.Thread):
+    """ A SOCKS5 proxy without authentication that accepts IPv4 addresses and domain names """
+
+    def __init__(self):
+        super(Socks5Server, self).__init__()
+        self.daemon = True
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.sock.listen(5)
+        self.port = self.sock.getsockname()[1]
+        self.negotiations = 0
+
+    def run(self):
+        while True:
+            client, _ = self.sock.accept()
+            t = threading.Thread(target=self._handle, args=(client,))
+            t.daemon = True
+            t.start()
+
+    @staticmethod
+    def _recvall(sock, cnt):
+        data = b''
+        while len(data) < cnt:
+            data += sock.recv(cnt - len(data))
+        return data
+
+    @staticmethod
+    def _forward(src, dst):
+        while True:
+            data = src.recv(4096)
+            if not data:
+                break
+            dst.sendall(data)
+        dst.close()
+
+    def _handle(self, client):
+        self.negotiations += 1
+        n_methods = struct.unpack('!BB', self._recvall(client, 2))[1]
+        self._recvall(client, n_methods)
+        client.sendall(b'\x05\x00')
+        _, _, _, atype = struct.unpack('!BBBB', self._recvall(client, 4))
+        if atype == 1:
+            host = socket.inet_ntoa(self._recvall(client, 4))
+        else:
+            host = self._recvall(client, ord(self._recvall(client, 1))).decode('utf-8')
+        port = struct.unpack('!H', self._recvall(client, 2))[0]
+        remote = socket.create_connection((host, port))
+        client.sendall(b'\x05\x00\x00\x01' + socket.inet_aton('127.0.0.1') + struct.pack('!H', port))
+        t = threading.Thread(target=self._forward, args=(remote, client))
+        t.daemon = True
+        t.start()
+        self._forward(client, remote)
+
+
+class TestLocalSocks(unittest.TestCase):
+    def setUp(self):
+        self.proxy = Socks5Server()
+        self.proxy.start()
+        self.httpd = compat_http_server.HTTPServer(
+            ('127.0.0.1', 0), KeepAliveRequestHandler)
+        self.port = http_server_port(self.httpd)
+        self.server_thread = threading.Thread(target=self.httpd.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+
+    def test_recvall(self):
+        sock = sockssocket()
+        sock.connect(('127.0.0.1', self.port))
+        sock.sendall(b'GET / HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n')
+        # More than the first segment of the response
+        data = sock.recvall(500)
+        self.assertEqual(len(data), 500)
+        self.assertTrue(data.startswith(b'HTTP/1.'))
+        sock.close()
+
+    def test_recvall_without_memoryview(self):
+        # Python 2.6
+        old_memoryview = socks.compat_memoryview
+        socks.compat_memoryview = None
+        try:
+            self.test_recvall()
+        finally:
+            socks.compat_memoryview = old_memoryview
+
+    def test_keep_alive(self):
+        ydl = YoutubeDL({
+            'logger': FakeLogger(),
+            'proxy': 'socks5://127.0.0.1:%d' % self.proxy.port,
+        })
+        url = 'http://127.0.0.1:%d/' % self.port
+        client_ports = set(
+            ydl.urlopen(url).read().split(b'\n')[0] for _ in range(3))
+        # The connection negotiated with the proxy is reused
+        self.assertEqual(len(client_ports), 1)
+        self.assertEqual(self.proxy.negotiations, 1)
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -11,20 +11,29 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 
 # Various small unit tests
+import errno
 import io
 import json
+import socket
+import threading
+import time
 import xml.etree.ElementTree
 
 from youtube_dl.utils import (
     age_restricted,
+    BandwidthScheduler,
+    BandwidthStream,
     args_to_str,
     encode_base_n,
     clean_html,
+    concurrent_map,
+    create_connection,
     date_from_str,
     DateRange,
     detect_exe_version,
     determine_ext,
     dict_get,
+    DNSCache,
     encode_compat_str,
     encodeFilename,
     escape_rfc3986,
@@ -34,6 +43,7 @@ from youtube_dl.utils import (
     find_xpath_attr,
     fix_xml_ampersands,
     get_element_by_class,
+    HostLimiter,
     InAdvancePagedList,
     intlist_to_bytes,
     is_html,
@@ -68,6 +78,7 @@ from youtube_dl.utils import (
     url_basename,
     urlencode_postdata,
     urshift,
+    WorkQueue,
     update_url_query,
     version_tuple,
     xpath_with_ns,
@@ -75,6 +86,7 @@ from youtube_dl.utils import (
     xpath_text,
     xpath_attr,
     render_table,
+    RetryPolicy,
     match_str,
     parse_dfxp_time_expr,
     dfxp2srt,
@@ -87,6 +99,7 @@ from youtube_dl.compat import (
     compat_chr,
     compat_etree_fromstring,
     compat_urlparse,
+    compat_urllib_error,
     compat_parse_qs,
 )
 
@@ -247,6 +260,216 @@ class TestUtil(unittest.TestCase):
         # keep the list ordered
         self.assertEqual(orderedSet([135, 1, 1, 1]), [135, 1])
 
+    def test_concurrent_map(self):
+        lock = threading.Lock()
+        state = {'running': 0, 'max_running': 0, 'calls': 0}
+
+        def func(i):
+            with lock:
+                state['calls'] += 1
+                state['running'] += 1
+                state['max_running'] = max(state['max_running'], state['running'])
+            time.sleep(0.01 * (i % 3))
+            with lock:
+                state['running'] -= 1
+            if i == 7:
+                raise ValueError(i)
+            return i * 2
+
+        self.assertEqual(list(concurrent_map(func, range(7), 3)), list(range(0, 14, 2)))
+        self.assertEqual(state['max_running'], 3)
+        self.assertEqual(list(concurrent_map(func, [], 3)), [])
+        self.assertEqual(list(concurrent_map(func, range(3), 1)), [0, 2, 4])
+
+        state['calls'] = 0
+        res = []
+        with self.assertRaises(ValueError):
+            for r in concurrent_map(func, range(20), 2):
+                res.append(r)
+        self.assertEqual(res, list(range(0, 14, 2)))
+        self.assertEqual(state['running'], 0)
+        self.assertTrue(state['calls'] <= 9)
+
+        # The calls don't get more than 2 * workers items ahead of the consumer
+        started = []
+
+        def record(i):
+            with lock:
+                started.append(i)
+            return i
+
+        for r in concurrent_map(record, range(50), 2):
+            time.sleep(0.001)
+            with lock:
+                self.assertTrue(max(started) <= r + 4)
+
+    def test_work_queue(self):
+        lock = threading.Lock()
+        release = threading.Event()
+        done = []
+
+        def func(i):
+            release.wait()
+            if i == 'fail':
+                raise ValueError(i)
+            with lock:
+                done.append(i)
+
+        q = WorkQueue(func, workers=2, maxsize=1)
+        for i in range(3):
+            q.put(i)
+        # Both workers are busy and the queue is full
+        t = threading.Thread(target=q.put, args=(3,))
+        t.start()
+        t.join(0.1)
+        self.assertTrue(t.is_alive())
+        release.set()
+        t.join()
+        q.join()
+        self.assertEqual(sorted(done), [0, 1, 2, 3])
+
+        q = WorkQueue(func, workers=1)
+        q.put('fail')
+        self.assertRaises(ValueError, q.join)
+
+    def test_host_limiter(self):
+        limiter = HostLimiter(max_jobs=1, min_interval=10)
+        self.assertEqual(limiter.reserve('http://a.example.com/1'), 0)
+        self.assertTrue(9 < limiter.reserve('http://a.example.com/2') <= 10)
+        self.assertTrue(19 < limiter.reserve('https://a.example.com/3') <= 20)
+        self.assertEqual(limiter.reserve('http://b.example.com/1'), 0)
+
+        entered = []
+
+        def other_job(url):
+            with limiter.job(url):
+                entered.append(url)
+
+        with limiter.job('http://a.example.com/1'):
+            t = threading.Thread(target=other_job, args=('http://a.example.com/2',))
+            t.start()
+            other_job('http://b.example.com/1')
+            # The job for the same host waits
+            t.join(0.1)
+            self.assertEqual(entered, ['http://b.example.com/1'])
+        t.join()
+        self.assertEqual(entered, ['http://b.example.com/1', 'http://a.example.com/2'])
+
+        limiter = HostLimiter()
+        self.assertEqual(limiter.reserve('http://a.example.com/1'), 0)
+        self.assertEqual(limiter.reserve('http://a.example.com/1'), 0)
+        with limiter.job('http://a.example.com/1'):
+            with limiter.job('http://a.example.com/1'):
+                pass
+
+    def test_create_connection(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        server.bind(('127.0.0.1', 0))
+        server.listen(5)
+        port = server.getsockname()[1]
+        closed = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        closed.bind(('127.0.0.1', 0))
+        closed_port = closed.getsockname()[1]
+        closed.close()
+
+        def addr(port):
+            return (socket.AF_INET, socket.SOCK_STREAM, 6, '', ('127.0.0.1', port))
+
+        dns_cache = DNSCache(60)
+        for race_delay in (None, 0.25):
+            # The first address refuses the connection
+            dns_cache._entries[('example.com', 80)] = (
+                time.time() + 60, [addr(closed_port), addr(port)])
+            sock = create_connection(
+                ('example.com', 80), 5, dns_cache=dns_cache, race_delay=race_delay)
+            self.assertEqual(sock.getpeername(), ('127.0.0.1', port))
+            sock.close()
+            server.accept()[0].close()
+            self.assertTrue(('example.com', 80) in dns_cache._entries)
+
+            dns_cache._entries[('example.com', 80)] = (time.time() + 60, [addr(closed_port)] * 2)
+            self.assertRaises(
+                socket.error, create_connection, ('example.com', 80), 5,
+                dns_cache=dns_cache, race_delay=race_delay)
+            # Resolved again for the next connection
+            self.assertFalse(('example.com', 80) in dns_cache._entries)
+
+        # No address of the family of the source address
+        dns_cache._entries[('example.com', 80)] = (time.time() + 60, [addr(port)])
+        self.assertRaises(
+            socket.error, create_connection, ('example.com', 80), 5,
+            source_address=('::', 0), dns_cache=dns_cache)
+        server.close()
+
+        dns_cache = DNSCache(60)
+        addrs = dns_cache.resolve('127.0.0.1', 80)
+        self.assertTrue(dns_cache.resolve('127.0.0.1', 80) is addrs)
+        dns_cache = DNSCache(0)
+        addrs = dns_cache.resolve('127.0.0.1', 80)
+        self.assertFalse(dns_cache.resolve('127.0.0.1', 80) is addrs)
+
+    def test_bandwidth_scheduler(self):
+        scheduler = BandwidthScheduler(rate=1000000, burst=0)
+        streams = [BandwidthStream(1), BandwidthStream(3)]
+        consumed = [0, 0]
+        lock = threading.Lock()
+
+        def download(i):
+            while True:
+                with lock:
+                    if sum(consumed) >= 400000:
+                        return
+                scheduler.consume(streams[i], 'http://example.com/', 1000)
+                with lock:
+                    consumed[i] += 1000
+
+        start = time.time()
+        threads = [threading.Thread(target=download, args=(i,)) for i in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertTrue(time.time() - start >= 0.35)
+        # The stream with weight 3 gets about 3 times more bandwidth
+        self.assertTrue(2 < consumed[1] / consumed[0] < 4.5)
+
+        scheduler = BandwidthScheduler(host_rate=10000, burst=0)
+        start = time.time()
+        scheduler.consume(streams[0], 'http://a.example.com/', 1000)
+        scheduler.consume(streams[0], 'http://b.example.com/', 1000)
+        self.assertTrue(time.time() - start < 0.09)
+        scheduler.consume(streams[0], 'http://a.example.com/', 1000)
+        self.assertTrue(time.time() - start >= 0.1)
+        self.assertFalse(BandwidthScheduler().enabled)
+
+    def test_retry_policy(self):
+        def http_error(code, headers={}):
+            return compat_urllib_error.HTTPError('http://a.example.com/', code, 'msg', headers, None)
+
+        policy = RetryPolicy(backoff=1, max_backoff=4, breaker_threshold=2, breaker_timeout=30)
+        self.assertTrue(policy.is_retryable(http_error(503)))
+        self.assertTrue(policy.is_retryable(http_error(429)))
+        self.assertFalse(policy.is_retryable(http_error(404)))
+        self.assertTrue(policy.is_retryable(socket.timeout()))
+        self.assertTrue(policy.is_retryable(socket.error(errno.ECONNRESET, 'reset')))
+        self.assertTrue(policy.is_retryable(compat_urllib_error.URLError(socket.error(errno.ECONNREFUSED, 'refused'))))
+        self.assertFalse(policy.is_retryable(compat_urllib_error.URLError('unknown url type')))
+        self.assertFalse(policy.is_retryable(socket.error(errno.EACCES, 'denied')))
+
+        self.assertTrue(0.5 <= policy.retry_delay(http_error(500), 1) <= 1)
+        self.assertTrue(2 <= policy.retry_delay(http_error(500), 3) <= 4)
+        self.assertTrue(2 <= policy.retry_delay(http_error(500), 10) <= 4)
+        self.assertEqual(policy.retry_delay(http_error(429, {'Retry-After': '120'}), 1), 120)
+        self.assertEqual(policy.retry_delay(http_error(503, {'Retry-After': 'Thu, 01 Jan 1970 00:00:00 GMT'}), 1), 0)
+
+        policy.record_error('http://a.example.com/1')
+        self.assertEqual(policy.host_delay('http://a.example.com/1'), 0)
+        policy.record_error('http://a.example.com/2')
+        self.assertTrue(29 < policy.host_delay('http://a.example.com/3') <= 30)
+        self.assertEqual(policy.host_delay('http://b.example.com/'), 0)
+        policy.record_success('http://a.example.com/4')
+        self.assertEqual(policy.host_delay('http://a.example.com/5'), 0)
+
     def test_unescape_html(self):
         self.assertEqual(unescapeHTML('%20;'), '%20;')
         self.assertEqual(unescapeHTML('&#x2F;'), '/')
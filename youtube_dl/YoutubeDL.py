@@ -21,6 +21,7 @@ import shutil
 import subprocess
 import socket
 import sys
+import threading
 import time
 import tokenize
 import traceback
@@ -42,11 +43,14 @@ from .compat import (
 from .utils import (
     age_restricted,
     args_to_str,
+    BandwidthScheduler,
+    concurrent_map,
     ContentTooShortError,
     date_from_str,
     DateRange,
     DEFAULT_OUTTMPL,
     determine_ext,
+    DNSCache,
     determine_protocol,
     DownloadError,
     encode_compat_str,
@@ -55,7 +59,8 @@ from .utils import (
     ExtractorError,
     format_bytes,
     formatSeconds,
-    locked_file,
+    HostLimiter,
+    HTTPConnectionPool,
     make_HTTPS_handler,
     MaxDownloadsReached,
     PagedList,
@@ -68,24 +73,33 @@ from .utils import (
     register_socks_protocols,
     render_table,
     replace_extension,
+    RetryPolicy,
     SameFileError,
     sanitize_filename,
     sanitize_path,
     sanitize_url,
     sanitized_Request,
+    SSLSessionCache,
     std_headers,
     subtitles_filename,
     UnavailableVideoError,
     url_basename,
     version_tuple,
+    WorkQueue,
     write_json_file,
     write_string,
     YoutubeDLCookieProcessor,
     YoutubeDLHandler,
 )
+from .archive import DownloadArchive
 from .cache import Cache
+from .cassette import Cassette, CassetteHandler
+from .http_cache import HTTPCache, HTTPCacheHandler
 from .extractor import get_info_extractor, gen_extractor_classes, _LAZY_LOADER
+from .extractor.dispatch import ExtractorDispatchIndex
+from .extractor.lazy_registry import store_lazy_registry
 from .downloader import get_suitable_downloader
+from .downloader.common import CombinedProgress, FileDownloader
 from .downloader.rtmp import rtmpdump_version
 from .postprocessor import (
     FFmpegFixupM3u8PP,
@@ -156,6 +170,15 @@ class YoutubeDL(object):
     playlistend:       Playlist item to end at.
     playlist_items:    Specific indices of playlist to download.
     playlistreverse:   Download playlist items in reverse order.
+    concurrent_entries: Number of playlist entries to extract and download
+                       at the same time (default is 1).
+    pipeline:          Tuple with the number of extraction, download and
+                       postprocessing workers. If set, download() runs these
+                       stages concurrently, connected by bounded queues.
+    jobs:              Number of URLs that download() processes at the same
+                       time (default is 1).
+    jobs_per_host:     Maximum number of URLs of the same host that are
+                       processed at the same time.
     matchtitle:        Download only matching titles.
     rejecttitle:       Reject downloads for matching titles.
     logger:            Log messages to a logging.Logger instance.
@@ -192,7 +215,30 @@ class YoutubeDL(object):
     download_archive:  File name of a file where all downloads are recorded.
                        Videos already present in the file are not downloaded
                        again.
+    lazy_playlist:     Process the entries of a playlist as they are received,
+                       without fetching the whole playlist first. The
+                       playlist_index isn't padded and the entries selected
+                       with playlist_items are processed in the order of the
+                       playlist. When downloading without dump_single_json,
+                       only a summary of each processed entry is kept in the
+                       playlist result.
+    stop_after_archived: Stop processing a playlist after this number of
+                       consecutive entries that are skipped because they
+                       are in the download archive. The playlist pages are
+                       then fetched as needed.
     cookiefile:        File name where cookies should be read from and dumped to.
+    http_cache:        Store the responses to the webpage requests of the
+                       extractors in the cache directory, and reuse them while
+                       they are fresh (see InfoExtractor._HTTP_CACHE_TTL).
+    http_cache_size:   Maximum size in bytes of the stored responses
+                       (100 MiB by default).
+    cassette:          Directory in which the HTTP responses are recorded or
+                       from which they are replayed (see cassette.py).
+    cassette_mode:     "record" or "replay" (default).
+    cassette_latency:  Number of seconds by which each replayed response is
+                       delayed.
+    cassette_rate:     Rate in bytes per second at which the bodies of the
+                       replayed responses are read.
     nocheckcertificate:Do not verify SSL certificates
     prefer_insecure:   Use HTTP instead of HTTPS to retrieve information.
                        At the moment, this is only supported by YouTube.
@@ -237,6 +283,10 @@ class YoutubeDL(object):
                        * fragment_count: The number of fragments (= individual
                                          files that will be merged)
 
+                       When several formats are downloaded to be merged,
+                       they are downloaded at the same time and the hooks
+                       are called from a different thread for each of them.
+
                        Progress hooks are guaranteed to be called at least once
                        (with status "finished") if the download is successful.
     merge_output_format: Extension to use when merging formats.
@@ -247,9 +297,28 @@ class YoutubeDL(object):
                        - "detect_or_warn": check whether we can do anything
                                            about it, warn otherwise (default)
     source_address:    (Experimental) Client-side IP address to bind to.
+    extractor_retries: Number of times to retry a webpage request of an
+                       extractor for a retryable error (default 3).
+    retry_backoff:     Number of seconds to wait before the first retry of a
+                       request, doubled for each next attempt (default 1).
+    total_ratelimit:   Maximum download rate in bytes per second of all the
+                       downloads together.
+    host_ratelimit:    Maximum download rate in bytes per second from each
+                       host.
+    circuit_breaker:   Number of consecutive errors from a host after which
+                       its requests wait for 30 seconds, 0 to disable
+                       (default 5).
+    dns_cache_ttl:     Number of seconds for which the addresses of a host are
+                       reused, 0 to resolve it for every connection
+                       (default 60).
+    happy_eyeballs:    When a host has several addresses, connect to the
+                       next one (alternating IPv6 and IPv4) if the previous
+                       connection isn't established after 250 ms, and use
+                       the first that succeeds.
     call_home:         Boolean, true iff we are allowed to contact the
                        youtube-dl servers for debugging.
-    sleep_interval:    Number of seconds to sleep before each download.
+    sleep_interval:    Minimum number of seconds between the start of two
+                       downloads from the same host.
     listformats:       Print an overview of available video formats and exit.
     list_thumbnails:   Print a table of all thumbnails and exit.
     match_filter:      A function that gets called with the info_dict of
@@ -270,7 +339,8 @@ class YoutubeDL(object):
     the downloader (see youtube_dl/downloader/common.py):
     nopart, updatetime, buffersize, ratelimit, min_filesize, max_filesize, test,
     noresizebuffer, retries, continuedl, noprogress, consoletitle,
-    xattr_set_filesize, external_downloader_args, hls_use_mpegts.
+    xattr_set_filesize, external_downloader_args, hls_use_mpegts,
+    http_connections, disk_write_buffer, preallocate, progress_rate.
 
     The following options are used by the post processors:
     prefer_ffmpeg:     If True, use ffmpeg instead of avconv if both are available,
@@ -292,10 +362,18 @@ class YoutubeDL(object):
             params = {}
         self._ies = []
         self._ies_instances = {}
+        self._ies_index = None
         self._pps = []
         self._progress_hooks = []
         self._download_retcode = 0
         self._num_downloads = 0
+        self._num_downloads_lock = threading.Lock()
+        self._archive_lock = threading.Lock()
+        self._download_archive = None
+        self._download_queue = None
+        self._postprocess_queue = None
+        self._inflight_requests = {}
+        self._inflight_lock = threading.Lock()
         self._screen_file = [sys.stdout, sys.stderr][params.get('logtostderr', False)]
         self._err_file = sys.stderr
         self.params = {
@@ -304,6 +382,21 @@ class YoutubeDL(object):
         }
         self.params.update(params)
         self.cache = Cache(self)
+        if not _LAZY_LOADER and self.params.get('cachedir') is None:
+            # The registry is only looked for in the default cache directory
+            store_lazy_registry(self.cache, gen_extractor_classes())
+        self.host_limiter = HostLimiter(
+            self.params.get('jobs_per_host'), self.params.get('sleep_interval'))
+        retry_backoff = self.params.get('retry_backoff')
+        circuit_breaker = self.params.get('circuit_breaker')
+        self.retry_policy = RetryPolicy(
+            backoff=1 if retry_backoff is None else retry_backoff,
+            breaker_threshold=5 if circuit_breaker is None else circuit_breaker)
+        # Shared by all the downloads
+        self.bandwidth_scheduler = BandwidthScheduler(
+            self.params.get('total_ratelimit'), self.params.get('host_ratelimit'))
+        # Shared by the HTTPS connections, to resume their TLS sessions
+        self.ssl_session_cache = SSLSessionCache()
 
         if self.params.get('cn_verification_proxy') is not None:
             self.report_warning('--cn-verification-proxy is deprecated. Use --geo-verification-proxy instead.')
@@ -389,10 +482,22 @@ class YoutubeDL(object):
     def add_info_extractor(self, ie):
         """Add an InfoExtractor object to the end of the list."""
         self._ies.append(ie)
+        if self._ies_index is not None:
+            self._ies_index.add(ie)
         if not isinstance(ie, type):
             self._ies_instances[ie.ie_key()] = ie
             ie.set_downloader(self)
 
+    def _suitable_candidates(self, url):
+        """
+        Return the extractors that may be suitable for url, in the order of
+        the _ies list. The dispatch index is built on first use and persisted
+        in the cache directory.
+        """
+        if self._ies_index is None:
+            self._ies_index = ExtractorDispatchIndex(self._ies, self.cache)
+        return self._ies_index.candidates(url)
+
     def get_info_extractor(self, ie_key):
         """
         Get an instance of an IE with name ie_key, it will try to get one from
@@ -493,6 +598,11 @@ class YoutubeDL(object):
     def __exit__(self, *args):
         self.restore_console_title()
 
+        handshakes = self.ssl_session_cache.resumed + self.ssl_session_cache.full
+        if self.params.get('verbose') and handshakes:
+            self._write_string('[debug] TLS sessions resumed: %d of %d handshakes\n' % (
+                self.ssl_session_cache.resumed, handshakes))
+
         if self.params.get('cookiefile') is not None:
             self.cookiejar.save()
 
@@ -574,7 +684,10 @@ class YoutubeDL(object):
             autonumber_templ = '%0' + str(autonumber_size) + 'd'
             template_dict['autonumber'] = autonumber_templ % self._num_downloads
             if template_dict.get('playlist_index') is not None:
-                template_dict['playlist_index'] = '%0*d' % (len(str(template_dict['n_entries'])), template_dict['playlist_index'])
+                # The number of entries is unknown for lazily fetched playlists
+                n_entries = template_dict.get('n_entries')
+                index_size = len(str(n_entries)) if n_entries is not None else 1
+                template_dict['playlist_index'] = '%0*d' % (index_size, template_dict['playlist_index'])
             if template_dict.get('resolution') is None:
                 if template_dict.get('width') and template_dict.get('height'):
                     template_dict['resolution'] = '%dx%d' % (template_dict['width'], template_dict['height'])
@@ -667,7 +780,7 @@ class YoutubeDL(object):
         if ie_key:
             ies = [self.get_info_extractor(ie_key)]
         else:
-            ies = self._ies
+            ies = self._suitable_candidates(url)
 
         for ie in ies:
             if not ie.suitable(url):
@@ -775,19 +888,32 @@ class YoutubeDL(object):
             if playlistend == -1:
                 playlistend = None
 
+            def iter_playlistitems_ranges(format):
+                for string_segment in format.split(','):
+                    if '-' in string_segment:
+                        start, end = string_segment.split('-')
+                        yield int(start), int(end)
+                    else:
+                        yield int(string_segment), int(string_segment)
+
             playlistitems_str = self.params.get('playlist_items')
             playlistitems = None
             if playlistitems_str is not None:
                 def iter_playlistitems(format):
-                    for string_segment in format.split(','):
-                        if '-' in string_segment:
-                            start, end = string_segment.split('-')
-                            for item in range(int(start), int(end) + 1):
-                                yield int(item)
-                        else:
-                            yield int(string_segment)
+                    for start, end in iter_playlistitems_ranges(format):
+                        for item in range(start, end + 1):
+                            yield item
                 playlistitems = iter_playlistitems(playlistitems_str)
 
+            # Entries are fetched lazily in streaming mode or when the
+            # playlist may be cut short by archived entries, unless they have
+            # to be reversed
+            lazy_playlist = self.params.get('lazy_playlist', False)
+            stop_after_archived = self.params.get('stop_after_archived')
+            lazy_entries = (
+                (lazy_playlist or stop_after_archived) and
+                not self.params.get('playlistreverse', False))
+
             ie_entries = ie_result['entries']
             if isinstance(ie_entries, list):
                 n_all_entries = len(ie_entries)
@@ -801,6 +927,17 @@ class YoutubeDL(object):
                 self.to_screen(
                     '[%s] playlist %s: Collected %d video ids (downloading %d of them)' %
                     (ie_result['extractor'], playlist, n_all_entries, n_entries))
+            elif isinstance(ie_entries, PagedList) and lazy_entries:
+                if playlistitems:
+                    entries = (
+                        entry for item in playlistitems
+                        for entry in ie_entries.iterslice(item - 1, item))
+                else:
+                    entries = ie_entries.iterslice(playliststart, playlistend)
+                n_entries = None
+                self.to_screen(
+                    '[%s] playlist %s: Downloading videos' %
+                    (ie_result['extractor'], playlist))
             elif isinstance(ie_entries, PagedList):
                 if playlistitems:
                     entries = []
@@ -815,6 +952,22 @@ class YoutubeDL(object):
                 self.to_screen(
                     '[%s] playlist %s: Downloading %d videos' %
                     (ie_result['extractor'], playlist, n_entries))
+            elif lazy_entries:  # iterable
+                if playlistitems:
+                    # Only read the entries up to the last requested item,
+                    # they are processed in the order of the playlist
+                    ranges = list(iter_playlistitems_ranges(playlistitems_str))
+                    entries = (
+                        entry for i, entry in enumerate(itertools.islice(
+                            ie_entries, max(end for _, end in ranges)), 1)
+                        if any(start <= i <= end for start, end in ranges))
+                else:
+                    entries = itertools.islice(
+                        ie_entries, playliststart, playlistend)
+                n_entries = None
+                self.to_screen(
+                    '[%s] playlist %s: Downloading videos' %
+                    (ie_result['extractor'], playlist))
             else:  # iterable
                 if playlistitems:
                     entry_list = list(ie_entries)
@@ -830,8 +983,22 @@ class YoutubeDL(object):
             if self.params.get('playlistreverse', False):
                 entries = entries[::-1]
 
-            for i, entry in enumerate(entries, 1):
-                self.to_screen('[download] Downloading video %s of %s' % (i, n_entries))
+            concurrent_entries = self.params.get('concurrent_entries') or 1
+            # The processed entries are only kept in full when they may be
+            # used afterwards
+            compact_results = (
+                lazy_playlist and download and
+                not self.params.get('dump_single_json', False))
+            archive_ids = set()
+            skipped = object()
+            archived = object()
+
+            def process_entry(args):
+                i, entry = args
+                if n_entries is None:
+                    self.to_screen('[download] Downloading video %s' % i)
+                else:
+                    self.to_screen('[download] Downloading video %s of %s' % (i, n_entries))
                 extra = {
                     'n_entries': n_entries,
                     'playlist': playlist,
@@ -845,14 +1012,42 @@ class YoutubeDL(object):
                 }
 
                 reason = self._match_entry(entry, incomplete=True)
+                if reason is None and concurrent_entries > 1:
+                    # The archive is only updated once an entry is finished,
+                    # so another worker may be processing the same video
+                    archive_id = self._make_archive_id(entry)
+                    if archive_id is not None and self.params.get('download_archive') is not None:
+                        with self._archive_lock:
+                            if archive_id in archive_ids:
+                                reason = '%s has already been recorded in archive' % (
+                                    entry.get('title') or entry.get('id') or archive_id)
+                            archive_ids.add(archive_id)
                 if reason is not None:
                     self.to_screen('[download] ' + reason)
-                    continue
-
-                entry_result = self.process_ie_result(entry,
-                                                      download=download,
-                                                      extra_info=extra)
-                playlist_results.append(entry_result)
+                    if stop_after_archived and self.in_download_archive(entry):
+                        return archived
+                    return skipped
+
+                return self.process_ie_result(entry,
+                                              download=download,
+                                              extra_info=extra)
+
+            archived_streak = 0
+            with contextlib.closing(concurrent_map(
+                    process_entry, enumerate(entries, 1), concurrent_entries)) as entry_results:
+                for entry_result in entry_results:
+                    if entry_result is archived:
+                        archived_streak += 1
+                        if archived_streak >= stop_after_archived:
+                            self.to_screen(
+                                '[download] Stopping after %d consecutive archived videos'
+                                % archived_streak)
+                            break
+                    elif entry_result is not skipped:
+                        archived_streak = 0
+                        if compact_results:
+                            entry_result = self._compact_entry_result(entry_result)
+                        playlist_results.append(entry_result)
             ie_result['entries'] = playlist_results
             self.to_screen('[download] Finished downloading playlist: %s' % playlist)
             return ie_result
@@ -880,6 +1075,16 @@ class YoutubeDL(object):
         else:
             raise Exception('Invalid result type: %s' % result_type)
 
+    @staticmethod
+    def _compact_entry_result(ie_result):
+        """ Keep only the fields that identify a processed playlist entry """
+        if ie_result is None:
+            return None
+        return dict(
+            (k, v) for k, v in ie_result.items()
+            if k in ('_type', 'id', 'title', 'extractor', 'extractor_key',
+                     'webpage_url', 'playlist_index', '_filename'))
+
     def _build_format_filter(self, filter_spec):
         " Returns a function to filter the formats according to the filter_spec "
 
@@ -1494,9 +1699,13 @@ class YoutubeDL(object):
             self.to_screen('[download] ' + reason)
             return
 
-        self._num_downloads += 1
+        with self._num_downloads_lock:
+            # Playlist entries may be processed concurrently
+            if max_downloads is not None and self._num_downloads >= int(max_downloads):
+                raise MaxDownloadsReached()
+            self._num_downloads += 1
 
-        info_dict['_filename'] = filename = self.prepare_filename(info_dict)
+            info_dict['_filename'] = filename = self.prepare_filename(info_dict)
 
         # Forced printings
         if self.params.get('forcetitle', False):
@@ -1530,6 +1739,16 @@ class YoutubeDL(object):
         if filename is None:
             return
 
+        if self._download_queue is not None:
+            # The download stage of the pipeline takes over from here
+            self._download_queue.put(info_dict)
+        else:
+            self._download_info(info_dict)
+
+    def _download_info(self, info_dict):
+        """Write the requested files and download a video checked by process_info."""
+        filename = info_dict['_filename']
+
         try:
             dn = os.path.dirname(sanitize_path(encodeFilename(filename)))
             if dn and not os.path.exists(dn):
@@ -1616,8 +1835,11 @@ class YoutubeDL(object):
 
         if not self.params.get('skip_download', False):
             try:
-                def dl(name, info):
+                def dl(name, info, combined_progress=None):
                     fd = get_suitable_downloader(info, self.params)(self, self.params)
+                    if combined_progress is not None:
+                        fd.remove_progress_hook(fd.report_progress)
+                        fd.add_progress_hook(combined_progress.hook(name))
                     for ph in self._progress_hooks:
                         fd.add_progress_hook(ph)
                     if self.params.get('verbose'):
@@ -1668,14 +1890,22 @@ class YoutubeDL(object):
                             '[download] %s has already been downloaded and '
                             'merged' % filename)
                     else:
+                        parts = []
                         for f in requested_formats:
                             new_info = dict(info_dict)
                             new_info.update(f)
                             fname = self.prepare_filename(new_info)
                             fname = prepend_extension(fname, 'f%s' % f['format_id'], new_info['ext'])
                             downloaded.append(fname)
-                            partial_success = dl(fname, new_info)
-                            success = success and partial_success
+                            parts.append((fname, new_info))
+                        # Download all the formats at the same time, showing
+                        # their combined progress
+                        combined_progress = CombinedProgress(
+                            FileDownloader(self, self.params).report_progress,
+                            downloaded)
+                        success = all(list(concurrent_map(
+                            lambda part: dl(part[0], part[1], combined_progress),
+                            parts, len(parts))))
                         info_dict['__postprocessors'] = postprocessors
                         info_dict['__files_to_merge'] = downloaded
                 else:
@@ -1753,12 +1983,18 @@ class YoutubeDL(object):
                     else:
                         assert fixup_policy in ('ignore', 'never')
 
-                try:
-                    self.post_process(filename, info_dict)
-                except (PostProcessingError) as err:
-                    self.report_error('postprocessing: %s' % str(err))
-                    return
-                self.record_download_archive(info_dict)
+                if self._postprocess_queue is not None:
+                    self._postprocess_queue.put((filename, info_dict))
+                else:
+                    self._post_process_info(filename, info_dict)
+
+    def _post_process_info(self, filename, info_dict):
+        try:
+            self.post_process(filename, info_dict)
+        except (PostProcessingError) as err:
+            self.report_error('postprocessing: %s' % str(err))
+            return
+        self.record_download_archive(info_dict)
 
     def download(self, url_list):
         """Download a given list of URLs."""
@@ -1768,22 +2004,67 @@ class YoutubeDL(object):
                 self.params.get('max_downloads') != 1):
             raise SameFileError(outtmpl)
 
-        for url in url_list:
+        def download_url(url):
             try:
-                # It also downloads the videos
-                res = self.extract_info(
-                    url, force_generic_extractor=self.params.get('force_generic_extractor', False))
+                with self.host_limiter.job(url):
+                    # It also downloads the videos
+                    return self.extract_info(
+                        url, force_generic_extractor=self.params.get('force_generic_extractor', False))
             except UnavailableVideoError:
                 self.report_error('unable to download video')
             except MaxDownloadsReached:
                 self.to_screen('[info] Maximum number of downloaded files reached.')
                 raise
-            else:
-                if self.params.get('dump_single_json', False):
-                    self.to_stdout(json.dumps(res))
+
+        pipeline = self.params.get('pipeline')
+        if pipeline:
+            results = self._download_pipelined(download_url, url_list, *pipeline)
+        else:
+            # The return code is set by report_error, from any of the jobs
+            results = concurrent_map(download_url, url_list, self.params.get('jobs') or 1)
+        for res in results:
+            if self.params.get('dump_single_json', False):
+                self.to_stdout(json.dumps(res))
 
         return self._download_retcode
 
+    def _download_pipelined(self, download_url, url_list,
+                            extract_workers, download_workers, postprocess_workers):
+        """
+        Like map(download_url, url_list), but the extraction, download and
+        postprocessing of the videos run in separate pools of workers,
+        connected by bounded queues.
+        """
+        def download_info(info_dict):
+            try:
+                self._download_info(info_dict)
+            except UnavailableVideoError:
+                self.report_error('unable to download video')
+
+        self._postprocess_queue = WorkQueue(
+            lambda args: self._post_process_info(*args), postprocess_workers)
+        self._download_queue = WorkQueue(download_info, download_workers)
+
+        def finish():
+            try:
+                self._download_queue.join()
+            finally:
+                self._download_queue = None
+                postprocess_queue, self._postprocess_queue = self._postprocess_queue, None
+                postprocess_queue.join()
+
+        try:
+            results = list(concurrent_map(download_url, url_list, extract_workers))
+        except MaxDownloadsReached:
+            # Let the videos that were already accepted finish
+            finish()
+            raise
+        except BaseException:
+            self._download_queue = self._postprocess_queue = None
+            raise
+        finish()
+        return results
+
     def download_with_info_file(self, info_filename):
         with contextlib.closing(fileinput.FileInput(
                 [info_filename], mode='r',
@@ -1833,40 +2114,67 @@ class YoutubeDL(object):
         # Future-proof against any change in case
         # and backwards compatibility with prior versions
         extractor = info_dict.get('extractor_key')
+        video_id = info_dict.get('id')
         if extractor is None:
-            if 'id' in info_dict:
-                extractor = info_dict.get('ie_key')  # key in a playlist
-        if extractor is None:
+            extractor = info_dict.get('ie_key')  # key in a playlist
+            if ((extractor is None or video_id is None) and
+                    info_dict.get('_type') in ('url', 'url_transparent')):
+                extractor, video_id = self._guess_archive_key(
+                    info_dict['url'], extractor, video_id)
+        if extractor is None or video_id is None:
             return None  # Incomplete video information
-        return extractor.lower() + ' ' + info_dict['id']
+        return extractor.lower() + ' ' + video_id
 
-    def in_download_archive(self, info_dict):
+    def _guess_archive_key(self, url, ie_key, video_id):
+        """
+        Find the extractor key and the video id of an unresolved url result
+        from its url, without any network request, so that archived playlist
+        entries can be skipped before they are extracted.
+        Returns (None, None) when they can't be found.
+        """
+        if ie_key is None:
+            for ie in self._suitable_candidates(url):
+                if ie.suitable(url):
+                    ie_key = ie.ie_key()
+                    break
+            # The generic extractor doesn't know the id of the video
+            if ie_key is None or ie_key == 'Generic':
+                return None, None
+        if video_id is None:
+            try:
+                video_id = self.get_info_extractor(ie_key)._match_id(url)
+            except (AssertionError, AttributeError, IndexError, KeyError, TypeError):
+                # No match or no id group in _VALID_URL
+                return None, None
+        return ie_key, video_id
+
+    def _get_download_archive(self):
         fn = self.params.get('download_archive')
         if fn is None:
+            return None
+        with self._archive_lock:
+            if self._download_archive is None or self._download_archive.filename != fn:
+                self._download_archive = DownloadArchive(fn)
+            return self._download_archive
+
+    def in_download_archive(self, info_dict):
+        archive = self._get_download_archive()
+        if archive is None:
             return False
 
         vid_id = self._make_archive_id(info_dict)
         if vid_id is None:
             return False  # Incomplete video information
 
-        try:
-            with locked_file(fn, 'r', encoding='utf-8') as archive_file:
-                for line in archive_file:
-                    if line.strip() == vid_id:
-                        return True
-        except IOError as ioe:
-            if ioe.errno != errno.ENOENT:
-                raise
-        return False
+        return vid_id in archive
 
     def record_download_archive(self, info_dict):
-        fn = self.params.get('download_archive')
-        if fn is None:
+        archive = self._get_download_archive()
+        if archive is None:
             return
         vid_id = self._make_archive_id(info_dict)
         assert vid_id
-        with locked_file(fn, 'a', encoding='utf-8') as archive_file:
-            archive_file.write(vid_id + '\n')
+        archive.add(vid_id)
 
     @staticmethod
     def format_resolution(format, default='unknown'):
@@ -1982,8 +2290,62 @@ class YoutubeDL(object):
         """ Start an HTTP download """
         if isinstance(req, compat_basestring):
             req = sanitized_Request(req)
+        # Set by the callers that read the whole body
+        coalesce = req.headers.pop('Ytdl-coalesce', None) is not None
+        if coalesce and req.get_method() == 'GET' and req.data is None:
+            return self._urlopen_coalesced(req)
         return self._opener.open(req, timeout=self._socket_timeout)
 
+    def _urlopen_coalesced(self, req):
+        """
+        Open req, sharing the network request with the identical requests that
+        are in flight at the same time. The body is read at once, and each
+        caller gets its own copy of the response (or of the HTTPError).
+        """
+        key = (req.get_full_url(), tuple(sorted(req.header_items())))
+        with self._inflight_lock:
+            inflight = self._inflight_requests.get(key)
+            if inflight is None:
+                inflight = self._inflight_requests[key] = {'done': threading.Event()}
+                leader = True
+            else:
+                leader = False
+
+        if leader:
+            try:
+                resp = self._opener.open(req, timeout=self._socket_timeout)
+                try:
+                    inflight['response'] = (
+                        resp.headers, resp.geturl(), resp.getcode(),
+                        getattr(resp, 'msg', None), resp.read())
+                finally:
+                    resp.close()
+            except compat_urllib_error.HTTPError as err:
+                try:
+                    body = err.read()
+                except Exception:
+                    body = b''
+                inflight['http_error'] = (err.geturl(), err.code, err.msg, err.hdrs, body)
+            except BaseException as err:
+                inflight['error'] = err
+                raise
+            finally:
+                with self._inflight_lock:
+                    del self._inflight_requests[key]
+                inflight['done'].set()
+        else:
+            inflight['done'].wait()
+
+        if 'error' in inflight:
+            raise inflight['error']
+        if 'http_error' in inflight:
+            url, code, msg, hdrs, body = inflight['http_error']
+            raise compat_urllib_error.HTTPError(url, code, msg, hdrs, io.BytesIO(body))
+        headers, url, code, msg, body = inflight['response']
+        resp = YoutubeDLHandler.addinfourl_wrapper(io.BytesIO(body), headers, url, code)
+        resp.msg = msg
+        return resp
+
     def print_debug_header(self):
         if not self.params.get('verbose'):
             return
@@ -2081,8 +2443,17 @@ class YoutubeDL(object):
         proxy_handler = PerRequestProxyHandler(proxies)
 
         debuglevel = 1 if self.params.get('debug_printtraffic') else 0
-        https_handler = make_HTTPS_handler(self.params, debuglevel=debuglevel)
-        ydlh = YoutubeDLHandler(self.params, debuglevel=debuglevel)
+        # Shared by the HTTP and HTTPS handlers, to reuse their connections
+        conn_pool = HTTPConnectionPool()
+        dns_cache_ttl = self.params.get('dns_cache_ttl')
+        if dns_cache_ttl is None:
+            dns_cache_ttl = 60
+        dns_cache = DNSCache(dns_cache_ttl) if dns_cache_ttl > 0 else None
+        https_handler = make_HTTPS_handler(
+            self.params, self.ssl_session_cache, debuglevel=debuglevel,
+            conn_pool=conn_pool, dns_cache=dns_cache)
+        ydlh = YoutubeDLHandler(
+            self.params, conn_pool, dns_cache, debuglevel=debuglevel)
         data_handler = compat_urllib_request_DataHandler()
 
         # When passing our own FileHandler instance, build_opener won't add the
@@ -2095,8 +2466,21 @@ class YoutubeDL(object):
             raise compat_urllib_error.URLError('file:// scheme is explicitly disabled in youtube-dl for security reasons')
         file_handler.file_open = file_open
 
-        opener = compat_urllib_request.build_opener(
-            proxy_handler, https_handler, cookie_processor, ydlh, data_handler, file_handler)
+        handlers = [
+            proxy_handler, https_handler, cookie_processor, ydlh, data_handler, file_handler]
+        if self.params.get('cassette'):
+            handlers.append(CassetteHandler(
+                Cassette(compat_expanduser(self.params['cassette'])),
+                self.params.get('cassette_mode') or 'replay',
+                self.params.get('cassette_latency'), self.params.get('cassette_rate')))
+        if self.params.get('http_cache') and self.cache.enabled:
+            http_cache_size = self.params.get('http_cache_size')
+            if http_cache_size is None:
+                http_cache_size = 100 * 1024 * 1024
+            handlers.append(HTTPCacheHandler(HTTPCache(
+                self.cache.get_section_dir('http'), http_cache_size)))
+
+        opener = compat_urllib_request.build_opener(*handlers)
 
         # Delete the default user-agent header, which would otherwise apply in
         # cases where our custom HTTP handler doesn't come into play
@@ -135,6 +135,23 @@ def _real_main(argv=None):
         if numeric_limit is None:
             parser.error('invalid rate limit specified')
         opts.ratelimit = numeric_limit
+    if opts.replay_rate is not None:
+        numeric_limit = FileDownloader.parse_bytes(opts.replay_rate)
+        if numeric_limit is None:
+            parser.error('invalid replay rate specified')
+        opts.replay_rate = numeric_limit
+    if opts.record_http is not None and opts.replay_http is not None:
+        parser.error('--record-http and --replay-http can not be used together')
+    if opts.total_ratelimit is not None:
+        numeric_limit = FileDownloader.parse_bytes(opts.total_ratelimit)
+        if numeric_limit is None:
+            parser.error('invalid total rate limit specified')
+        opts.total_ratelimit = numeric_limit
+    if opts.host_ratelimit is not None:
+        numeric_limit = FileDownloader.parse_bytes(opts.host_ratelimit)
+        if numeric_limit is None:
+            parser.error('invalid host rate limit specified')
+        opts.host_ratelimit = numeric_limit
     if opts.min_filesize is not None:
         numeric_limit = FileDownloader.parse_bytes(opts.min_filesize)
         if numeric_limit is None:
@@ -159,13 +176,56 @@ def _real_main(argv=None):
         opts.retries = parse_retries(opts.retries)
     if opts.fragment_retries is not None:
         opts.fragment_retries = parse_retries(opts.fragment_retries)
+    if opts.extractor_retries is not None:
+        opts.extractor_retries = parse_retries(opts.extractor_retries)
+    if opts.retry_backoff < 0:
+        parser.error('retry backoff must be positive or 0')
+    if opts.circuit_breaker < 0:
+        parser.error('the number of errors of the circuit breaker must be positive or 0')
     if opts.buffersize is not None:
         numeric_buffersize = FileDownloader.parse_bytes(opts.buffersize)
         if numeric_buffersize is None:
             parser.error('invalid buffer size specified')
         opts.buffersize = numeric_buffersize
+    if opts.disk_write_buffer is not None:
+        numeric_buffersize = FileDownloader.parse_bytes(opts.disk_write_buffer)
+        if numeric_buffersize is None:
+            parser.error('invalid disk write buffer size specified')
+        opts.disk_write_buffer = numeric_buffersize
+    if opts.http_cache_size is not None:
+        numeric_http_cache_size = FileDownloader.parse_bytes(opts.http_cache_size)
+        if numeric_http_cache_size is None:
+            parser.error('invalid HTTP cache size specified')
+        opts.http_cache_size = numeric_http_cache_size
+    if opts.http_cache and opts.cachedir is False:
+        parser.error('--http-cache can not be used with --no-cache-dir')
     if opts.playliststart <= 0:
         raise ValueError('Playlist start must be positive')
+    if opts.lazy_playlist and opts.playlist_reverse:
+        parser.error('--playlist-reverse can not be used with --lazy-playlist')
+    if opts.concurrent_entries <= 0:
+        parser.error('concurrent entries must be positive')
+    if opts.progress_rate < 0:
+        parser.error('the progress rate must be positive or 0')
+    if opts.http_connections <= 0:
+        parser.error('the number of HTTP connections must be positive')
+    if opts.jobs <= 0:
+        parser.error('the number of jobs must be positive')
+    if opts.jobs_per_host is not None and opts.jobs_per_host <= 0:
+        parser.error('the number of jobs per host must be positive')
+    if opts.stop_after_archived is not None and opts.stop_after_archived <= 0:
+        parser.error('the number of archived videos to stop after must be positive')
+    if opts.dns_cache_ttl is not None and opts.dns_cache_ttl < 0:
+        parser.error('DNS cache TTL must be positive or 0')
+    if opts.pipeline is not None:
+        try:
+            opts.pipeline = tuple(int(n) for n in opts.pipeline.split(','))
+        except ValueError:
+            opts.pipeline = None
+        if opts.pipeline is None or len(opts.pipeline) != 3 or min(opts.pipeline) <= 0:
+            parser.error('invalid pipeline specified')
+        if opts.jobs > 1:
+            parser.error('--jobs can not be used with --pipeline, which sets its own number of extraction workers')
     if opts.playlistend not in (-1, None) and opts.playlistend < opts.playliststart:
         raise ValueError('Playlist end must be greater than playlist start')
     if opts.extractaudio:
@@ -305,17 +365,31 @@ def _real_main(argv=None):
         'ignoreerrors': opts.ignoreerrors,
         'force_generic_extractor': opts.force_generic_extractor,
         'ratelimit': opts.ratelimit,
+        'total_ratelimit': opts.total_ratelimit,
+        'host_ratelimit': opts.host_ratelimit,
         'nooverwrites': opts.nooverwrites,
         'retries': opts.retries,
+        'http_connections': opts.http_connections,
+        'disk_write_buffer': opts.disk_write_buffer,
+        'preallocate': opts.preallocate,
         'fragment_retries': opts.fragment_retries,
+        'extractor_retries': opts.extractor_retries,
+        'retry_backoff': opts.retry_backoff,
+        'circuit_breaker': opts.circuit_breaker,
         'buffersize': opts.buffersize,
         'noresizebuffer': opts.noresizebuffer,
         'continuedl': opts.continue_dl,
         'noprogress': opts.noprogress,
         'progress_with_newline': opts.progress_with_newline,
+        'progress_rate': opts.progress_rate,
         'playliststart': opts.playliststart,
         'playlistend': opts.playlistend,
         'playlistreverse': opts.playlist_reverse,
+        'lazy_playlist': opts.lazy_playlist,
+        'concurrent_entries': opts.concurrent_entries,
+        'jobs': opts.jobs,
+        'jobs_per_host': opts.jobs_per_host,
+        'pipeline': opts.pipeline,
         'noplaylist': opts.noplaylist,
         'logtostderr': opts.outtmpl == '-',
         'consoletitle': opts.consoletitle,
@@ -338,6 +412,10 @@ def _real_main(argv=None):
         'prefer_free_formats': opts.prefer_free_formats,
         'verbose': opts.verbose,
         'dump_intermediate_pages': opts.dump_intermediate_pages,
+        'cassette': opts.record_http or opts.replay_http,
+        'cassette_mode': 'record' if opts.record_http else 'replay' if opts.replay_http else None,
+        'cassette_latency': opts.replay_latency,
+        'cassette_rate': opts.replay_rate,
         'write_pages': opts.write_pages,
         'test': opts.test,
         'keepvideo': opts.keepvideo,
@@ -347,9 +425,12 @@ def _real_main(argv=None):
         'max_views': opts.max_views,
         'daterange': date,
         'cachedir': opts.cachedir,
+        'http_cache': opts.http_cache,
+        'http_cache_size': opts.http_cache_size,
         'youtube_print_sig_code': opts.youtube_print_sig_code,
         'age_limit': opts.age_limit,
         'download_archive': download_archive_fn,
+        'stop_after_archived': opts.stop_after_archived,
         'cookiefile': opts.cookiefile,
         'nocheckcertificate': opts.no_check_certificate,
         'prefer_insecure': opts.prefer_insecure,
@@ -368,6 +449,8 @@ def _real_main(argv=None):
         'postprocessors': postprocessors,
         'fixup': opts.fixup,
         'source_address': opts.source_address,
+        'dns_cache_ttl': opts.dns_cache_ttl,
+        'happy_eyeballs': opts.happy_eyeballs,
         'call_home': opts.call_home,
         'sleep_interval': opts.sleep_interval,
         'external_downloader': opts.external_downloader,
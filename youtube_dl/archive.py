@@ -0,0 +1,65 @@
+from __future__ import unicode_literals
+
+import errno
+import os
+import threading
+
+from .utils import locked_file
+
+
+class DownloadArchive(object):
+    """
+    The download archive file, which lists the archive id of each downloaded
+    video in a separate line.
+
+    Its ids are kept in memory, so that checking if a video is in the archive
+    doesn't need to read the whole file. Before each check, the lines that
+    other processes appended to the file since it was last read are loaded.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._ids = set()
+        self._offset = 0
+        self._file_id = None
+
+    def _refresh(self):
+        try:
+            st = os.stat(self.filename)
+        except OSError as ose:
+            if ose.errno != errno.ENOENT:
+                raise
+            self._reset()
+            return
+        file_id = (st.st_dev, st.st_ino)
+        if file_id != self._file_id or st.st_size < self._offset:
+            # The file was replaced or truncated
+            self._reset()
+            self._file_id = file_id
+        if st.st_size == self._offset:
+            return
+        with locked_file(self.filename, 'rb') as archive_file:
+            archive_file.seek(self._offset)
+            data = archive_file.read()
+        # Leave a partially written last line for the next refresh
+        end = data.rfind(b'\n') + 1
+        if end == 0:
+            return
+        self._offset += end
+        self._ids.update(
+            line.strip() for line in data[:end].decode('utf-8').splitlines())
+
+    def __contains__(self, vid_id):
+        with self._lock:
+            self._refresh()
+            return vid_id in self._ids
+
+    def add(self, vid_id):
+        with self._lock:
+            with locked_file(self.filename, 'a', encoding='utf-8') as archive_file:
+                archive_file.write(vid_id + '\n')
+            self._ids.add(vid_id)
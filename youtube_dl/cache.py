@@ -12,6 +12,12 @@ from .compat import compat_expanduser, compat_getenv
 from .utils import write_json_file
 
 
+def get_default_cache_dir():
+    """ Returns the cache directory used when no cachedir is given """
+    cache_root = compat_getenv('XDG_CACHE_HOME', '~/.cache')
+    return compat_expanduser(os.path.join(cache_root, 'youtube-dl'))
+
+
 class Cache(object):
     def __init__(self, ydl):
         self._ydl = ydl
@@ -19,16 +25,19 @@ class Cache(object):
     def _get_root_dir(self):
         res = self._ydl.params.get('cachedir')
         if res is None:
-            cache_root = compat_getenv('XDG_CACHE_HOME', '~/.cache')
-            res = os.path.join(cache_root, 'youtube-dl')
+            return get_default_cache_dir()
         return compat_expanduser(res)
 
-    def _get_cache_fn(self, section, key, dtype):
+    def get_section_dir(self, section):
+        """ Returns the directory in which the files of section are stored """
         assert re.match(r'^[a-zA-Z0-9_.-]+$', section), \
             'invalid section %r' % section
+        return os.path.join(self._get_root_dir(), section)
+
+    def _get_cache_fn(self, section, key, dtype):
         assert re.match(r'^[a-zA-Z0-9_.-]+$', key), 'invalid key %r' % key
         return os.path.join(
-            self._get_root_dir(), section, '%s.%s' % (key, dtype))
+            self.get_section_dir(section), '%s.%s' % (key, dtype))
 
     @property
     def enabled(self):
@@ -0,0 +1,235 @@
+from __future__ import unicode_literals
+
+import errno
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .compat import (
+    compat_urllib_error,
+    compat_urllib_request,
+)
+from .utils import (
+    BandwidthScheduler,
+    BandwidthStream,
+    make_http_headers,
+    write_json_file,
+    YoutubeDLHandler,
+)
+
+
+class Cassette(object):
+    """
+    A directory of recorded HTTP exchanges. The bodies are stored once in
+    bodies/, named after their SHA-1, and the responses to each request in
+    order, in a JSON file of requests/ named after the hash of the request.
+    """
+
+    def __init__(self, cassette_dir):
+        self.cassette_dir = cassette_dir
+        self._lock = threading.Lock()
+        # request key -> number of times it was replayed
+        self._replayed = {}
+
+    @staticmethod
+    def request_key(req):
+        # The headers are left out, they change between runs (cookies,
+        # user agent...), but not the Range of partial downloads
+        data = req.data if hasattr(req, 'data') else req.get_data()
+        if not isinstance(data, bytes):
+            data = b''
+        parts = [
+            req.get_method(), req.get_full_url(), req.get_header('Range') or '',
+            hashlib.sha1(data).hexdigest()]
+        return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+    def _fn(self, *path):
+        return os.path.join(self.cassette_dir, *path)
+
+    def _load_responses(self, key):
+        try:
+            with io.open(self._fn('requests', key + '.json'), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except IOError as ioe:
+            if ioe.errno != errno.ENOENT:
+                raise
+            return []
+
+    def new_body_file(self):
+        """ Returns a temporary file in which a body can be written """
+        bodies_dir = self._fn('bodies')
+        try:
+            os.makedirs(bodies_dir)
+        except OSError as ose:
+            if ose.errno != errno.EEXIST:
+                raise
+        fd, tmp_fn = tempfile.mkstemp(dir=bodies_dir, suffix='.tmp')
+        return os.fdopen(fd, 'wb'), tmp_fn
+
+    def record(self, key, response, body_fn, body_hash):
+        """ Stores the response to the request key, its body written to body_fn """
+        body_path = self._fn('bodies', body_hash)
+        with self._lock:
+            if os.path.exists(body_path):
+                os.remove(body_fn)
+            else:
+                os.rename(body_fn, body_path)
+            response = dict(response, body=body_hash)
+            requests_dir = self._fn('requests')
+            if not os.path.exists(requests_dir):
+                os.makedirs(requests_dir)
+            write_json_file(
+                self._load_responses(key) + [response],
+                self._fn('requests', key + '.json'))
+
+    def replay(self, key):
+        """
+        Returns the next recorded response to the request key and the name
+        of its body file, the last one once they have all been replayed, or
+        None if the request wasn't recorded
+        """
+        with self._lock:
+            responses = self._load_responses(key)
+            if not responses:
+                return None
+            count = self._replayed.get(key, 0)
+            self._replayed[key] = count + 1
+        response = responses[min(count, len(responses) - 1)]
+        return response, self._fn('bodies', response['body'])
+
+
+class _RecordingReader(io.RawIOBase):
+    """ Copies a response to a body file as it is read, and records it at the end """
+
+    def __init__(self, fp, cassette, key, response):
+        self._fp = fp
+        self._cassette = cassette
+        self._key = key
+        self._response = response
+        self._body_file, self._body_fn = cassette.new_body_file()
+        self._hash = hashlib.sha1()
+
+    def readable(self):
+        return True
+
+    def _record(self):
+        if self._body_file is not None:
+            self._body_file.close()
+            self._body_file = None
+            self._cassette.record(
+                self._key, self._response, self._body_fn, self._hash.hexdigest())
+
+    def readinto(self, b):
+        data = self._fp.read(len(b))
+        n = len(data)
+        b[:n] = data
+        if self._body_file is not None:
+            if n == 0:
+                self._record()
+            else:
+                self._body_file.write(data)
+                self._hash.update(data)
+        return n
+
+    def close(self):
+        if not self.closed:
+            # A partially read body is recorded as it is
+            self._record()
+            self._fp.close()
+        io.RawIOBase.close(self)
+
+
+class _ThrottledReader(io.RawIOBase):
+    def __init__(self, fp, url, scheduler):
+        self._fp = fp
+        self._url = url
+        self._scheduler = scheduler
+        self._stream = BandwidthStream()
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        data = self._fp.read(len(b))
+        n = len(data)
+        b[:n] = data
+        if n:
+            self._scheduler.consume(self._stream, self._url, n)
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._fp.close()
+        io.RawIOBase.close(self)
+
+
+class CassetteHandler(compat_urllib_request.BaseHandler):
+    """
+    Records the HTTP responses to a Cassette ("record" mode), or answers the
+    requests from it without using the network ("replay" mode). Replayed
+    responses can be delayed by latency seconds, and their bodies read at
+    rate bytes per second.
+    """
+
+    # Before YoutubeDLHandler, so that the bodies are stored undecoded and no
+    # connection is opened in replay mode
+    handler_order = 450
+
+    def __init__(self, cassette, mode, latency=None, rate=None):
+        assert mode in ('record', 'replay')
+        self._cassette = cassette
+        self._mode = mode
+        self._latency = latency
+        self._scheduler = BandwidthScheduler(rate, burst=0) if rate else None
+
+    def http_open(self, req):
+        if self._mode != 'replay':
+            return None
+        url = req.get_full_url()
+        entry = self._cassette.replay(Cassette.request_key(req))
+        if entry is None:
+            raise compat_urllib_error.URLError('%s %s is not in the cassette' % (req.get_method(), url))
+        response, body_fn = entry
+        if self._latency:
+            time.sleep(self._latency)
+        body = open(body_fn, 'rb')
+        if self._scheduler is not None:
+            body = io.BufferedReader(_ThrottledReader(body, url, self._scheduler))
+        resp = YoutubeDLHandler.addinfourl_wrapper(
+            body, make_http_headers(response['headers']), response['url'], response['code'])
+        resp.msg = response['msg']
+        resp._cassette_replay = True
+        return resp
+
+    def http_response(self, req, resp):
+        if self._mode != 'record' or getattr(resp, '_cassette_replay', False):
+            return resp
+        response = {
+            'url': resp.geturl(),
+            'code': resp.code,
+            'msg': resp.msg,
+            # The body is stored without its chunked encoding
+            'headers': [
+                (k, v) for k, v in resp.headers.items()
+                if k.lower() != 'transfer-encoding'],
+        }
+        reader = _RecordingReader(resp, self._cassette, Cassette.request_key(req), response)
+        if resp.code >= 300:
+            # The bodies of redirections and errors may never be read, record
+            # them now
+            body = reader.read()
+            reader.close()
+            stream = io.BytesIO(body)
+        else:
+            stream = io.BufferedReader(reader)
+        new_resp = YoutubeDLHandler.addinfourl_wrapper(
+            stream, resp.headers, resp.geturl(), resp.code)
+        new_resp.msg = resp.msg
+        return new_resp
+
+    https_open = http_open
+    https_response = http_response
@@ -2333,6 +2333,11 @@ try:
 except ImportError:
     import BaseHTTPServer as compat_http_server
 
+try:
+    import socketserver as compat_socketserver
+except ImportError:  # Python 2
+    import SocketServer as compat_socketserver
+
 try:
     compat_str = unicode  # Python 2
 except NameError:
@@ -2478,6 +2483,11 @@ try:
 except NameError:
     compat_chr = chr
 
+try:
+    compat_memoryview = memoryview
+except NameError:  # Python 2.6
+    compat_memoryview = None
+
 try:
     from xml.etree.ElementTree import ParseError as compat_xml_parse_error
 except ImportError:  # Python 2.6
@@ -2874,6 +2884,7 @@ __all__ = [
     'compat_input',
     'compat_itertools_count',
     'compat_kwargs',
+    'compat_memoryview',
     'compat_ord',
     'compat_os_name',
     'compat_parse_qs',
@@ -2882,6 +2893,7 @@ __all__ = [
     'compat_shlex_quote',
     'compat_shlex_split',
     'compat_socket_create_connection',
+    'compat_socketserver',
     'compat_str',
     'compat_struct_pack',
     'compat_struct_unpack',
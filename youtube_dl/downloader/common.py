@@ -1,8 +1,11 @@
 from __future__ import division, unicode_literals
 
+import collections
+import errno
 import os
 import re
 import sys
+import threading
 import time
 
 from ..compat import compat_os_name
@@ -11,6 +14,8 @@ from ..utils import (
     error_to_compat_str,
     decodeArgument,
     format_bytes,
+    free_disk_space,
+    preallocate_file,
     timeconvert,
 )
 
@@ -30,11 +35,22 @@ class FileDownloader(object):
     verbose:            Print additional info to stdout.
     quiet:              Do not print messages to stdout.
     ratelimit:          Download speed limit, in bytes/sec.
-    retries:            Number of times to retry for HTTP error 5xx
+    bandwidth_weight:   Share of the bandwidth of the YoutubeDL object that the
+                        download gets when its total rate limit is reached,
+                        relative to the other downloads (default 1).
+    retries:            Number of times to retry for the errors that the
+                        retry policy of the YoutubeDL object deems retryable
+    http_connections:   Number of connections on which HttpFD downloads the
+                        ranges of a file, if the server accepts them.
     buffersize:         Size of download buffer in bytes.
     noresizebuffer:     Do not automatically resize the download buffer.
+    disk_write_buffer:  Write to disk from a separate thread, with up to this
+                        many bytes waiting to be written (HttpFD).
     continuedl:         Try to continue downloads if possible.
     noprogress:         Do not print the progress bar.
+    progress_rate:      Maximum number of "downloading" progress statuses passed
+                        to the progress hooks per second (default 10), 0 to pass
+                        them all. The other statuses are always passed.
     logtostderr:        Log messages to stderr instead of stdout.
     consoletitle:       Display progress in console window's titlebar.
     nopart:             Do not use temporary .part files.
@@ -44,6 +60,9 @@ class FileDownloader(object):
     max_filesize:       Skip files larger than this size
     xattr_set_filesize: Set ytdl.filesize user xattribute with expected size.
                         (experimental)
+    preallocate:        Allocate the disk space of the files whose size is known
+                        or estimated before writing them, and fail early if the
+                        disk is full.
     external_downloader_args:  A list of additional command-line arguments for the
                         external downloader.
     hls_use_mpegts:     Use the mpegts container for HLS videos.
@@ -59,6 +78,9 @@ class FileDownloader(object):
         self.ydl = ydl
         self._progress_hooks = []
         self.params = params
+        progress_rate = params.get('progress_rate', 10)
+        self._progress_interval = 1.0 / progress_rate if progress_rate else 0
+        self._last_progress_time = None
         self.add_progress_hook(self.report_progress)
 
     @staticmethod
@@ -186,6 +208,42 @@ class FileDownloader(object):
             return filename[:-len('.part')]
         return filename
 
+    def check_disk_space(self, filename, size):
+        """ Returns False after reporting an error if there is no room for size more bytes in filename """
+        free = free_disk_space(filename)
+        if free is not None and size > free:
+            self.report_error('insufficient disk space: %s needed, %s available' % (
+                format_bytes(size), format_bytes(free)))
+            return False
+        return True
+
+    def reserve_disk_space(self, stream, filename, size):
+        """
+        Extends the file of stream, opened in a mode that doesn't append, to
+        size bytes, preallocated on the disk if the preallocate option is set.
+        Returns False after reporting an error if the disk is full.
+        """
+        if self.params.get('preallocate', False):
+            try:
+                stream.flush()
+                current_size = os.fstat(stream.fileno()).st_size
+            except (IOError, OSError):
+                current_size = 0
+            if not self.check_disk_space(filename, size - current_size):
+                return False
+        try:
+            if self.params.get('preallocate', False):
+                preallocate_file(stream, size)
+            else:
+                stream.truncate(size)
+        except (IOError, OSError) as err:
+            if err.errno == errno.ENOSPC:
+                self.report_error('insufficient disk space: %s' % error_to_compat_str(err))
+            else:
+                self.report_error('unable to allocate %s: %s' % (filename, error_to_compat_str(err)))
+            return False
+        return True
+
     def try_rename(self, old_filename, new_filename):
         try:
             if old_filename == new_filename:
@@ -300,11 +358,28 @@ class FileDownloader(object):
         self.to_screen('[download] Resuming download at byte %s' % resume_len)
 
     def report_retry(self, count, retries):
-        """Report retry in case of HTTP error 5xx"""
+        """Report retry in case of a retryable error"""
         self.to_screen(
             '[download] Got server HTTP error. Retrying (attempt %d of %s)...'
             % (count, self.format_retries(retries)))
 
+    def wait_for_host(self, url):
+        """Wait while the circuit breaker of the host of url is open"""
+        delay = self.ydl.retry_policy.host_delay(url)
+        if delay > 0:
+            self.to_screen('[download] Too many errors from the server, sleeping %.2f seconds...' % delay)
+            time.sleep(delay)
+
+    def sleep_before_retry(self, url, err, count):
+        """Record the error and wait before the retry number count"""
+        retry_policy = self.ydl.retry_policy
+        if retry_policy.is_retryable(err):
+            retry_policy.record_error(url)
+        delay = retry_policy.retry_delay(err, count)
+        if delay > 0:
+            self.to_screen('[download] Sleeping %.2f seconds...' % delay)
+            time.sleep(delay)
+
     def report_file_already_downloaded(self, file_name):
         """Report file has already been fully downloaded."""
         try:
@@ -342,10 +417,18 @@ class FileDownloader(object):
             })
             return True
 
+        # Not passed to the downloaders of the fragments, which don't sleep
         sleep_interval = self.params.get('sleep_interval')
         if sleep_interval:
-            self.to_screen('[download] Sleeping %s seconds...' % sleep_interval)
-            time.sleep(sleep_interval)
+            host_limiter = getattr(self.ydl, 'host_limiter', None)
+            url = info_dict.get('url')
+            if host_limiter is not None and url:
+                delay = host_limiter.reserve(url)
+            else:
+                delay = sleep_interval
+            if delay > 0:
+                self.to_screen('[download] Sleeping %.2f seconds...' % delay)
+                time.sleep(delay)
 
         return self.real_download(filename, info_dict)
 
@@ -353,7 +436,17 @@ class FileDownloader(object):
         """Real download process. Redefine in subclasses."""
         raise NotImplementedError('This method must be implemented by subclasses')
 
+    def _progress_due(self, now):
+        """ Whether a "downloading" status would be passed to the progress hooks at time now """
+        return (self._last_progress_time is None or
+                now - self._last_progress_time >= self._progress_interval)
+
     def _hook_progress(self, status):
+        if status.get('status') == 'downloading':
+            now = time.time()
+            if not self._progress_due(now):
+                return
+            self._last_progress_time = now
         for ph in self._progress_hooks:
             ph(status)
 
@@ -362,6 +455,9 @@ class FileDownloader(object):
         # this interface
         self._progress_hooks.append(ph)
 
+    def remove_progress_hook(self, ph):
+        self._progress_hooks.remove(ph)
+
     def _debug_cmd(self, args, exe=None):
         if not self.params.get('verbose', False):
             return
@@ -378,3 +474,94 @@ class FileDownloader(object):
             shell_quote = repr
         self.to_screen('[debug] %s command line: %s' % (
             exe, shell_quote(str_args)))
+
+
+class SpeedMeter(object):
+    """
+    Measures the speed of a download over its last window seconds, from its
+    downloaded bytes at different times.
+    """
+
+    def __init__(self, window=3.0):
+        self._window = window
+        self._samples = collections.deque()
+
+    def update(self, now, byte_counter):
+        """ Records byte_counter at time now, returns the current speed or None """
+        samples = self._samples
+        # Keep one sample at least window seconds old to measure from
+        while len(samples) > 1 and now - samples[1][0] >= self._window:
+            samples.popleft()
+        if not samples or now - samples[-1][0] >= self._window / 30:
+            samples.append((now, byte_counter))
+        then, then_byte_counter = samples[0]
+        return FileDownloader.calc_speed(then, now, byte_counter - then_byte_counter)
+
+    @staticmethod
+    def eta(remaining, speed):
+        if remaining is None or not speed:
+            return None
+        return int(float(remaining) / speed)
+
+
+class CombinedProgress(object):
+    """
+    Combines the progress of several files downloaded at the same time
+    into a single status, which is passed to report_progress.
+
+    Use hook(filename) as the progress hook of the download of filename.
+    """
+
+    def __init__(self, report_progress, filenames):
+        self._report_progress = report_progress
+        self._statuses = dict((fn, None) for fn in filenames)
+        self._lock = threading.Lock()
+
+    def hook(self, filename):
+        def progress_hook(status):
+            with self._lock:
+                self._statuses[filename] = status
+                combined = self._combine(list(self._statuses.values()))
+            if combined is not None:
+                self._report_progress(combined)
+        return progress_hook
+
+    @staticmethod
+    def _combine(statuses):
+        started = [s for s in statuses if s is not None]
+        if not started:
+            return None
+        if any(s['status'] == 'error' for s in started):
+            return {'status': 'error'}
+
+        def downloaded(s):
+            if s['status'] == 'finished':
+                return s.get('total_bytes') or s.get('downloaded_bytes') or 0
+            return s.get('downloaded_bytes') or 0
+
+        def size(s):
+            return s.get('total_bytes') or s.get('total_bytes_estimate')
+
+        downloading = [s for s in started if s['status'] == 'downloading']
+        combined = {
+            'status': 'downloading',
+            'downloaded_bytes': sum(downloaded(s) for s in started),
+        }
+        # The sizes are only known once all the downloads have started
+        if len(started) == len(statuses):
+            if not downloading:
+                combined['status'] = 'finished'
+                combined['total_bytes'] = combined['downloaded_bytes']
+            elif all(s.get('total_bytes') is not None for s in started):
+                combined['total_bytes'] = sum(s['total_bytes'] for s in started)
+            elif all(size(s) is not None for s in started):
+                combined['total_bytes_estimate'] = sum(size(s) for s in started)
+
+        speeds = [s['speed'] for s in downloading if s.get('speed') is not None]
+        combined['speed'] = sum(speeds) if speeds else None
+        etas = [s['eta'] for s in downloading if s.get('eta') is not None]
+        combined['eta'] = max(etas) if etas else None
+        elapsed = [s['elapsed'] for s in started if s.get('elapsed') is not None]
+        if elapsed:
+            combined['elapsed'] = max(elapsed)
+        return combined
@@ -1,10 +1,18 @@
 from __future__ import division, unicode_literals
 
 import os
+import socket
 import time
 
-from .common import FileDownloader
+from .common import (
+    FileDownloader,
+    SpeedMeter,
+)
 from .http import HttpFD
+from ..compat import (
+    compat_http_client,
+    compat_urllib_error,
+)
 from ..utils import (
     encodeFilename,
     sanitize_open,
@@ -15,6 +23,10 @@ class HttpQuietDownloader(HttpFD):
     def to_screen(self, *args, **kargs):
         pass
 
+    def _give_up(self, err, retries):
+        # Retried by FragmentFD._download_fragment
+        raise err
+
 
 class FragmentFD(FileDownloader):
     """
@@ -22,7 +34,8 @@ class FragmentFD(FileDownloader):
 
     Available options:
 
-    fragment_retries:   Number of times to retry a fragment for HTTP error (DASH only)
+    fragment_retries:   Number of times to retry a fragment for the errors that
+                        the retry policy deems retryable
     """
 
     def report_retry_fragment(self, fragment_name, count, retries):
@@ -30,6 +43,47 @@ class FragmentFD(FileDownloader):
             '[download] Got server HTTP error. Retrying fragment %s (attempt %d of %s)...'
             % (fragment_name, count, self.format_retries(retries)))
 
+    def _download_fragment(self, ctx, frag_url, frag_name, retry_codes=()):
+        """
+        Download a fragment, retrying it on the retryable errors and the HTTP
+        errors with a code in retry_codes. Returns the content of the fragment
+        and the name of its file, or (None, None) if the download failed.
+        """
+        frag_filename = '%s-%s' % (ctx['tmpfilename'], frag_name)
+        fragment_retries = self.params.get('fragment_retries', 0)
+        count = 0
+        while True:
+            self.wait_for_host(frag_url)
+            try:
+                if not ctx['dl'].download(frag_filename, {'url': frag_url}):
+                    return None, None
+                break
+            except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error) as err:
+                if not (self.ydl.retry_policy.is_retryable(err) or (
+                        isinstance(err, compat_urllib_error.HTTPError) and err.code in retry_codes)):
+                    raise
+                count += 1
+                if count > fragment_retries:
+                    self.report_error('giving up after %s fragment retries' % fragment_retries)
+                    return None, None
+                self.report_retry_fragment(frag_name, count, fragment_retries)
+                self.sleep_before_retry(frag_url, err, count)
+        down, frag_sanitized = sanitize_open(frag_filename, 'rb')
+        frag_content = down.read()
+        down.close()
+        if not self._reserve_frag_disk_space(ctx, len(frag_content)):
+            return None, None
+        return frag_content, frag_sanitized
+
+    def _reserve_frag_disk_space(self, ctx, frag_size):
+        """ Preallocates the size of the output estimated from its first fragment """
+        if (not self.params.get('preallocate', False) or ctx['live'] or
+                'reserved_bytes' in ctx or ctx['tmpfilename'] == '-' or
+                not ctx.get('total_frags')):
+            return True
+        ctx['reserved_bytes'] = frag_size * ctx['total_frags']
+        return self.reserve_disk_space(ctx['dest_stream'], ctx['tmpfilename'], ctx['reserved_bytes'])
+
     def _prepare_and_start_frag_download(self, ctx):
         self._prepare_frag_download(ctx)
         self._start_frag_download(ctx)
@@ -48,7 +102,9 @@ class FragmentFD(FileDownloader):
                 'quiet': True,
                 'noprogress': True,
                 'ratelimit': self.params.get('ratelimit'),
-                'retries': self.params.get('retries', 0),
+                'bandwidth_weight': self.params.get('bandwidth_weight', 1),
+                # The fragments are retried as a whole, with fragment_retries
+                'retries': 0,
                 'test': self.params.get('test', False),
             }
         )
@@ -74,6 +130,8 @@ class FragmentFD(FileDownloader):
         }
 
         start = time.time()
+        speed_meter = SpeedMeter()
+        speed_meter.update(start, 0)
         ctx.update({
             'started': start,
             # Total complete fragments downloaded so far in bytes
@@ -104,12 +162,12 @@ class FragmentFD(FileDownloader):
             else:
                 frag_downloaded_bytes = s['downloaded_bytes']
                 state['downloaded_bytes'] += frag_downloaded_bytes - ctx['prev_frag_downloaded_bytes']
+                # Over all the fragments rather than the current one, which
+                # can be shorter than the window of the meter
+                state['speed'] = speed_meter.update(time_now, state['downloaded_bytes'])
                 if not ctx['live']:
-                    state['eta'] = self.calc_eta(
-                        start, time_now, estimated_size,
-                        state['downloaded_bytes'])
-                state['speed'] = s.get('speed') or ctx.get('speed')
-                ctx['speed'] = state['speed']
+                    state['eta'] = speed_meter.eta(
+                        estimated_size - state['downloaded_bytes'], state['speed'])
                 ctx['prev_frag_downloaded_bytes'] = frag_downloaded_bytes
             self._hook_progress(state)
 
@@ -118,6 +176,9 @@ class FragmentFD(FileDownloader):
         return start
 
     def _finish_frag_download(self, ctx):
+        if 'reserved_bytes' in ctx:
+            # Drop what was preallocated beyond the actual size
+            ctx['dest_stream'].truncate()
         ctx['dest_stream'].close()
         elapsed = time.time() - ctx['started']
         self.try_rename(ctx['tmpfilename'], ctx['filename'])
@@ -18,7 +18,6 @@ from ..compat import (
 )
 from ..utils import (
     encodeFilename,
-    sanitize_open,
     parse_m3u8_attributes,
 )
 
@@ -94,13 +93,10 @@ class HlsFD(FragmentFD):
                         line
                         if re.match(r'^https?://', line)
                         else compat_urlparse.urljoin(man_url, line))
-                    frag_filename = '%s-Frag%d' % (ctx['tmpfilename'], i)
-                    success = ctx['dl'].download(frag_filename, {'url': frag_url})
-                    if not success:
+                    frag_content, frag_sanitized = self._download_fragment(
+                        ctx, frag_url, 'Frag%d' % i)
+                    if frag_content is None:
                         return False
-                    down, frag_sanitized = sanitize_open(frag_filename, 'rb')
-                    frag_content = down.read()
-                    down.close()
                     if decrypt_info['METHOD'] == 'AES-128':
                         iv = decrypt_info.get('IV') or compat_struct_pack('>8xq', media_sequence)
                         frag_content = AES.new(
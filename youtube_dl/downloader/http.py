@@ -1,22 +1,160 @@
 from __future__ import unicode_literals
 
+import collections
 import errno
+import io
+import json
 import os
 import socket
+import threading
 import time
 import re
 
-from .common import FileDownloader
-from ..compat import compat_urllib_error
+from .common import (
+    FileDownloader,
+    SpeedMeter,
+)
+from ..compat import (
+    compat_http_client,
+    compat_memoryview,
+    compat_urllib_error,
+)
 from ..utils import (
+    BandwidthStream,
     ContentTooShortError,
     encodeFilename,
     sanitize_open,
     sanitized_Request,
+    write_json_file,
 )
 
 
+class _RangeNotSatisfiedError(Exception):
+    pass
+
+
+class _SizeChangedError(_RangeNotSatisfiedError):
+    pass
+
+
+class _BlockReader(object):
+    """
+    Reads the blocks of a response into a reused buffer with readinto. A
+    block is a memoryview of the buffer, only valid until the next read.
+    Responses without readinto (Python 2) are read the usual way.
+    """
+
+    def __init__(self, response):
+        self._response = response
+        self._readinto = getattr(response, 'readinto', None)
+        self._view = None
+
+    def read(self, size):
+        if self._readinto is None:
+            return self._response.read(size)
+        if self._view is None or len(self._view) < size:
+            self._view = memoryview(bytearray(size))
+        return self._view[:self._readinto(self._view[:size])]
+
+    def readinto(self, buf, size):
+        """ Reads at most size bytes into the bytearray buf, returns their number """
+        if self._readinto is None:
+            data = self._response.read(size)
+            buf[:len(data)] = data
+            return len(data)
+        return self._readinto(memoryview(buf)[:size])
+
+
+class _WriterThread(object):
+    """
+    Writes the downloaded blocks to a stream from another thread, so that a
+    slow disk doesn't stop the reads from the network. The blocks are read
+    into a ring of buffers that holds at most max_size bytes: get_buffer
+    waits for the writer to free one when they are all in use.
+    """
+
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._cond = threading.Condition()
+        # Filled buffers and their lengths, waiting to be written
+        self._queue = collections.deque()
+        self._free = []
+        self._allocated = 0
+        self._closing = False
+        self._error = None
+        self._thread = None
+
+    def start(self, stream):
+        self._stream = stream
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def get_buffer(self, size):
+        """ Returns a free bytearray of at least size bytes """
+        with self._cond:
+            while True:
+                if self._error is not None:
+                    return bytearray(size)
+                for i, buf in enumerate(self._free):
+                    if len(buf) >= size:
+                        return self._free.pop(i)
+                if self._free:
+                    # Too small for the current block size
+                    self._allocated -= len(self._free.pop())
+                    continue
+                if self._allocated + size <= self.max_size or self._allocated == 0:
+                    self._allocated += size
+                    return bytearray(size)
+                self._cond.wait()
+
+    def write(self, buf, length):
+        """ Queues the first length bytes of buf, raises the last write error """
+        with self._cond:
+            if self._error is not None:
+                raise self._error
+            self._queue.append((buf, length))
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closing:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                buf, length = self._queue.popleft()
+            error = None
+            if self._error is None:
+                try:
+                    if compat_memoryview is not None:
+                        self._stream.write(compat_memoryview(buf)[:length])
+                    else:
+                        self._stream.write(bytes(buf[:length]))
+                except Exception as err:
+                    # Raised by the next write, the buffers aren't waited for
+                    # anymore
+                    error = err
+            with self._cond:
+                if error is not None:
+                    self._error = error
+                self._free.append(buf)
+                self._cond.notify_all()
+
+    def close(self):
+        """ Waits for the queued blocks to be written, returns the write error if any """
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+        return self._error
+
+
 class HttpFD(FileDownloader):
+    # The ranges are not split below this size
+    _MIN_RANGE_SIZE = 1024 * 1024
+
     def real_download(self, filename, info_dict):
         url = info_dict['url']
         tmpfilename = self.temp_name(filename)
@@ -35,6 +173,26 @@ class HttpFD(FileDownloader):
         if is_test:
             request.add_header('Range', 'bytes=0-%s' % str(self._TEST_FILE_SIZE - 1))
 
+        connections = self.params.get('http_connections') or 1
+        preallocate = self.params.get('preallocate', False)
+        # Preallocated files are downloaded as ranges too, their size doesn't
+        # tell how much of them was downloaded
+        segmented = (connections > 1 or preallocate) and not is_test and tmpfilename != '-'
+        if not is_test and tmpfilename != '-':
+            # A file downloaded in ranges has its full size from the start, it
+            # is resumed from its state whatever the current options are
+            state_fn = self._ranges_state_filename(tmpfilename)
+            if os.path.exists(encodeFilename(state_fn)):
+                ranges_state = None
+                if self.params.get('continuedl', True):
+                    ranges_state = self._load_ranges_state(tmpfilename)
+                if ranges_state is not None:
+                    self.report_resuming_byte(sum(
+                        pos - start for start, pos, end in ranges_state['ranges']))
+                    return self._download_ranges(filename, tmpfilename, info_dict, headers, ranges_state)
+                # Its size can't be used to resume it
+                self._remove_ranges_download(tmpfilename)
+
         # Establish possible resume length
         if os.path.isfile(encodeFilename(tmpfilename)):
             resume_len = os.path.getsize(encodeFilename(tmpfilename))
@@ -52,10 +210,13 @@ class HttpFD(FileDownloader):
 
         count = 0
         retries = self.params.get('retries', 0)
+        retry_policy = self.ydl.retry_policy
         while count <= retries:
+            self.wait_for_host(url)
             # Establish connection
             try:
                 data = self.ydl.urlopen(request)
+                retry_policy.record_success(url)
                 # When trying to resume, Content-Range HTTP header of response has to be checked
                 # to match the value of requested Range HTTP header. This is due to a webservers
                 # that don't support resuming and serve a whole file with no Content-Range
@@ -76,7 +237,8 @@ class HttpFD(FileDownloader):
                     open_mode = 'wb'
                 break
             except (compat_urllib_error.HTTPError, ) as err:
-                if (err.code < 500 or err.code >= 600) and err.code != 416:
+                last_error = err
+                if err.code != 416 and not retry_policy.is_retryable(err):
                     # Unexpected HTTP error
                     raise
                 elif err.code == 416:
@@ -86,7 +248,8 @@ class HttpFD(FileDownloader):
                         data = self.ydl.urlopen(basic_request)
                         content_length = data.info()['Content-Length']
                     except (compat_urllib_error.HTTPError, ) as err:
-                        if err.code < 500 or err.code >= 600:
+                        last_error = err
+                        if not retry_policy.is_retryable(err):
                             raise
                     else:
                         # Examine the reported length
@@ -114,19 +277,20 @@ class HttpFD(FileDownloader):
                             resume_len = 0
                             open_mode = 'wb'
                             break
-            except socket.error as e:
-                if e.errno != errno.ECONNRESET:
-                    # Connection reset is no problem, just retry
+            except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error) as e:
+                last_error = e
+                # Timeouts and resets are no problem, just retry
+                if not retry_policy.is_retryable(e):
                     raise
 
             # Retry
             count += 1
             if count <= retries:
                 self.report_retry(count, retries)
+                self.sleep_before_retry(url, last_error, count)
 
         if count > retries:
-            self.report_error('giving up after %s retries' % retries)
-            return False
+            return self._give_up(last_error, retries)
 
         data_len = data.info().get('Content-length', None)
 
@@ -149,81 +313,128 @@ class HttpFD(FileDownloader):
                 self.to_screen('\r[download] File is larger than max-filesize (%s bytes > %s bytes). Aborting.' % (data_len, max_data_len))
                 return False
 
+        if (segmented and resume_len == 0 and data_len is not None and
+                (preallocate or data_len >= 2 * self._MIN_RANGE_SIZE) and
+                (data.info().get('Accept-Ranges') or '').lower() == 'bytes'):
+            ranges_state = self._new_ranges_state(
+                data_len, connections, data.info().get('last-modified'))
+            return self._download_ranges(
+                filename, tmpfilename, info_dict, headers, ranges_state, data)
+
+        if preallocate and data_len is not None and tmpfilename != '-':
+            # The file can't be preallocated without range requests to
+            # resume it, but a full disk can still be found out early
+            if not self.check_disk_space(tmpfilename, data_len - resume_len):
+                data.close()
+                return False
+
         byte_counter = 0 + resume_len
         block_size = self.params.get('buffersize', 1024)
+        resize_buffer = not self.params.get('noresizebuffer', False)
+        ratelimit = self.params.get('ratelimit')
+        bandwidth_scheduler = self.ydl.bandwidth_scheduler
+        bandwidth_stream = BandwidthStream(self.params.get('bandwidth_weight', 1))
+        block_reader = _BlockReader(data)
         start = time.time()
+        speed_meter = SpeedMeter()
+        speed_meter.update(start, byte_counter)
+
+        writer = None
+        if self.params.get('disk_write_buffer') and tmpfilename != '-':
+            writer = _WriterThread(self.params['disk_write_buffer'])
+            # Leave room for at least two blocks in the buffers
+            max_write_block = max(writer.max_size // 2, 1024)
+
+        try:
+            # measure time over whole while-loop, so slow_down() and best_block_size() work together properly
+            now = None  # needed for slow_down() in the first loop run
+            before = start  # start measuring
+            while True:
+
+                # Download and write
+                read_size = block_size if not is_test else min(block_size, data_len - byte_counter)
+                if writer is not None:
+                    read_size = min(read_size, max_write_block)
+                    buf = writer.get_buffer(read_size)
+                    block_len = block_reader.readinto(buf, read_size)
+                else:
+                    data_block = block_reader.read(read_size)
+                    block_len = len(data_block)
+                byte_counter += block_len
+
+                # exit loop when download is finished
+                if block_len == 0:
+                    break
+
+                # Open destination file just in time
+                if stream is None:
+                    try:
+                        (stream, tmpfilename) = sanitize_open(tmpfilename, open_mode)
+                        assert stream is not None
+                        filename = self.undo_temp_name(tmpfilename)
+                        self.report_destination(filename)
+                    except (OSError, IOError) as err:
+                        self.report_error('unable to open for writing: %s' % str(err))
+                        return False
+                    if writer is not None:
+                        writer.start(stream)
+
+                    if self.params.get('xattr_set_filesize', False) and data_len is not None:
+                        try:
+                            import xattr
+                            xattr.setxattr(tmpfilename, 'user.ytdl.filesize', str(data_len))
+                        except (OSError, IOError, ImportError) as err:
+                            self.report_error('unable to set filesize xattr: %s' % str(err))
 
-        # measure time over whole while-loop, so slow_down() and best_block_size() work together properly
-        now = None  # needed for slow_down() in the first loop run
-        before = start  # start measuring
-        while True:
-
-            # Download and write
-            data_block = data.read(block_size if not is_test else min(block_size, data_len - byte_counter))
-            byte_counter += len(data_block)
-
-            # exit loop when download is finished
-            if len(data_block) == 0:
-                break
-
-            # Open destination file just in time
-            if stream is None:
                 try:
-                    (stream, tmpfilename) = sanitize_open(tmpfilename, open_mode)
-                    assert stream is not None
-                    filename = self.undo_temp_name(tmpfilename)
-                    self.report_destination(filename)
-                except (OSError, IOError) as err:
-                    self.report_error('unable to open for writing: %s' % str(err))
+                    if writer is not None:
+                        writer.write(buf, block_len)
+                    else:
+                        stream.write(data_block)
+                except (IOError, OSError) as err:
+                    self.to_stderr('\n')
+                    self.report_error('unable to write data: %s' % str(err))
                     return False
 
-                if self.params.get('xattr_set_filesize', False) and data_len is not None:
-                    try:
-                        import xattr
-                        xattr.setxattr(tmpfilename, 'user.ytdl.filesize', str(data_len))
-                    except(OSError, IOError, ImportError) as err:
-                        self.report_error('unable to set filesize xattr: %s' % str(err))
-
-            try:
-                stream.write(data_block)
-            except (IOError, OSError) as err:
-                self.to_stderr('\n')
-                self.report_error('unable to write data: %s' % str(err))
-                return False
-
-            # Apply rate limit
-            self.slow_down(start, now, byte_counter - resume_len)
-
-            # end measuring of one loop run
-            now = time.time()
-            after = now
-
-            # Adjust block size
-            if not self.params.get('noresizebuffer', False):
-                block_size = self.best_block_size(after - before, len(data_block))
-
-            before = after
-
-            # Progress message
-            speed = self.calc_speed(start, now, byte_counter - resume_len)
-            if data_len is None:
-                eta = None
-            else:
-                eta = self.calc_eta(start, time.time(), data_len - resume_len, byte_counter - resume_len)
-
-            self._hook_progress({
-                'status': 'downloading',
-                'downloaded_bytes': byte_counter,
-                'total_bytes': data_len,
-                'tmpfilename': tmpfilename,
-                'filename': filename,
-                'eta': eta,
-                'speed': speed,
-                'elapsed': now - start,
-            })
-
-            if is_test and byte_counter == data_len:
-                break
+                # Apply rate limit
+                if ratelimit:
+                    self.slow_down(start, now, byte_counter - resume_len)
+                if bandwidth_scheduler.enabled:
+                    bandwidth_scheduler.consume(bandwidth_stream, url, block_len)
+
+                # end measuring of one loop run
+                now = time.time()
+                after = now
+
+                # Adjust block size
+                if resize_buffer:
+                    block_size = self.best_block_size(after - before, block_len)
+
+                before = after
+
+                # Progress message
+                if self._progress_due(now):
+                    speed = speed_meter.update(now, byte_counter)
+                    eta = None if data_len is None else speed_meter.eta(data_len - byte_counter, speed)
+                    self._hook_progress({
+                        'status': 'downloading',
+                        'downloaded_bytes': byte_counter,
+                        'total_bytes': data_len,
+                        'tmpfilename': tmpfilename,
+                        'filename': filename,
+                        'eta': eta,
+                        'speed': speed,
+                        'elapsed': now - start,
+                    })
+
+                if is_test and byte_counter == data_len:
+                    break
+        finally:
+            write_error = writer.close() if writer is not None else None
+        if write_error is not None:
+            self.to_stderr('\n')
+            self.report_error('unable to write data: %s' % str(write_error))
+            return False
 
         if stream is None:
             self.to_stderr('\n')
@@ -249,3 +460,307 @@ class HttpFD(FileDownloader):
         })
 
         return True
+
+    @staticmethod
+    def _ranges_state_filename(tmpfilename):
+        return tmpfilename + '.ranges'
+
+    def _remove_ranges_download(self, tmpfilename):
+        for fn in (tmpfilename, self._ranges_state_filename(tmpfilename)):
+            try:
+                os.remove(encodeFilename(fn))
+            except OSError:
+                pass
+
+    def _load_ranges_state(self, tmpfilename):
+        """ Returns the state of an interrupted segmented download, or None """
+        state_fn = self._ranges_state_filename(tmpfilename)
+        try:
+            with io.open(encodeFilename(state_fn), 'r', encoding='utf-8') as f:
+                state = json.load(f)
+            size = state['size']
+            ranges = [[int(start), int(pos), int(end)] for start, pos, end in state['ranges']]
+        except IOError as ioe:
+            if ioe.errno != errno.ENOENT:
+                self.report_warning('Unable to read %s: %s' % (state_fn, ioe))
+            return None
+        except (KeyError, TypeError, ValueError):
+            self.report_warning('Invalid segmented download state in %s, ignoring it' % state_fn)
+            return None
+        if not os.path.isfile(encodeFilename(tmpfilename)):
+            return None
+        state['ranges'] = ranges
+        state['size'] = size
+        return state
+
+    @classmethod
+    def _new_ranges_state(cls, size, connections, last_modified):
+        """ Splits size bytes in connections ranges of at least _MIN_RANGE_SIZE """
+        count = max(min(connections, size // cls._MIN_RANGE_SIZE), 1)
+        bounds = [size * i // count for i in range(count + 1)]
+        return {
+            'size': size,
+            'last_modified': last_modified,
+            # [first byte, next byte to download, end (excluded)]
+            'ranges': [[start, start, end] for start, end in zip(bounds, bounds[1:])],
+        }
+
+    def _download_ranges(self, filename, tmpfilename, info_dict, headers, state, first_response=None):
+        """
+        Downloads the ranges of state on parallel connections, each into its
+        place in tmpfilename, which is extended (or preallocated) to the size
+        of the file first. The first response, if given, is the whole file
+        and is read for the first range. A connection that finishes its range
+        takes half of the biggest remaining one. The progress is saved to a
+        .ranges file next to tmpfilename, so that the download can be resumed.
+        """
+        url = info_dict['url']
+        size = state['size']
+        ranges = state['ranges']
+        state_fn = self._ranges_state_filename(tmpfilename)
+        connections = self.params.get('http_connections') or 1
+
+        # Written before the file is extended, its size doesn't tell what was
+        # downloaded from then on
+        try:
+            write_json_file(state, state_fn)
+        except (OSError, IOError) as err:
+            self.report_error('unable to write %s: %s' % (state_fn, str(err)))
+            if first_response is not None:
+                first_response.close()
+            return False
+        try:
+            mode = 'r+b' if os.path.isfile(encodeFilename(tmpfilename)) else 'wb'
+            f = open(encodeFilename(tmpfilename), mode)
+        except (OSError, IOError) as err:
+            self.report_error('unable to open for writing: %s' % str(err))
+            return False
+        with f:
+            reserved = self.reserve_disk_space(f, tmpfilename, size)
+        if not reserved:
+            if first_response is not None:
+                first_response.close()
+            if mode == 'wb':
+                self._remove_ranges_download(tmpfilename)
+            return False
+        self.report_destination(filename)
+        if self.params.get('xattr_set_filesize', False):
+            try:
+                import xattr
+                xattr.setxattr(tmpfilename, 'user.ytdl.filesize', str(size))
+            except (OSError, IOError, ImportError) as err:
+                self.report_error('unable to set filesize xattr: %s' % str(err))
+
+        lock = threading.Lock()
+        stop = threading.Event()
+        # Indexes of the ranges that are being downloaded
+        active = set()
+        errors = []
+        resume_len = sum(pos - start for start, pos, end in ranges)
+        progress = {'downloaded': resume_len, 'resumed': resume_len}
+        bandwidth_stream = BandwidthStream(self.params.get('bandwidth_weight', 1))
+        start_time = time.time()
+        speed_meter = SpeedMeter()
+        speed_meter.update(start_time, resume_len)
+
+        def next_range():
+            with lock:
+                for idx, (start, pos, end) in enumerate(ranges):
+                    if idx not in active and pos < end:
+                        active.add(idx)
+                        return idx
+                # Take the second half of the biggest range left
+                candidates = [idx for idx in active if ranges[idx][2] - ranges[idx][1] >= 2 * self._MIN_RANGE_SIZE]
+                if not candidates:
+                    return None
+                victim = max(candidates, key=lambda idx: ranges[idx][2] - ranges[idx][1])
+                pos, end = ranges[victim][1:]
+                middle = pos + (end - pos) // 2
+                ranges[victim][2] = middle
+                ranges.append([middle, middle, end])
+                active.add(len(ranges) - 1)
+                return len(ranges) - 1
+
+        def worker(response):
+            try:
+                with open(encodeFilename(tmpfilename), 'r+b') as stream:
+                    idx = 0 if response is not None else None
+                    while not stop.is_set():
+                        if idx is None:
+                            idx = next_range()
+                            if idx is None:
+                                return
+                        self._download_range(
+                            url, headers, stream, size, ranges, idx, lock, stop,
+                            progress, bandwidth_stream, start_time, response)
+                        response = None
+                        with lock:
+                            active.discard(idx)
+                        idx = None
+            except Exception as err:
+                with lock:
+                    errors.append(err)
+                stop.set()
+            finally:
+                if response is not None:
+                    response.close()
+
+        def save_state():
+            with lock:
+                snapshot = dict(state, ranges=[list(r) for r in ranges])
+            try:
+                write_json_file(snapshot, state_fn)
+            except (OSError, IOError) as err:
+                self.report_warning('Unable to save %s: %s' % (state_fn, err))
+
+        if first_response is not None:
+            active.add(0)
+        threads = []
+        for i in range(connections):
+            thread = threading.Thread(target=worker, args=(first_response if i == 0 else None,))
+            thread.daemon = True
+            threads.append(thread)
+        try:
+            for thread in threads:
+                thread.start()
+            while True:
+                alive = [thread for thread in threads if thread.is_alive()]
+                if not alive:
+                    break
+                alive[0].join(0.5)
+                save_state()
+                now = time.time()
+                downloaded = progress['downloaded']
+                speed = speed_meter.update(now, downloaded)
+                self._hook_progress({
+                    'status': 'downloading',
+                    'downloaded_bytes': downloaded,
+                    'total_bytes': size,
+                    'tmpfilename': tmpfilename,
+                    'filename': filename,
+                    'eta': speed_meter.eta(size - downloaded, speed),
+                    'speed': speed,
+                    'elapsed': now - start_time,
+                })
+        except BaseException:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            save_state()
+            raise
+
+        save_state()
+        if errors:
+            err = errors[0]
+            if isinstance(err, _SizeChangedError):
+                self.report_warning('%s, restarting the download' % err)
+                self._remove_ranges_download(tmpfilename)
+                return self.real_download(filename, info_dict)
+            if isinstance(err, _RangeNotSatisfiedError):
+                self.report_error(str(err))
+                return False
+            raise err
+        if progress['downloaded'] != size:
+            raise ContentTooShortError(progress['downloaded'], size)
+
+        os.remove(encodeFilename(state_fn))
+        self.try_rename(tmpfilename, filename)
+
+        if self.params.get('updatetime', True):
+            info_dict['filetime'] = self.try_utime(filename, state.get('last_modified'))
+
+        self._hook_progress({
+            'downloaded_bytes': size,
+            'total_bytes': size,
+            'filename': filename,
+            'status': 'finished',
+            'elapsed': time.time() - start_time,
+        })
+        return True
+
+    def _give_up(self, err, retries):
+        """ Called when the request still failed with err after retries retries """
+        self.report_error('giving up after %s retries' % retries)
+        return False
+
+    def _download_range(self, url, headers, stream, size, ranges, idx, lock, stop,
+                        progress, bandwidth_stream, start_time, response=None):
+        """
+        Downloads ranges[idx] of the size bytes of the file until its end,
+        which can be lowered meanwhile
+        """
+        retries = self.params.get('retries', 0)
+        retry_policy = self.ydl.retry_policy
+        bandwidth_scheduler = self.ydl.bandwidth_scheduler
+        block_size = self.params.get('buffersize', 1024)
+        resize_buffer = not self.params.get('noresizebuffer', False)
+        ratelimit = self.params.get('ratelimit')
+        count = 0
+        while True:
+            with lock:
+                pos, end = ranges[idx][1:]
+            if pos >= end or stop.is_set():
+                if response is not None:
+                    response.close()
+                return
+            try:
+                if response is None:
+                    request = sanitized_Request(url, None, headers)
+                    request.add_header('Range', 'bytes=%d-%d' % (pos, end - 1))
+                    self.wait_for_host(url)
+                    response = self.ydl.urlopen(request)
+                    content_range_m = re.search(
+                        r'bytes (\d+)-\d+/(\d+|\*)', response.info().get('Content-Range') or '')
+                    if not content_range_m or int(content_range_m.group(1)) != pos:
+                        response.close()
+                        raise _RangeNotSatisfiedError(
+                            'the server did not honor the range request for bytes %d-%d' % (pos, end - 1))
+                    total = content_range_m.group(2)
+                    if total != '*' and int(total) != size:
+                        response.close()
+                        raise _SizeChangedError(
+                            'the size of the file changed from %d to %s bytes' % (size, total))
+                    retry_policy.record_success(url)
+                block_reader = _BlockReader(response)
+                before = time.time()
+                while True:
+                    with lock:
+                        pos, end = ranges[idx][1:]
+                    if pos >= end or stop.is_set():
+                        break
+                    data_block = block_reader.read(min(block_size, end - pos))
+                    if not data_block:
+                        raise compat_http_client.IncompleteRead(b'', end - pos)
+                    stream.seek(pos)
+                    stream.write(data_block)
+                    # The saved state must only count the bytes in the file
+                    stream.flush()
+                    with lock:
+                        # The end may have been lowered by another connection
+                        written = min(len(data_block), ranges[idx][2] - pos)
+                        ranges[idx][1] = pos + written
+                        progress['downloaded'] += written
+                        downloaded = progress['downloaded'] - progress['resumed']
+
+                    if ratelimit:
+                        self.slow_down(start_time, None, downloaded)
+                    if bandwidth_scheduler.enabled:
+                        bandwidth_scheduler.consume(bandwidth_stream, url, len(data_block))
+
+                    after = time.time()
+                    if resize_buffer:
+                        block_size = self.best_block_size(after - before, len(data_block))
+                    before = after
+                response.close()
+                response = None
+            except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error) as err:
+                if response is not None:
+                    response.close()
+                    response = None
+                if not retry_policy.is_retryable(err):
+                    raise
+                count += 1
+                if count > retries:
+                    raise
+                self.report_retry(count, retries)
+                self.sleep_before_retry(url, err, count)
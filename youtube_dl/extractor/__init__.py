@@ -5,15 +5,27 @@ try:
     from .lazy_extractors import _ALL_CLASSES
     _LAZY_LOADER = True
 except ImportError:
-    _LAZY_LOADER = False
-    from .extractors import *
-
-    _ALL_CLASSES = [
-        klass
-        for name, klass in globals().items()
-        if name.endswith('IE') and name != 'GenericIE'
-    ]
-    _ALL_CLASSES.append(GenericIE)
+    from .lazy_registry import load_lazy_registry
+
+    # Without a lazy_extractors module built at install time, use the
+    # registry stored by YoutubeDL if it is still up to date
+    _lazy_registry = load_lazy_registry()
+    if _lazy_registry is not None:
+        _LAZY_LOADER = True
+        globals().update(
+            (name, value) for name, value in _lazy_registry.items()
+            if not name.startswith('_'))
+        _ALL_CLASSES = _lazy_registry['_ALL_CLASSES']
+    else:
+        _LAZY_LOADER = False
+        from .extractors import *
+
+        _ALL_CLASSES = [
+            klass
+            for name, klass in globals().items()
+            if name.endswith('IE') and name != 'GenericIE'
+        ]
+        _ALL_CLASSES.append(GenericIE)
 
 
 def gen_extractor_classes():
@@ -297,6 +297,17 @@ class InfoExtractor(object):
     _real_extract() methods and define a _VALID_URL regexp.
     Probably, they should also be added to the list of extractors.
 
+    Extractors whose embeds are detected by GenericIE should list in
+    _EMBED_NEEDLES lowercase strings, at least one of which every embed they
+    detect contains. GenericIE only runs their embed detection on webpages
+    that contain one of them.
+
+    When the HTTP cache is enabled, the responses to the requests made with
+    _request_webpage are stored according to their Cache-Control and Expires
+    headers. Extractors whose webpages stay the same for a while, but are not
+    sent with such headers, can set _HTTP_CACHE_TTL to the number of seconds
+    for which their responses are fresh.
+
     Finally, the _WORKING attribute should be set to False for broken IEs
     in order to warn the users and skip the tests.
     """
@@ -304,6 +315,8 @@ class InfoExtractor(object):
     _ready = False
     _downloader = None
     _WORKING = True
+    _EMBED_NEEDLES = None
+    _HTTP_CACHE_TTL = None
 
     def __init__(self, downloader=None):
         """Constructor. Receives an optional downloader."""
@@ -382,6 +395,11 @@ class InfoExtractor(object):
                 self.to_screen('%s' % (note,))
             else:
                 self.to_screen('%s: %s' % (video_id, note))
+        if self._downloader.params.get('http_cache') and self._downloader.cache.enabled:
+            # Tell the HTTP cache that the response may be stored
+            headers = dict(headers, **{
+                'Ytdl-http-cache': '' if self._HTTP_CACHE_TTL is None else compat_str(self._HTTP_CACHE_TTL),
+            })
         if isinstance(url_or_request, compat_urllib_request.Request):
             url_or_request = update_Request(
                 url_or_request, data=data, headers=headers, query=query)
@@ -390,20 +408,43 @@ class InfoExtractor(object):
                 url_or_request = update_url_query(url_or_request, query)
             if data is not None or headers:
                 url_or_request = sanitized_Request(url_or_request, data, headers)
-        try:
-            return self._downloader.urlopen(url_or_request)
-        except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error) as err:
-            if errnote is False:
-                return False
-            if errnote is None:
-                errnote = 'Unable to download webpage'
-
-            errmsg = '%s: %s' % (errnote, error_to_compat_str(err))
-            if fatal:
-                raise ExtractorError(errmsg, sys.exc_info()[2], cause=err)
-            else:
-                self._downloader.report_warning(errmsg)
-                return False
+        url = (
+            url_or_request.get_full_url()
+            if isinstance(url_or_request, compat_urllib_request.Request)
+            else url_or_request)
+        retry_policy = self._downloader.retry_policy
+        retries = self._downloader.params.get('extractor_retries', 3)
+        count = 0
+        while True:
+            delay = retry_policy.host_delay(url)
+            if delay > 0:
+                self.to_screen('Too many errors from the server, sleeping %.2f seconds...' % delay)
+                time.sleep(delay)
+            try:
+                urlh = self._downloader.urlopen(url_or_request)
+                retry_policy.record_success(url)
+                return urlh
+            except (compat_urllib_error.URLError, compat_http_client.HTTPException, socket.error) as err:
+                if count < retries and retry_policy.is_retryable(err):
+                    count += 1
+                    retry_policy.record_error(url)
+                    delay = retry_policy.retry_delay(err, count)
+                    self.to_screen(
+                        '%s. Retrying in %.2f seconds (attempt %d of %s)...'
+                        % (error_to_compat_str(err), delay, count, retries))
+                    time.sleep(delay)
+                    continue
+                if errnote is False:
+                    return False
+                if errnote is None:
+                    errnote = 'Unable to download webpage'
+
+                errmsg = '%s: %s' % (errnote, error_to_compat_str(err))
+                if fatal:
+                    raise ExtractorError(errmsg, sys.exc_info()[2], cause=err)
+                else:
+                    self._downloader.report_warning(errmsg)
+                    return False
 
     def _download_webpage_handle(self, url_or_request, video_id, note=None, errnote=None, fatal=True, encoding=None, data=None, headers={}, query={}):
         """ Returns a tuple (page content as string, URL handle) """
@@ -411,6 +452,9 @@ class InfoExtractor(object):
         if isinstance(url_or_request, (compat_str, str)):
             url_or_request = url_or_request.partition('#')[0]
 
+        # The whole body is read, so the request can share the response of an
+        # identical request that is in flight
+        headers = dict(headers, **{'Ytdl-coalesce': '1'})
         urlh = self._request_webpage(url_or_request, video_id, note, errnote, fatal, data=data, headers=headers, query=query)
         if urlh is False:
             assert not fatal
@@ -39,6 +39,7 @@ class DailymotionBaseInfoExtractor(InfoExtractor):
 
 class DailymotionIE(DailymotionBaseInfoExtractor):
     _VALID_URL = r'(?i)(?:https?://)?(?:(www|touch)\.)?dailymotion\.[a-z]{2,3}/(?:(?:embed|swf|#)/)?video/(?P<id>[^/?_]+)'
+    _EMBED_NEEDLES = ('dailymotion.com/',)
     IE_NAME = 'dailymotion'
 
     _FORMATS = [
@@ -396,6 +397,7 @@ class DailymotionUserIE(DailymotionPlaylistIE):
 class DailymotionCloudIE(DailymotionBaseInfoExtractor):
     _VALID_URL_PREFIX = r'http://api\.dmcloud\.net/(?:player/)?embed/'
     _VALID_URL = r'%s[^/]+/(?P<id>[^/?]+)' % _VALID_URL_PREFIX
+    _EMBED_NEEDLES = ('api.dmcloud.net/',)
     _VALID_EMBED_URL = r'%s[^/]+/[^\'"]+' % _VALID_URL_PREFIX
 
     _TESTS = [{
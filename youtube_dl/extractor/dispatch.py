@@ -0,0 +1,412 @@
+from __future__ import unicode_literals
+
+try:
+    from re import _parser as sre_parse, _constants as sre_constants
+except ImportError:  # Python < 3.11
+    import sre_parse
+    import sre_constants
+
+from .common import InfoExtractor
+from ..compat import (
+    compat_chr,
+    compat_str,
+)
+from ..version import __version__
+
+
+# Markers used in the expanded token sequences: a wildcard that never matches
+# '/', one that might and the end of the analysed part of the pattern
+_WILD = 0
+_WILD_SLASH = 1
+_END = 2
+
+# Limits that keep the analysis of huge alternations bounded; patterns that
+# still exceed _MAX_VARIANTS are left to the linear scan
+_MAX_VARIANTS = 512
+# Patterns whose expansion is too large are retried with fewer segments
+_MAX_SEGMENTS = (4, 3)
+_MAX_SMALL_SET = 4
+
+_ATOMIC_GROUP = getattr(sre_constants, 'ATOMIC_GROUP', None)
+_POSSESSIVE_REPEAT = getattr(sre_constants, 'POSSESSIVE_REPEAT', None)
+_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT, _POSSESSIVE_REPEAT)
+_ZERO_WIDTH = (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT)
+
+_SLASH = ord('/')
+_NO_SLASH_CATEGORIES = (
+    sre_constants.CATEGORY_DIGIT, sre_constants.CATEGORY_WORD,
+    sre_constants.CATEGORY_SPACE)
+_SLASH_CATEGORIES = (
+    sre_constants.CATEGORY_NOT_DIGIT, sre_constants.CATEGORY_NOT_WORD,
+    sre_constants.CATEGORY_NOT_SPACE)
+
+
+class _TooComplex(Exception):
+    pass
+
+
+def _literal_token(code):
+    # Keys and URLs are compared lowercased; non-ASCII characters may match
+    # ASCII ones case-insensitively, so they are treated as wildcards
+    if code > 127:
+        return _WILD
+    return compat_chr(code).lower()
+
+
+def _set_may_contain_slash(items):
+    """ Returns True if a character set may match '/', None if unknown """
+    negate = False
+    res = False
+    for op, av in items:
+        if op == sre_constants.NEGATE:
+            negate = True
+        elif op == sre_constants.LITERAL:
+            if av == _SLASH:
+                res = True
+        elif op == sre_constants.RANGE:
+            if av[0] <= _SLASH <= av[1]:
+                res = True
+        elif op == sre_constants.CATEGORY:
+            if av in _SLASH_CATEGORIES:
+                res = True
+            elif av not in _NO_SLASH_CATEGORIES:
+                return None
+        else:
+            return None
+    return not res if negate else res
+
+
+def _small_set(items):
+    """ Returns the characters of a short, non-negated literal set or None """
+    if len(items) > _MAX_SMALL_SET:
+        return None
+    chars = []
+    for op, av in items:
+        if op != sre_constants.LITERAL:
+            return None
+        chars.append(av)
+    return chars
+
+
+def _may_match_slash(op, av):
+    if op == sre_constants.LITERAL:
+        return av == _SLASH
+    if op == sre_constants.NOT_LITERAL:
+        return av != _SLASH
+    if op == sre_constants.IN:
+        return _set_may_contain_slash(av) is not False
+    if op in _ZERO_WIDTH:
+        return False
+    if op == sre_constants.SUBPATTERN:
+        return any(_may_match_slash(o, a) for o, a in av[-1])
+    if op == _ATOMIC_GROUP:
+        return any(_may_match_slash(o, a) for o, a in av)
+    if op == sre_constants.BRANCH:
+        return any(_may_match_slash(o, a) for alt in av[1] for o, a in alt)
+    if op in _REPEATS:
+        return any(_may_match_slash(o, a) for o, a in av[2])
+    return True
+
+
+def _append(prefix, tail, max_segments):
+    """
+    Concatenates two token sequences.
+
+    Past a wildcard that may match '/' the segment positions are unknown and
+    only the literal run up to the next '/' is kept, since it is still known
+    to end some segment. Sequences are closed with _END there, at any other
+    wildcard following it and after max_segments path separators.
+    """
+    if prefix and prefix[-1] == _END:
+        return prefix
+    res = list(prefix)
+    floating = _WILD_SLASH in prefix
+    slashes = prefix.count('/')
+    for tok in tail:
+        if floating and (tok == _WILD or tok == _WILD_SLASH):
+            res.append(_END)
+            break
+        res.append(tok)
+        if tok == _WILD_SLASH:
+            floating = True
+        elif tok == '/':
+            slashes += 1
+            if floating or slashes >= max_segments:
+                res.append(_END)
+                break
+    return tuple(res)
+
+
+def _expand(items, max_segments):
+    """ Expands a parsed regular expression into the token sequences it can
+    start with """
+    variants = set([()])
+    for op, av in items:
+        alternatives = _alternatives(op, av, max_segments)
+        variants = set(
+            _append(v, alt, max_segments) for v in variants for alt in alternatives)
+        if len(variants) > _MAX_VARIANTS:
+            raise _TooComplex()
+        if all(v and v[-1] == _END for v in variants):
+            break
+    return variants
+
+
+def _alternatives(op, av, max_segments):
+    if op == sre_constants.LITERAL:
+        return [(_literal_token(av),)]
+    if op == sre_constants.IN:
+        chars = _small_set(av)
+        if chars is not None:
+            # [yY] is a single token once lowercased
+            return set((_literal_token(c),) for c in chars)
+    if op in _ZERO_WIDTH:
+        return [()]
+    if op == sre_constants.SUBPATTERN:
+        return _expand(av[-1], max_segments)
+    if op == _ATOMIC_GROUP:
+        return _expand(av, max_segments)
+    if op == sre_constants.BRANCH:
+        res = set()
+        for alt in av[1]:
+            res.update(_expand(alt, max_segments))
+        return res
+    if op == sre_constants.GROUPREF_EXISTS:
+        res = set(_expand(av[1], max_segments))
+        res.update(_expand(av[2], max_segments) if av[2] is not None else [()])
+        return res
+    if op in _REPEATS:
+        min_count, max_count, sub = av
+        if min_count == max_count == 1:
+            return _expand(sub, max_segments)
+        if min_count == 0 and max_count == 1:
+            res = set(_expand(sub, max_segments))
+            res.add(())
+            return res
+        return [(_WILD_SLASH if any(_may_match_slash(o, a) for o, a in sub) else _WILD,)]
+    return [(_WILD_SLASH if _may_match_slash(op, av) else _WILD,)]
+
+
+def _variant_keys(tokens):
+    """
+    Returns the keys a URL matching the token sequence is guaranteed to have.
+
+    Keys are (kind, k, text) where k is the index of a '/'-separated segment
+    of the lowercased URL and kind is '=' (the segment equals text),
+    '<' (it starts with text) or '>' (it ends with text). A k of None stands
+    for any segment followed by a '/'.
+    """
+    keys = []
+    segment = []
+    k = 0
+    for tok in tokens + (_END,):
+        if tok not in ('/', _WILD_SLASH, _END):
+            segment.append(tok)
+            continue
+        complete = tok == '/'
+        if k is None:
+            piece = ''.join(segment)
+            if complete and piece:
+                keys.append(('>', None, piece))
+            break
+        head = []
+        for t in segment:
+            if t == _WILD:
+                break
+            head.append(t)
+        head = ''.join(head)
+        if complete and _WILD not in segment:
+            keys.append(('=', k, head))
+        else:
+            if head:
+                keys.append(('<', k, head))
+            if complete:
+                tail = []
+                for t in reversed(segment):
+                    if t == _WILD:
+                        break
+                    tail.append(t)
+                tail = ''.join(reversed(tail))
+                if tail:
+                    keys.append(('>', k, tail))
+        if tok == _END:
+            break
+        segment = []
+        k = None if tok == _WILD_SLASH else k + 1
+    return keys
+
+
+def analyze_valid_url(pattern):
+    """
+    Returns a list with the candidate keys of every variant of the pattern,
+    or None if the pattern cannot be indexed.
+    """
+    try:
+        parsed = sre_parse.parse(pattern)
+    except Exception:
+        return None
+    for max_segments in _MAX_SEGMENTS:
+        try:
+            variants = _expand(parsed, max_segments)
+            break
+        except _TooComplex:
+            continue
+        except Exception:  # too deeply nested or unsupported syntax
+            return None
+    else:
+        return None
+    res = []
+    for v in sorted(variants, key=lambda v: [repr(t) for t in v]):
+        keys = _variant_keys(v)
+        if not keys:
+            return None
+        res.append(keys)
+    return res
+
+
+def _dispatch_pattern(ie):
+    """ Returns the _VALID_URL of ie if it is only matched with the default
+    InfoExtractor.suitable (which lazy extractors share), None otherwise """
+    cls = ie if isinstance(ie, type) else type(ie)
+    for klass in cls.__mro__:
+        if 'suitable' in klass.__dict__:
+            if klass.__dict__['suitable'] is not InfoExtractor.__dict__['suitable']:
+                return None
+            break
+    pattern = getattr(cls, '_VALID_URL', None)
+    if not isinstance(pattern, compat_str):
+        return None
+    return pattern
+
+
+class ExtractorDispatchIndex(object):
+    """
+    Maps lowercased URL segments (host names, literal path prefixes, ...) taken
+    from the _VALID_URL of every extractor to the extractors that may match.
+
+    candidates() returns the extractors whose suitable() has to be checked for
+    a URL, preserving the order in which they were added, so that the first
+    suitable candidate is the same extractor a linear scan would find.
+    Extractors with a custom suitable() or a pattern that cannot be analysed
+    are always candidates.
+    """
+
+    _CACHE_SECTION = 'extractor-index'
+
+    def __init__(self, ies, cache=None):
+        self._ies = []
+        self._fallback = []
+        self._exact = {}
+        self._prefix = {}
+        self._suffix = {}
+        self._prefix_lengths = {}
+        self._suffix_lengths = {}
+        self._key_counts = {}
+        self._keys_by_pattern = {}
+        self._max_segment = -1
+
+        stored = cache.load(self._CACHE_SECTION, __version__) if cache else None
+        if not isinstance(stored, dict):
+            stored = {}
+
+        # Cached entries are keyed by ie_key and only reused if the pattern
+        # is unchanged
+        pending = []
+        for ie in ies:
+            pattern = _dispatch_pattern(ie)
+            if pattern is None or pattern in self._keys_by_pattern:
+                continue
+            ie_key = ie.ie_key()
+            entry = stored.get(ie_key)
+            if isinstance(entry, list) and len(entry) == 2 and entry[0] == pattern:
+                self._keys_by_pattern[pattern] = (
+                    None if entry[1] is None else [tuple(key) for key in entry[1]])
+            else:
+                self._keys_by_pattern[pattern] = None
+                pending.append((ie_key, pattern, analyze_valid_url(pattern)))
+
+        counts = {}
+        for keys in self._keys_by_pattern.values():
+            for key in keys or []:
+                counts[key] = counts.get(key, 0) + 1
+        for _, _, variants in pending:
+            for key in set(key for keys in variants or [] for key in keys):
+                counts[key] = counts.get(key, 0) + 1
+        for ie_key, pattern, variants in pending:
+            keys = self._choose_keys(variants, counts)
+            self._keys_by_pattern[pattern] = keys
+            stored[ie_key] = [
+                pattern, None if keys is None else [list(key) for key in keys]]
+
+        if pending and cache:
+            cache.store(self._CACHE_SECTION, __version__, stored)
+
+        for ie in ies:
+            self.add(ie)
+
+    @staticmethod
+    def _choose_keys(variants, counts):
+        """ Picks the most selective key of every variant """
+        if variants is None:
+            return None
+        res = []
+        for keys in variants:
+            key = min(keys, key=lambda key: (counts.get(key, 0), -len(key[2])))
+            if key not in res:
+                res.append(key)
+        return res
+
+    def add(self, ie):
+        """ Adds an extractor at the end of the dispatch order """
+        pos = len(self._ies)
+        self._ies.append(ie)
+        pattern = _dispatch_pattern(ie)
+        if pattern is None:
+            self._fallback.append(pos)
+            return
+        if pattern not in self._keys_by_pattern:
+            self._keys_by_pattern[pattern] = self._choose_keys(
+                analyze_valid_url(pattern), self._key_counts)
+        keys = self._keys_by_pattern[pattern]
+        if keys is None:
+            self._fallback.append(pos)
+            return
+        for key in keys:
+            kind, k, text = key
+            self._key_counts[key] = self._key_counts.get(key, 0) + 1
+            if k is not None:
+                self._max_segment = max(self._max_segment, k)
+            if kind == '=':
+                table = self._exact
+            elif kind == '<':
+                table = self._prefix
+                self._prefix_lengths.setdefault(k, set()).add(len(text))
+            else:
+                table = self._suffix
+                self._suffix_lengths.setdefault(k, set()).add(len(text))
+            table.setdefault((k, text), []).append(pos)
+
+    def candidates(self, url):
+        """ Returns the extractors that may be suitable for url, in order """
+        try:
+            url.encode('ascii')
+        except (UnicodeEncodeError, UnicodeDecodeError):
+            return list(self._ies)
+
+        positions = list(self._fallback)
+        segments = url.lower().split('/')
+        for k, segment in enumerate(segments):
+            if k < len(segments) - 1:
+                for length in self._suffix_lengths.get(None, ()):
+                    if length <= len(segment):
+                        positions.extend(self._suffix.get((None, segment[-length:]), []))
+            if k > self._max_segment:
+                continue
+            positions.extend(self._exact.get((k, segment), []))
+            for length in self._prefix_lengths.get(k, ()):
+                if length <= len(segment):
+                    positions.extend(self._prefix.get((k, segment[:length]), []))
+            for length in self._suffix_lengths.get(k, ()):
+                if length <= len(segment):
+                    positions.extend(self._suffix.get((k, segment[-length:]), []))
+        return [self._ies[pos] for pos in sorted(set(positions))]
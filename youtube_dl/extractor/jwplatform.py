@@ -112,6 +112,7 @@ class JWPlatformBaseIE(InfoExtractor):
 
 class JWPlatformIE(JWPlatformBaseIE):
     _VALID_URL = r'(?:https?://content\.jwplatform\.com/(?:feeds|players|jw6)/|jwplatform:)(?P<id>[a-zA-Z0-9]{8})'
+    _EMBED_NEEDLES = ('jwplatform',)
     _TEST = {
         'url': 'http://content.jwplatform.com/players/nPripu9l-ALJ3XQCI.js',
         'md5': 'fa8899fa601eb7c83a64e9d568bdf325',
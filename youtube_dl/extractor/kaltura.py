@@ -34,6 +34,7 @@ class KalturaIE(InfoExtractor):
                         )(?:/(?P<path>[^?]+))?(?:\?(?P<query>.*))?
                 )
                 '''
+    _EMBED_NEEDLES = ('kwidget.', 'kaltura.com/')
     _SERVICE_URL = 'http://cdnapi.kaltura.com'
     _SERVICE_BASE = '/api_v3/index.php'
     _TESTS = [
@@ -0,0 +1,38 @@
+# encoding: utf-8
+from __future__ import unicode_literals
+
+from .common import InfoExtractor, SearchInfoExtractor
+
+
+class LazyLoadMetaClass(type):
+    def __getattr__(cls, name):
+        # Anything not copied into the lazy class is looked up on the real
+        # one, e.g. YoutubeIE.extract_id
+        return getattr(cls._get_real_class(), name)
+
+
+class LazyLoadExtractor(LazyLoadMetaClass(str('LazyLoadBase'), (object,), {})):
+    _module = None
+
+    suitable = InfoExtractor.__dict__['suitable']
+
+    @classmethod
+    def ie_key(cls):
+        return cls.__name__[:-2]
+
+    @classmethod
+    def _get_real_class(cls):
+        if '_real_class' not in cls.__dict__:
+            mod = __import__(cls._module, fromlist=(cls.__name__,))
+            cls._real_class = getattr(mod, cls.__name__)
+        return cls._real_class
+
+    def __new__(cls, *args, **kwargs):
+        real_cls = cls._get_real_class()
+        instance = real_cls.__new__(real_cls)
+        instance.__init__(*args, **kwargs)
+        return instance
+
+
+class LazyLoadSearchExtractor(LazyLoadExtractor):
+    suitable = SearchInfoExtractor.__dict__['suitable']
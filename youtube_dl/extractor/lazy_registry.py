@@ -0,0 +1,284 @@
+from __future__ import unicode_literals
+
+import io
+import json
+import os
+import re
+import sys
+from inspect import getsource
+
+from .common import InfoExtractor, SearchInfoExtractor
+from .lazy_load import (
+    LazyLoadExtractor,
+    LazyLoadMetaClass,
+    LazyLoadSearchExtractor,
+)
+from ..cache import get_default_cache_dir
+from ..version import __version__
+
+
+# Where the registry is stored in the cache directory
+REGISTRY_SECTION = 'lazy-extractors'
+REGISTRY_KEY = 'registry'
+
+_registry_stored = False
+
+_LAZY_BASES = {
+    'LazyLoadExtractor': LazyLoadExtractor,
+    'LazyLoadSearchExtractor': LazyLoadSearchExtractor,
+}
+
+# The usual custom suitable(): the URLs of _VALID_URL that other extractors
+# don't match
+_EXCLUDING_SUITABLE_RE = re.compile(r'''(?x)
+    ^return\s+\(?\s*False\s+if\s+
+    (?P<excludes>\w+\.suitable\(url\)(?:\s+or\s+\w+\.suitable\(url\))*)
+    \s+else\s+super\(\s*(?P<owner>\w+)\s*,\s*cls\s*\)\.suitable\(url\)\s*\)?$''')
+
+_HEADER = '''# coding: utf-8
+from __future__ import unicode_literals
+
+import re
+
+from .lazy_load import LazyLoadExtractor, LazyLoadSearchExtractor
+'''
+
+_IE_TEMPLATE = '''
+class {name}({bases}):
+    _VALID_URL = {valid_url!r}
+    _module = '{module}'
+'''
+
+_MAKE_VALID_TEMPLATE = '''
+    @classmethod
+    def _make_valid_url(cls):
+        return {valid_url!r}
+'''
+
+
+def _get_base_name(base):
+    if base is InfoExtractor:
+        return 'LazyLoadExtractor'
+    elif base is SearchInfoExtractor:
+        return 'LazyLoadSearchExtractor'
+    else:
+        return base.__name__
+
+
+def _has_custom_suitable(ie):
+    base = SearchInfoExtractor if issubclass(ie, SearchInfoExtractor) else InfoExtractor
+    return ie.suitable.__func__ is not base.suitable.__func__
+
+
+def _suitable_excludes(ie, names):
+    """
+    Returns the names of the extractors whose URLs the custom suitable() of
+    ie excludes from its _VALID_URL, or None if it does anything else. The
+    excluded extractors must be in names.
+    """
+    owner = next(klass for klass in ie.__mro__ if 'suitable' in klass.__dict__)
+    if owner.__mro__[1].suitable.__func__ is not InfoExtractor.suitable.__func__:
+        return None
+    lines = [line.strip() for line in getsource(ie.suitable).splitlines()]
+    body = ' '.join(lines[[i for i, line in enumerate(lines) if line.startswith('def ')][0] + 1:])
+    m = _EXCLUDING_SUITABLE_RE.match(body)
+    if not m or m.group('owner') != owner.__name__:
+        return None
+    module = sys.modules[owner.__module__]
+    excludes = re.findall(r'(\w+)\.suitable', m.group('excludes'))
+    for name in excludes:
+        klass = getattr(module, name, None)
+        if not isinstance(klass, type) or klass.__name__ != name or name not in names:
+            return None
+    return excludes
+
+
+def _build_lazy_ie(ie, name):
+    valid_url = getattr(ie, '_VALID_URL', None)
+    s = _IE_TEMPLATE.format(
+        name=name,
+        bases=', '.join(map(_get_base_name, ie.__bases__)),
+        valid_url=valid_url,
+        module=ie.__module__)
+    if _has_custom_suitable(ie):
+        s += '\n' + getsource(ie.suitable)
+    if hasattr(ie, '_make_valid_url'):
+        # search extractors
+        s += _MAKE_VALID_TEMPLATE.format(valid_url=ie._make_valid_url())
+    return s
+
+
+def _order_classes(all_classes):
+    """
+    Returns the real classes of all_classes, and all_classes and their base
+    extractors ordered so that the bases come first (GenericIE last)
+    """
+    all_classes = [
+        c._get_real_class() if issubclass(c, LazyLoadExtractor) else c
+        for c in all_classes]
+
+    # find the correct sorting and add the required base classes so that
+    # subclasses can be correctly created
+    classes = all_classes[:-1]
+    ordered_cls = []
+    while classes:
+        for c in classes[:]:
+            bases = set(c.__bases__) - set((object, InfoExtractor, SearchInfoExtractor))
+            stop = False
+            for b in bases:
+                if b not in classes and b not in ordered_cls:
+                    if b.__name__ == 'GenericIE':
+                        raise ValueError('%s cannot be lazy loaded' % c.__name__)
+                    classes.insert(0, b)
+                    stop = True
+            if stop:
+                break
+            if all(b in ordered_cls for b in bases):
+                ordered_cls.append(c)
+                classes.remove(c)
+                break
+    ordered_cls.append(all_classes[-1])
+    return all_classes, ordered_cls
+
+
+def build_lazy_extractors(all_classes):
+    """
+    Returns the source of a module defining a lazy loading class with the
+    same name, _VALID_URL and custom suitable() for each extractor in
+    all_classes (GenericIE last), and an _ALL_CLASSES list in the same order.
+    """
+    all_classes, ordered_cls = _order_classes(all_classes)
+
+    module_contents = [_HEADER]
+    names = []
+    for ie in ordered_cls:
+        name = ie.__name__
+        module_contents.append(_build_lazy_ie(ie, name))
+        if ie in all_classes:
+            names.append(name)
+
+    module_contents.append(
+        '_ALL_CLASSES = [{0}]'.format(', '.join(names)))
+
+    return '\n'.join(module_contents) + '\n'
+
+
+def registry_stamp():
+    """ Changes with the version and whenever an extractor file is modified,
+    added or removed """
+    ext_dir = os.path.dirname(os.path.abspath(__file__))
+    mtimes = [
+        os.path.getmtime(os.path.join(ext_dir, fn))
+        for fn in os.listdir(ext_dir)
+        if fn.endswith('.py') and fn != 'lazy_extractors.py']
+    return '%s %d %.6f' % (__version__, len(mtimes), max(mtimes))
+
+
+def build_lazy_registry(all_classes):
+    """
+    Returns the data load_lazy_registry needs to define the lazy loading
+    classes of all_classes, as a JSON serializable dict.
+
+    Unlike build_lazy_extractors, the source of the custom suitable()
+    methods is not copied. Most of them exclude the URLs of some other
+    extractors from their _VALID_URL: these extractors are listed in
+    suitable_excludes. The others (BBCIE and YoutubeUserIE) have
+    real_suitable set, their real class is imported to call its suitable()
+    once their _VALID_URL matches.
+    """
+    all_classes, ordered_cls = _order_classes(all_classes)
+    names = set(ie.__name__ for ie in ordered_cls)
+    extractors = []
+    for ie in ordered_cls:
+        custom_suitable = _has_custom_suitable(ie)
+        excludes = _suitable_excludes(ie, names) if custom_suitable else None
+        extractors.append({
+            'name': ie.__name__,
+            'bases': list(map(_get_base_name, ie.__bases__)),
+            'module': ie.__module__,
+            'valid_url': getattr(ie, '_VALID_URL', None),
+            'suitable_excludes': excludes,
+            'real_suitable': custom_suitable and excludes is None,
+            'make_valid_url': ie._make_valid_url() if hasattr(ie, '_make_valid_url') else None,
+        })
+    return {
+        'stamp': registry_stamp(),
+        'extractors': extractors,
+        'all_classes': [ie.__name__ for ie in all_classes],
+    }
+
+
+def _matches_valid_url(cls, url):
+    return InfoExtractor.suitable.__func__(cls, url)
+
+
+def _excluding_suitable(excludes, classes):
+    def suitable(cls, url):
+        return _matches_valid_url(cls, url) and not any(
+            classes[name].suitable(url) for name in excludes)
+    return classmethod(suitable)
+
+
+def _real_suitable(cls, url):
+    # Custom suitable() methods only narrow _VALID_URL down
+    return _matches_valid_url(cls, url) and cls._get_real_class().suitable(url)
+
+
+def _make_valid_url_method(valid_url):
+    return classmethod(lambda cls: valid_url)
+
+
+def _registry_filename():
+    return os.path.join(
+        get_default_cache_dir(), REGISTRY_SECTION, REGISTRY_KEY + '.json')
+
+
+def load_lazy_registry():
+    """
+    Returns a dict with the lazy loading classes defined by the registry
+    that YoutubeDL stored in the default cache directory, and their
+    _ALL_CLASSES list, or None if there is none or it is out of date.
+    Only data is read from the registry, it is never executed.
+    """
+    try:
+        with io.open(_registry_filename(), 'r', encoding='utf-8') as f:
+            registry = json.load(f)
+        if registry.get('stamp') != registry_stamp():
+            return None
+        classes = dict(_LAZY_BASES)
+        for ie in registry['extractors']:
+            attrs = {
+                '__module__': __name__,
+                '_VALID_URL': ie['valid_url'],
+                '_module': ie['module'],
+            }
+            if ie['suitable_excludes'] is not None:
+                attrs['suitable'] = _excluding_suitable(ie['suitable_excludes'], classes)
+            elif ie['real_suitable']:
+                attrs['suitable'] = classmethod(_real_suitable)
+            if ie['make_valid_url'] is not None:
+                attrs['_make_valid_url'] = _make_valid_url_method(ie['make_valid_url'])
+            classes[ie['name']] = LazyLoadMetaClass(
+                str(ie['name']), tuple(classes[b] for b in ie['bases']), attrs)
+        lazy_classes = dict(
+            (name, cls) for name, cls in classes.items() if name not in _LAZY_BASES)
+        lazy_classes['_ALL_CLASSES'] = [classes[name] for name in registry['all_classes']]
+        return lazy_classes
+    except Exception:
+        return None
+
+
+def store_lazy_registry(cache, all_classes):
+    """
+    Stores the registry of all_classes with cache, once per process, so that
+    later runs do not need to import every extractor.
+    """
+    global _registry_stored
+    if _registry_stored:
+        return
+    _registry_stored = True
+    try:
+        registry = build_lazy_registry(all_classes)
+    except ValueError:
+        return
+    cache.store(REGISTRY_SECTION, REGISTRY_KEY, registry)
@@ -9,6 +9,7 @@ from ..utils import int_or_none
 
 class LiveLeakIE(InfoExtractor):
     _VALID_URL = r'https?://(?:\w+\.)?liveleak\.com/view\?(?:.*?)i=(?P<id>[\w_]+)(?:.*)'
+    _EMBED_NEEDLES = ('liveleak.com/ll_embed?',)
     _TESTS = [{
         'url': 'http://www.liveleak.com/view?i=757_1364311680',
         'md5': '50f79e05ba149149c1b4ea961223d5b3',
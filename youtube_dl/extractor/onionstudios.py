@@ -14,6 +14,7 @@ from ..utils import (
 
 class OnionStudiosIE(InfoExtractor):
     _VALID_URL = r'https?://(?:www\.)?onionstudios\.com/(?:videos/[^/]+-|embed\?.*\bid=)(?P<id>\d+)(?!-)'
+    _EMBED_NEEDLES = ('onionstudios.com/embed',)
 
     _TESTS = [{
         'url': 'http://www.onionstudios.com/videos/hannibal-charges-forward-stops-for-a-cocktail-2937',
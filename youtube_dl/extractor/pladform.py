@@ -25,6 +25,7 @@ class PladformIE(InfoExtractor):
                         )
                         (?P<id>\d+)
                     '''
+    _EMBED_NEEDLES = ('out.pladform.ru/player?',)
     _TESTS = [{
         # http://muz-tv.ru/kinozal/view/7400/
         'url': 'http://out.pladform.ru/player?pl=24822&videoid=100183293',
@@ -34,6 +34,7 @@ class PornHubIE(InfoExtractor):
                         )
                         (?P<id>[0-9a-z]+)
                     '''
+    _EMBED_NEEDLES = ('pornhub.com/embed/',)
     _TESTS = [{
         'url': 'http://www.pornhub.com/view_video.php?viewkey=648719015',
         'md5': '1e19b41231a02eba417839222ac9d58e',
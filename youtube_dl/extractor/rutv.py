@@ -18,6 +18,7 @@ class RUTVIE(InfoExtractor):
             |iframe/(?P<type>swf|video|live)/id/
             |index/iframe/cast_id/)
             (?P<id>\d+)'''
+    _EMBED_NEEDLES = ('player.rutv.ru/', 'player.vgtrk.com/')
 
     _TESTS = [
         {
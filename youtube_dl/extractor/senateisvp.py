@@ -49,6 +49,7 @@ class SenateISVPIE(InfoExtractor):
     ]
     _IE_NAME = 'senate.gov'
     _VALID_URL = r'https?://www\.senate\.gov/isvp/?\?(?P<qs>.+)'
+    _EMBED_NEEDLES = ('senate.gov/isvp',)
     _TESTS = [{
         'url': 'http://www.senate.gov/isvp/?comm=judiciary&type=live&stt=&filename=judiciary031715&auto_play=false&wmode=transparent&poster=http%3A%2F%2Fwww.judiciary.senate.gov%2Fthemes%2Fjudiciary%2Fimages%2Fvideo-poster-flash-fit.png',
         'info_dict': {
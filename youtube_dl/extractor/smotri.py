@@ -21,6 +21,7 @@ class SmotriIE(InfoExtractor):
     IE_DESC = 'Smotri.com'
     IE_NAME = 'smotri'
     _VALID_URL = r'https?://(?:www\.)?(?:smotri\.com/video/view/\?id=|pics\.smotri\.com/(?:player|scrubber_custom8)\.swf\?file=)(?P<id>v(?P<realvideoid>[0-9]+)[a-z0-9]{4})'
+    _EMBED_NEEDLES = ('smotri.com/',)
     _NETRC_MACHINE = 'smotri'
 
     _TESTS = [
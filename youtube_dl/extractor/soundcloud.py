@@ -40,6 +40,7 @@ class SoundcloudIE(InfoExtractor):
                        |(?P<player>(?:w|player|p.)\.soundcloud\.com/player/?.*?url=.*)
                     )
                     '''
+    _EMBED_NEEDLES = ('soundcloud.com/player',)
     IE_NAME = 'soundcloud'
     _TESTS = [
         {
@@ -67,6 +67,7 @@ class SportBoxIE(InfoExtractor):
 
 class SportBoxEmbedIE(InfoExtractor):
     _VALID_URL = r'https?://news\.sportbox\.ru/vdl/player(?:/[^/]+/|\?.*?\bn?id=)(?P<id>\d+)'
+    _EMBED_NEEDLES = ('news.sportbox.ru/vdl/player',)
     _TESTS = [{
         'url': 'http://news.sportbox.ru/vdl/player/ci/211355',
         'info_dict': {
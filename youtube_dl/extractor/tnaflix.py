@@ -158,6 +158,7 @@ class TNAFlixNetworkBaseIE(InfoExtractor):
 
 class TNAFlixNetworkEmbedIE(TNAFlixNetworkBaseIE):
     _VALID_URL = r'https?://player\.(?:tna|emp)flix\.com/video/(?P<id>\d+)'
+    _EMBED_NEEDLES = ('flix.com/video/',)
 
     _TITLE_REGEX = r'<title>([^<]+)</title>'
 
@@ -14,6 +14,7 @@ from ..utils import (
 
 class VesselIE(InfoExtractor):
     _VALID_URL = r'https?://(?:www\.)?vessel\.com/(?:videos|embed)/(?P<id>[0-9a-zA-Z]+)'
+    _EMBED_NEEDLES = ('vessel.com/embed/',)
     _API_URL_TEMPLATE = 'https://www.vessel.com/api/view/items/%s'
     _LOGIN_URL = 'https://www.vessel.com/api/account/login'
     _NETRC_MACHINE = 'vessel'
@@ -19,6 +19,7 @@ class ViewLiftBaseIE(InfoExtractor):
 
 class ViewLiftEmbedIE(ViewLiftBaseIE):
     _VALID_URL = r'https?://(?:(?:www|embed)\.)?(?:%s)/embed/player\?.*\bfilmId=(?P<id>[\da-f-]{36})' % ViewLiftBaseIE._DOMAINS_REGEX
+    _EMBED_NEEDLES = ('/embed/player',)
     _TESTS = [{
         'url': 'http://embed.snagfilms.com/embed/player?filmId=74849a00-85a9-11e1-9660-123139220831&w=500',
         'md5': '2924e9215c6eff7a55ed35b72276bd93',
@@ -179,6 +179,7 @@ class VimeoIE(VimeoBaseInfoExtractor):
                         (?:/[\da-f]+)?
                         /?(?:[?&].*)?(?:[#].*)?$
                     '''
+    _EMBED_NEEDLES = ('vimeo.com/',)
     IE_NAME = 'vimeo'
     _TESTS = [
         {
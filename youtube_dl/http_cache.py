@@ -0,0 +1,369 @@
+from __future__ import unicode_literals
+
+import errno
+import hashlib
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+
+from .compat import compat_urllib_request
+from .utils import (
+    make_http_headers,
+    timeconvert,
+    write_json_file,
+    YoutubeDLHandler,
+)
+
+
+# Headers that only apply to the connection or the client that received them
+_UNCACHED_HEADERS = (
+    'connection', 'keep-alive', 'transfer-encoding', 'set-cookie', 'set-cookie2')
+
+# Request headers that always change the response
+_KEY_HEADERS = ('Cookie', 'Authorization')
+
+
+def _parse_cache_control(value):
+    directives = {}
+    for directive in value.split(','):
+        name, _, arg = directive.strip().partition('=')
+        if name:
+            directives[name.lower()] = arg.strip().strip('"')
+    return directives
+
+
+def _vary_names(headers):
+    return [
+        name.strip().lower() for name in (headers.get('Vary') or '').split(',')
+        if name.strip()]
+
+
+def _request_header(req, name):
+    # urllib stores the header names capitalized
+    return req.get_header(name.capitalize())
+
+
+def _expiry_time(headers, ttl, now):
+    """
+    Returns the time until which a response with these headers is fresh, or
+    None if it must not be stored. ttl (in seconds) overrides the headers.
+    """
+    cache_control = _parse_cache_control(headers.get('Cache-Control') or '')
+    if 'no-store' in cache_control or (headers.get('Vary') or '').strip() == '*':
+        return None
+    if ttl is not None:
+        return now + ttl
+    if 'no-cache' in cache_control:
+        return now
+    try:
+        age = max(int(headers.get('Age') or 0), 0)
+    except ValueError:
+        age = 0
+    try:
+        lifetime = int(cache_control['max-age'])
+    except (KeyError, ValueError):
+        expires = timeconvert(headers.get('Expires') or '')
+        if expires is None:
+            return now
+        lifetime = expires - (timeconvert(headers.get('Date') or '') or now)
+    return now + lifetime - age
+
+
+class HTTPCache(object):
+    """
+    Stores HTTP responses in a directory, each in a .body and a .json file.
+
+    The total size of the bodies is capped at max_size bytes, the least
+    recently used responses are removed first.
+    """
+
+    def __init__(self, cache_dir, max_size):
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        # key -> (size, last use)
+        self._index = None
+        self._last_use = 0
+
+    def _use_time(self):
+        # Strictly increasing, so that the uses are ordered even with a coarse clock
+        self._last_use = max(time.time(), self._last_use + 1e-6)
+        return self._last_use
+
+    @staticmethod
+    def _key(key):
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    def _fn(self, key, dtype):
+        return os.path.join(self.cache_dir, '%s.%s' % (key, dtype))
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = {}
+            try:
+                fns = os.listdir(self.cache_dir)
+            except OSError:
+                fns = []
+            for fn in fns:
+                key, _, dtype = fn.partition('.')
+                if dtype != 'body':
+                    continue
+                try:
+                    st = os.stat(self._fn(key, 'body'))
+                except OSError:
+                    continue
+                self._index[key] = (st.st_size, st.st_mtime)
+        return self._index
+
+    def _remove(self, key):
+        self._get_index().pop(key, None)
+        for dtype in ('json', 'body'):
+            try:
+                os.remove(self._fn(key, dtype))
+            except OSError:
+                pass
+
+    def get(self, cache_key):
+        """ Returns the metadata and the body filename stored as cache_key, or None """
+        key = self._key(cache_key)
+        with self._lock:
+            if key not in self._get_index():
+                return None
+            try:
+                with io.open(self._fn(key, 'json'), 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                # The modification time of the body records its last use
+                os.utime(self._fn(key, 'body'), None)
+            except (IOError, OSError, ValueError):
+                self._remove(key)
+                return None
+            self._index[key] = (self._index[key][0], self._use_time())
+        return meta, self._fn(key, 'body')
+
+    def update(self, cache_key, meta):
+        key = self._key(cache_key)
+        with self._lock:
+            if key in self._get_index():
+                write_json_file(meta, self._fn(key, 'json'))
+
+    def new_body_file(self):
+        """ Returns a temporary file in which a body can be written """
+        try:
+            os.makedirs(self.cache_dir)
+        except OSError as ose:
+            if ose.errno != errno.EEXIST:
+                raise
+        fd, tmp_fn = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        return os.fdopen(fd, 'wb'), tmp_fn
+
+    def put(self, cache_key, meta, body_fn):
+        """ Stores the body written to body_fn, which is moved, as cache_key """
+        key = self._key(cache_key)
+        size = os.path.getsize(body_fn)
+        with self._lock:
+            self._remove(key)
+            if size > self.max_size:
+                os.remove(body_fn)
+                return
+            try:
+                os.rename(body_fn, self._fn(key, 'body'))
+                write_json_file(meta, self._fn(key, 'json'))
+            except (IOError, OSError):
+                self._remove(key)
+                return
+            index = self._get_index()
+            index[key] = (size, self._use_time())
+            total = sum(s for s, _ in index.values())
+            for old_key in sorted(index, key=lambda k: index[k][1]):
+                if total <= self.max_size:
+                    break
+                total -= index[old_key][0]
+                self._remove(old_key)
+
+
+class _CachingReader(io.RawIOBase):
+    """ Copies a response to a file as it is read, and stores it at the end """
+
+    def __init__(self, fp, cache, cache_key, meta):
+        self._fp = fp
+        self._cache = cache
+        self._cache_key = cache_key
+        self._meta = meta
+        self._body_file, self._body_fn = cache.new_body_file()
+        self._size = 0
+
+    def readable(self):
+        return True
+
+    def _discard(self):
+        if self._body_file is not None:
+            self._body_file.close()
+            self._body_file = None
+            os.remove(self._body_fn)
+
+    def readinto(self, b):
+        data = self._fp.read(len(b))
+        n = len(data)
+        b[:n] = data
+        if self._body_file is None:
+            return n
+        if n == 0:
+            self._body_file.close()
+            self._body_file = None
+            self._cache.put(self._cache_key, self._meta, self._body_fn)
+        else:
+            self._size += n
+            if self._size > self._cache.max_size:
+                self._discard()
+            else:
+                self._body_file.write(data)
+        return n
+
+    def close(self):
+        if not self.closed:
+            # The body wasn't completely read
+            self._discard()
+            self._fp.close()
+        io.RawIOBase.close(self)
+
+
+class HTTPCacheHandler(compat_urllib_request.BaseHandler):
+    """
+    Answers the GET requests that have a "Ytdl-http-cache" header from an
+    HTTPCache. Its value is a number of seconds for which the response is
+    fresh, or empty to follow the Cache-Control and Expires headers. Stale
+    responses are revalidated with their ETag and Last-Modified headers.
+
+    The responses are stored by URL and by the cookies and credentials of
+    the request, and only answer the requests with the same values of the
+    headers named in their Vary header. Responses that set cookies aren't
+    stored.
+    """
+
+    # Before YoutubeDLHandler, so that the responses are stored undecoded
+    handler_order = 400
+
+    def __init__(self, cache):
+        self._cache = cache
+
+    def http_request(self, req):
+        marker = req.headers.get('Ytdl-http-cache')
+        if marker is None:
+            return req
+        del req.headers['Ytdl-http-cache']
+        if req.get_method() == 'GET' and not req.has_header('Range'):
+            req._http_cache_ttl = float(marker) if marker else None
+        return req
+
+    @staticmethod
+    def _cache_key(req):
+        # The cookies are only added to the request once it is processed,
+        # the key is computed when it is opened
+        return '\n'.join(
+            [req.get_method(), req.get_full_url()] +
+            [_request_header(req, name) or '' for name in _KEY_HEADERS])
+
+    @staticmethod
+    def _cached_response(meta, body_fn, extra_headers=[]):
+        try:
+            body = open(body_fn, 'rb')
+        except (IOError, OSError):
+            return None
+        resp = YoutubeDLHandler.addinfourl_wrapper(
+            body, make_http_headers(meta['headers'] + extra_headers), meta['url'], meta['code'])
+        resp.msg = meta['msg']
+        resp._http_cache_hit = True
+        return resp
+
+    def http_open(self, req):
+        if not hasattr(req, '_http_cache_ttl'):
+            return None
+        req._http_cache_key = self._cache_key(req)
+        entry = self._cache.get(req._http_cache_key)
+        if entry is None:
+            return None
+        meta, body_fn = entry
+        for name, value in (meta.get('vary') or {}).items():
+            if _request_header(req, name) != value:
+                # Stored for other values of the request headers
+                return None
+        if meta['expires'] > time.time():
+            return self._cached_response(meta, body_fn)
+        # Stale, ask the server if it changed
+        if meta.get('etag'):
+            req.add_unredirected_header('If-None-Match', meta['etag'])
+        if meta.get('last_modified'):
+            req.add_unredirected_header('If-Modified-Since', meta['last_modified'])
+        return None
+
+    def http_response(self, req, resp):
+        if (not hasattr(req, '_http_cache_key') or
+                getattr(resp, '_http_cache_hit', False)):
+            return resp
+        url = req.get_full_url()
+        cache_key = req._http_cache_key
+        ttl = req._http_cache_ttl
+        now = time.time()
+
+        if resp.code == 304:
+            entry = self._cache.get(cache_key)
+            if entry is None:
+                return resp
+            meta, body_fn = entry
+            new_headers = [
+                (k, v) for k, v in resp.headers.items()
+                if k.lower() not in _UNCACHED_HEADERS]
+            # Not stored, but passed on to the cookie processor
+            cookie_headers = [
+                (k, v) for k, v in resp.headers.items()
+                if k.lower() in ('set-cookie', 'set-cookie2')]
+            new_names = set(k.lower() for k, _ in new_headers)
+            headers = [
+                (k, v) for k, v in meta['headers']
+                if k.lower() not in new_names] + new_headers
+            expires = _expiry_time(make_http_headers(headers), ttl, now)
+            if expires is None:
+                return resp
+            meta.update({'headers': headers, 'expires': expires})
+            self._cache.update(cache_key, meta)
+            cached_resp = self._cached_response(meta, body_fn, cookie_headers)
+            if cached_resp is None:
+                return resp
+            resp.close()
+            return cached_resp
+
+        if resp.code != 200 or resp.headers.get('Set-Cookie') or resp.headers.get('Set-Cookie2'):
+            return resp
+        expires = _expiry_time(resp.headers, ttl, now)
+        etag = resp.headers.get('ETag')
+        last_modified = resp.headers.get('Last-Modified')
+        if expires is None or (expires <= now and not etag and not last_modified):
+            return resp
+        meta = {
+            'url': url,
+            'code': resp.code,
+            'msg': resp.msg,
+            'headers': [
+                (k, v) for k, v in resp.headers.items()
+                if k.lower() not in _UNCACHED_HEADERS],
+            'expires': expires,
+            'etag': etag,
+            'last_modified': last_modified,
+            'vary': dict(
+                (name, _request_header(req, name)) for name in _vary_names(resp.headers)),
+        }
+        try:
+            reader = _CachingReader(resp, self._cache, cache_key, meta)
+        except (IOError, OSError):
+            return resp
+        new_resp = YoutubeDLHandler.addinfourl_wrapper(
+            io.BufferedReader(reader), resp.headers, url, resp.code)
+        new_resp.msg = resp.msg
+        return new_resp
+
+    https_request = http_request
+    https_open = http_open
+    https_response = http_response
@@ -224,6 +224,16 @@ def parseOpts(overrideArguments=None):
         action='store_const', const='::', dest='source_address',
         help='Make all connections via IPv6 (experimental)',
     )
+    network.add_option(
+        '--dns-cache-ttl',
+        metavar='SECONDS', dest='dns_cache_ttl', default=None, type=float,
+        help='Number of seconds for which the resolved addresses of a host are reused, 0 to resolve it for every connection (default is 60)',
+    )
+    network.add_option(
+        '--happy-eyeballs',
+        action='store_true', dest='happy_eyeballs', default=False,
+        help='When a host has several addresses, connect to the next one (alternating IPv6 and IPv4) if the previous connection isn\'t established after 250 ms, and use the first that succeeds (experimental)',
+    )
     network.add_option(
         '--geo-verification-proxy',
         dest='geo_verification_proxy', default=None, metavar='URL',
@@ -324,6 +334,10 @@ def parseOpts(overrideArguments=None):
         '--download-archive', metavar='FILE',
         dest='download_archive',
         help='Download only videos not listed in the archive file. Record the IDs of all downloaded videos in it.')
+    selection.add_option(
+        '--stop-after-archived', metavar='N',
+        dest='stop_after_archived', default=None, type=int,
+        help='Stop downloading a playlist after N consecutive videos that are already in the download archive')
     selection.add_option(
         '--include-ads',
         dest='include_ads', action='store_true',
@@ -416,6 +430,14 @@ def parseOpts(overrideArguments=None):
         '-r', '--limit-rate', '--rate-limit',
         dest='ratelimit', metavar='RATE',
         help='Maximum download rate in bytes per second (e.g. 50K or 4.2M)')
+    downloader.add_option(
+        '--total-limit-rate',
+        dest='total_ratelimit', metavar='RATE',
+        help='Maximum download rate in bytes per second of all the downloads together (e.g. 50K or 4.2M), shared fairly between them')
+    downloader.add_option(
+        '--host-limit-rate',
+        dest='host_ratelimit', metavar='RATE',
+        help='Maximum download rate in bytes per second from each host (e.g. 50K or 4.2M)')
     downloader.add_option(
         '-R', '--retries',
         dest='retries', metavar='RETRIES', default=10,
@@ -423,11 +445,34 @@ def parseOpts(overrideArguments=None):
     downloader.add_option(
         '--fragment-retries',
         dest='fragment_retries', metavar='RETRIES', default=10,
-        help='Number of retries for a fragment (default is %default), or "infinite" (DASH only)')
+        help='Number of retries for a fragment (default is %default), or "infinite" (DASH, hlsnative and f4m)')
+    downloader.add_option(
+        '--extractor-retries',
+        dest='extractor_retries', metavar='RETRIES', default=3,
+        help='Number of retries for the webpages and API requests of the extractors (default is %default), or "infinite"')
+    downloader.add_option(
+        '--retry-backoff',
+        dest='retry_backoff', metavar='SECONDS', default=1.0, type=float,
+        help='Number of seconds to wait before the first retry, doubled for each next attempt up to 60 seconds. '
+             'Some jitter is added, and the Retry-After header of the server is followed (default is %default)')
+    downloader.add_option(
+        '--circuit-breaker',
+        dest='circuit_breaker', metavar='ERRORS', default=5, type=int,
+        help='After this many consecutive errors from a host, wait 30 seconds before sending it more requests, 0 to disable (default is %default)')
+    downloader.add_option(
+        '--http-connections',
+        dest='http_connections', metavar='N', default=1, type=int,
+        help='Number of connections on which to download a file over HTTP, in parallel ranges, '
+             'when the server supports it (default is %default)')
     downloader.add_option(
         '--buffer-size',
         dest='buffersize', metavar='SIZE', default='1024',
         help='Size of download buffer (e.g. 1024 or 16K) (default is %default)')
+    downloader.add_option(
+        '--disk-write-buffer',
+        dest='disk_write_buffer', metavar='SIZE',
+        help='Write to disk from a separate thread, holding up to SIZE bytes (e.g. 16M) of downloaded data, '
+             'so that a slow disk doesn\'t stall the download')
     downloader.add_option(
         '--no-resize-buffer',
         action='store_true', dest='noresizebuffer', default=False,
@@ -440,6 +485,35 @@ def parseOpts(overrideArguments=None):
         '--playlist-reverse',
         action='store_true',
         help='Download playlist videos in reverse order')
+    downloader.add_option(
+        '--lazy-playlist',
+        action='store_true', dest='lazy_playlist', default=False,
+        help='Process the videos of a playlist as they are received, without fetching the whole playlist first. '
+             'The playlist index of the output template is not padded, '
+             'videos selected with --playlist-items are downloaded in playlist order '
+             'and --playlist-reverse can not be used')
+    downloader.add_option(
+        '--concurrent-entries',
+        dest='concurrent_entries', metavar='N', default=1, type=int,
+        help='Number of playlist videos to extract and download at the same time (default is %default)')
+    downloader.add_option(
+        '--pipeline',
+        dest='pipeline', metavar='EXTRACT,DOWNLOAD,POSTPROCESS',
+        help='Extract, download and postprocess videos at the same time, '
+             'with the given number of workers for each stage (e.g. 2,2,1)')
+    downloader.add_option(
+        '--jobs',
+        dest='jobs', metavar='N', default=1, type=int,
+        help='Number of URLs to process at the same time (default is %default)')
+    downloader.add_option(
+        '--max-jobs-per-host',
+        dest='jobs_per_host', metavar='N', type=int,
+        help='Maximum number of URLs of the same host to process at the same time')
+    downloader.add_option(
+        '--preallocate',
+        action='store_true', dest='preallocate', default=False,
+        help='Allocate the disk space of the files before downloading them when their size is known or can be estimated, '
+             'and stop early if the disk is full')
     downloader.add_option(
         '--xattr-set-filesize',
         dest='xattr_set_filesize', action='store_true',
@@ -501,7 +575,7 @@ def parseOpts(overrideArguments=None):
     workarounds.add_option(
         '--sleep-interval', metavar='SECONDS',
         dest='sleep_interval', type=float,
-        help='Number of seconds to sleep before each download.')
+        help='Minimum number of seconds between the start of two downloads from the same host.')
 
     verbosity = optparse.OptionGroup(parser, 'Verbosity / Simulation Options')
     verbosity.add_option(
@@ -565,6 +639,10 @@ def parseOpts(overrideArguments=None):
         action='store_true', dest='print_json', default=False,
         help='Be quiet and print the video information as JSON (video is still being downloaded).',
     )
+    verbosity.add_option(
+        '--progress-rate',
+        dest='progress_rate', metavar='N', default=10, type=float,
+        help='Maximum number of progress updates per second (default is %default), 0 to show them all')
     verbosity.add_option(
         '--newline',
         action='store_true', dest='progress_with_newline', default=False,
@@ -589,6 +667,22 @@ def parseOpts(overrideArguments=None):
         '--write-pages',
         action='store_true', dest='write_pages', default=False,
         help='Write downloaded intermediary pages to files in the current directory to debug problems')
+    verbosity.add_option(
+        '--record-http',
+        metavar='DIR', dest='record_http', default=None,
+        help='Record the HTTP responses to the directory DIR, to replay them with --replay-http')
+    verbosity.add_option(
+        '--replay-http',
+        metavar='DIR', dest='replay_http', default=None,
+        help='Answer the HTTP requests with the responses recorded in the directory DIR, without using the network')
+    verbosity.add_option(
+        '--replay-latency',
+        metavar='SECONDS', dest='replay_latency', default=None, type=float,
+        help='Delay each replayed response by SECONDS')
+    verbosity.add_option(
+        '--replay-rate',
+        metavar='RATE', dest='replay_rate', default=None,
+        help='Read the bodies of the replayed responses at RATE bytes per second (e.g. 50K or 4.2M)')
     verbosity.add_option(
         '--youtube-print-sig-code',
         action='store_true', dest='youtube_print_sig_code', default=False,
@@ -703,6 +797,15 @@ def parseOpts(overrideArguments=None):
         '--rm-cache-dir',
         action='store_true', dest='rm_cachedir',
         help='Delete all filesystem cache files')
+    filesystem.add_option(
+        '--http-cache',
+        action='store_true', dest='http_cache', default=False,
+        help='Store the webpages and API responses that extractors download in the cache directory, '
+             'and reuse them while they are fresh according to their Cache-Control and Expires headers (experimental)')
+    filesystem.add_option(
+        '--http-cache-size', metavar='SIZE',
+        dest='http_cache_size', default=None,
+        help='Maximum size of the HTTP cache (e.g. 50M or 1G, default is 100M)')
 
     thumbnail = optparse.OptionGroup(parser, 'Thumbnail images')
     thumbnail.add_option(
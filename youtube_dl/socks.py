@@ -13,6 +13,7 @@ import collections
 import socket
 
 from .compat import (
+    compat_memoryview,
     compat_ord,
     compat_struct_pack,
     compat_struct_unpack,
@@ -118,13 +119,24 @@ class sockssocket(socket.socket):
         self._proxy = Proxy(proxytype, addr, port, username, password, rdns)
 
     def recvall(self, cnt):
-        data = b''
-        while len(data) < cnt:
-            cur = self.recv(cnt - len(data))
-            if not cur:
-                raise IOError('{0} bytes missing'.format(cnt - len(data)))
-            data += cur
-        return data
+        if compat_memoryview is None:
+            data = b''
+            while len(data) < cnt:
+                cur = self.recv(cnt - len(data))
+                if not cur:
+                    raise IOError('{0} bytes missing'.format(cnt - len(data)))
+                data += cur
+            return data
+
+        data = bytearray(cnt)
+        view = compat_memoryview(data)
+        received = 0
+        while received < cnt:
+            n = self.recv_into(view[received:], cnt - received)
+            if not n:
+                raise IOError('{0} bytes missing'.format(cnt - received))
+            received += n
+        return bytes(data)
 
     def _recv_bytes(self, cnt):
         data = self.recvall(cnt)
@@ -241,7 +253,7 @@ class sockssocket(socket.socket):
         if atype == Socks5AddressType.ATYP_IPV4:
             destaddr = self.recvall(4)
         elif atype == Socks5AddressType.ATYP_DOMAINNAME:
-            alen = compat_ord(self.recv(1))
+            alen = compat_ord(self.recvall(1))
             destaddr = self.recvall(alen)
         elif atype == Socks5AddressType.ATYP_IPV6:
             destaddr = self.recvall(16)
@@ -7,13 +7,14 @@ import base64
 import binascii
 import calendar
 import codecs
+import collections
 import contextlib
 import ctypes
 import datetime
 import email.utils
 import errno
 import functools
-import gzip
+import heapq
 import io
 import itertools
 import json
@@ -23,13 +24,19 @@ import operator
 import os
 import pipes
 import platform
+import random
 import re
+import select
+import shutil
 import socket
 import ssl
 import subprocess
 import sys
 import tempfile
+import threading
+import time
 import traceback
+import weakref
 import xml.etree.ElementTree
 import zlib
 
@@ -422,6 +429,41 @@ def sanitize_open(filename, open_mode):
             return (stream, alt_filename)
 
 
+def free_disk_space(filename):
+    """ Returns the number of bytes free for the user on the disk of filename, or None """
+    dirname = os.path.dirname(os.path.abspath(filename))
+    try:
+        if hasattr(shutil, 'disk_usage'):
+            return shutil.disk_usage(encodeFilename(dirname)).free
+        st = os.statvfs(encodeFilename(dirname))
+        return st.f_bavail * st.f_frsize
+    except (AttributeError, OSError):
+        return None
+
+
+def preallocate_file(stream, size):
+    """
+    Extends the file of stream to size bytes, allocating its blocks on the
+    disk where possible, without moving the position of stream
+    """
+    stream.flush()
+    fd = stream.fileno()
+    current_size = os.fstat(fd).st_size
+    if size <= current_size:
+        return
+    if hasattr(os, 'posix_fallocate'):
+        try:
+            os.posix_fallocate(fd, current_size, size - current_size)
+            return
+        except OSError as err:
+            # Not supported by the filesystem
+            if err.errno not in (errno.EINVAL, errno.EOPNOTSUPP):
+                raise
+    position = stream.tell()
+    stream.truncate(size)
+    stream.seek(position)
+
+
 def timeconvert(timestr):
     """Convert RFC 2822 defined time string into system timestamp"""
     timestamp = None
@@ -508,6 +550,341 @@ def orderedSet(iterable):
     return res
 
 
+def concurrent_map(func, iterable, workers):
+    """
+    Like map(func, iterable), but with up to workers calls to func running
+    at the same time in separate threads. The results are yielded in the
+    order of iterable. Calls are only started for the items at most
+    2 * workers positions ahead of the last result yielded, so that a slow
+    consumer or a slow item doesn't let the other results pile up. Once a
+    call raises an exception, no new calls are started and the exception
+    is reraised in its place, after the calls that are still running
+    finish. Closing the generator early also waits for the running calls.
+    """
+    if workers <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    items = enumerate(iterable)
+    cond = threading.Condition()
+    results = {}
+    ahead = 2 * workers
+    # next: index of the next item, consumed: number of results yielded
+    state = {'running': workers, 'stopped': False, 'next': 0, 'consumed': 0}
+
+    def run():
+        try:
+            while True:
+                with cond:
+                    while not state['stopped'] and state['next'] >= state['consumed'] + ahead:
+                        cond.wait()
+                    if state['stopped']:
+                        break
+                    try:
+                        idx, item = next(items)
+                    except StopIteration:
+                        break
+                    state['next'] = idx + 1
+                try:
+                    res = (True, func(item))
+                except BaseException as e:
+                    res = (False, e)
+                with cond:
+                    results[idx] = res
+                    if not res[0]:
+                        state['stopped'] = True
+                    cond.notify_all()
+        finally:
+            with cond:
+                state['running'] -= 1
+                cond.notify_all()
+
+    for _ in range(workers):
+        t = threading.Thread(target=run)
+        t.daemon = True
+        t.start()
+
+    try:
+        for idx in itertools.count():
+            with cond:
+                while idx not in results and state['running']:
+                    cond.wait()
+                if idx not in results:
+                    break
+                ok, res = results.pop(idx)
+                state['consumed'] = idx + 1
+                cond.notify_all()
+                if not ok:
+                    while state['running']:
+                        cond.wait()
+            if not ok:
+                raise res
+            yield res
+    except GeneratorExit:
+        # The consumer stopped early: let the running calls finish
+        with cond:
+            state['stopped'] = True
+            while state['running']:
+                cond.wait()
+        raise
+    finally:
+        with cond:
+            state['stopped'] = True
+
+
+class WorkQueue(object):
+    """
+    Calls func(item) from up to workers threads for each item put into the
+    queue. put() blocks while maxsize items (by default, workers) are
+    waiting, so that producers can't get far ahead of the workers.
+
+    The first exception raised by func stops the queue: the waiting items
+    are dropped and the exception is reraised by put() and join().
+    """
+
+    def __init__(self, func, workers=1, maxsize=None):
+        self._func = func
+        self._maxsize = maxsize or workers
+        self._items = collections.deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._error = None
+        self._threads = []
+        for _ in range(workers):
+            t = threading.Thread(target=self._run)
+            t.daemon = True
+            t.start()
+            self._threads.append(t)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._items and not self._closed and self._error is None:
+                    self._cond.wait()
+                if self._error is not None or not self._items:
+                    return
+                item = self._items.popleft()
+                self._cond.notify_all()
+            try:
+                self._func(item)
+            except BaseException as e:
+                with self._cond:
+                    if self._error is None:
+                        self._error = e
+                    self._items.clear()
+                    self._cond.notify_all()
+
+    def put(self, item):
+        with self._cond:
+            while len(self._items) >= self._maxsize and self._error is None:
+                self._cond.wait()
+            if self._error is not None:
+                raise self._error
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def join(self):
+        """ Waits until all the items are processed and stops the workers """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        for t in self._threads:
+            t.join()
+        if self._error is not None:
+            raise self._error
+
+
+class HostLimiter(object):
+    """
+    Limits the number of jobs that run at the same time for each host, and
+    spaces the requests to each host by at least min_interval seconds.
+    """
+
+    def __init__(self, max_jobs=None, min_interval=None):
+        self._max_jobs = max_jobs
+        self._min_interval = min_interval
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._next_request = {}
+
+    @staticmethod
+    def _host(url):
+        return compat_urllib_parse_urlparse(url).hostname or ''
+
+    @contextlib.contextmanager
+    def job(self, url):
+        """ Context manager that waits for a free job slot for the host """
+        if not self._max_jobs:
+            yield
+            return
+        host = self._host(url)
+        with self._lock:
+            semaphore = self._semaphores.get(host)
+            if semaphore is None:
+                semaphore = self._semaphores[host] = threading.Semaphore(self._max_jobs)
+        with semaphore:
+            yield
+
+    def reserve(self, url):
+        """
+        Reserve the next request to the host of url and return the number of
+        seconds to wait before sending it
+        """
+        if not self._min_interval:
+            return 0
+        host = self._host(url)
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next_request.get(host, now))
+            self._next_request[host] = start + self._min_interval
+        return start - now
+
+
+class RetryPolicy(object):
+    """
+    Decides which errors are worth a retry and how long to wait before it:
+    exponentially longer after each attempt, with some jitter, or as long as
+    the Retry-After header of a 429 or 503 response asks.
+
+    It also keeps a circuit breaker for each host: after breaker_threshold
+    consecutive retryable errors, the requests to the host wait for
+    breaker_timeout seconds, so that a struggling server isn't hammered.
+    """
+
+    _RETRYABLE_ERRNOS = (
+        errno.ECONNABORTED, errno.ECONNREFUSED, errno.ECONNRESET,
+        errno.EHOSTUNREACH, errno.ENETUNREACH, errno.EPIPE, errno.ETIMEDOUT)
+
+    def __init__(self, backoff=1, max_backoff=60, breaker_threshold=5, breaker_timeout=30):
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._breaker_threshold = breaker_threshold
+        self._breaker_timeout = breaker_timeout
+        self._lock = threading.Lock()
+        # host -> number of consecutive errors
+        self._errors = {}
+        # host -> time until which its requests wait
+        self._open_until = {}
+
+    @staticmethod
+    def _host(url):
+        return compat_urllib_parse_urlparse(url).hostname or ''
+
+    def is_retryable(self, err):
+        if isinstance(err, compat_urllib_error.HTTPError):
+            return err.code >= 500 or err.code in (408, 429)
+        if isinstance(err, compat_urllib_error.URLError):
+            err = err.reason
+        if isinstance(err, socket.timeout):
+            return True
+        if isinstance(err, compat_http_client.HTTPException):
+            # BadStatusLine also covers the connections closed by the server
+            return isinstance(err, (compat_http_client.BadStatusLine, compat_http_client.IncompleteRead))
+        if isinstance(err, socket.error):
+            return err.errno in self._RETRYABLE_ERRNOS
+        return False
+
+    def retry_delay(self, err, attempt):
+        """ Number of seconds to wait before the retry number attempt (from 1) """
+        if isinstance(err, compat_urllib_error.HTTPError) and err.code in (429, 503):
+            retry_after = (err.hdrs or {}).get('Retry-After')
+            if retry_after:
+                retry_after = retry_after.strip()
+                if retry_after.isdigit():
+                    return float(retry_after)
+                retry_time = timeconvert(retry_after)
+                if retry_time is not None:
+                    return max(retry_time - time.time(), 0)
+        delay = min(self._backoff * 2 ** (attempt - 1), self._max_backoff)
+        # Spread the retries of concurrent downloads
+        return delay / 2.0 + random.uniform(0, delay / 2.0)
+
+    def host_delay(self, url):
+        """ Number of seconds to wait before sending a request to the host of url """
+        with self._lock:
+            return max(self._open_until.get(self._host(url), 0) - time.time(), 0)
+
+    def record_success(self, url):
+        host = self._host(url)
+        with self._lock:
+            self._errors.pop(host, None)
+            self._open_until.pop(host, None)
+
+    def record_error(self, url):
+        host = self._host(url)
+        with self._lock:
+            errors = self._errors[host] = self._errors.get(host, 0) + 1
+            if self._breaker_threshold and errors >= self._breaker_threshold:
+                self._open_until[host] = time.time() + self._breaker_timeout
+
+
+class BandwidthStream(object):
+    """ A download whose reads are scheduled by a BandwidthScheduler """
+
+    def __init__(self, weight=1):
+        self.weight = weight
+        # Virtual finish time of its last read
+        self.tag = 0
+
+
+class BandwidthScheduler(object):
+    """
+    Token buckets that limit the total download rate (in bytes per second)
+    of all the streams, and the rate of each host to host_rate. Up to burst
+    seconds of unused bandwidth can be spent at once.
+
+    When the total rate is exceeded, the reads are served by weighted fair
+    queueing: a stream with weight 2 gets twice the bandwidth of a stream
+    with weight 1.
+    """
+
+    def __init__(self, rate=None, host_rate=None, burst=1):
+        self.rate = rate
+        self.host_rate = host_rate
+        self._burst = burst
+        self._cond = threading.Condition()
+        # Time when the bucket is refilled after the reads so far
+        self._next = 0
+        self._host_next = {}
+        # Virtual time, the tag of the last served read
+        self._vtime = 0
+        self._queue = []
+        self._counter = itertools.count()
+
+    @property
+    def enabled(self):
+        return bool(self.rate or self.host_rate)
+
+    def consume(self, stream, url, nbytes):
+        """ Charge nbytes read by stream from url, and sleep while over the limits """
+        if self.host_rate:
+            host = compat_urllib_parse_urlparse(url).hostname or ''
+            with self._cond:
+                now = time.time()
+                host_next = max(self._host_next.get(host, 0), now - self._burst)
+                self._host_next[host] = host_next + nbytes / float(self.host_rate)
+            if host_next > now:
+                time.sleep(host_next - now)
+
+        if not self.rate:
+            return
+        with self._cond:
+            stream.tag = max(self._vtime, stream.tag) + nbytes / float(stream.weight)
+            entry = (stream.tag, next(self._counter))
+            heapq.heappush(self._queue, entry)
+            while True:
+                now = time.time()
+                is_first = self._queue[0] == entry
+                if is_first and self._next <= now:
+                    break
+                self._cond.wait(self._next - now if is_first else None)
+            heapq.heappop(self._queue)
+            self._vtime = stream.tag
+            self._next = max(self._next, now - self._burst) + nbytes / float(self.rate)
+            self._cond.notify_all()
+
+
 def _htmlentity_transform(entity_with_semicolon):
     """Transforms an HTML entity to a character."""
     entity = entity_with_semicolon[:-1]
@@ -627,13 +1004,96 @@ def formatSeconds(secs):
         return '%d' % secs
 
 
-def make_HTTPS_handler(params, **kwargs):
+class SSLSessionCache(object):
+    """
+    Keeps the last TLS session of each host, so that the next connections to
+    it can resume the session instead of doing a full handshake.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # host -> (session, weak reference to the socket it comes from)
+        self._sessions = {}
+        self.resumed = 0
+        self.full = 0
+
+    def get(self, host):
+        with self._lock:
+            entry = self._sessions.get(host)
+        if entry is None:
+            return None
+        session, sock_ref = entry
+        # With TLS 1.3 the session ticket is only received after the
+        # handshake, ask the socket again while it is open
+        sock = sock_ref()
+        if sock is not None and (session is None or not session.has_ticket):
+            session = sock.session or session
+        return session
+
+    def put(self, host, sock):
+        with self._lock:
+            if sock.session_reused:
+                self.resumed += 1
+            else:
+                self.full += 1
+            self._sessions[host] = (sock.session, weakref.ref(sock))
+
+    def update(self, host, session):
+        with self._lock:
+            if host in self._sessions and session is not None and session.has_ticket:
+                self._sessions[host] = (session, self._sessions[host][1])
+
+
+class _SessionCachingSSLSocket(ssl.SSLSocket):
+    _session_cache = None
+    _session_host = None
+
+    def _real_close(self):
+        # Keep the session ticket that arrived after the handshake
+        if self._session_cache is not None and self._sslobj is not None:
+            self._session_cache.update(self._session_host, self.session)
+        ssl.SSLSocket._real_close(self)
+
+
+class _SessionResumingSSLContext(object):
+    """ Wraps an SSLContext to resume the sessions stored in an SSLSessionCache """
+
+    def __init__(self, context, session_cache):
+        object.__setattr__(self, '_context', context)
+        object.__setattr__(self, '_session_cache', session_cache)
+        if hasattr(context, 'sslsocket_class'):  # Python >= 3.7
+            context.sslsocket_class = _SessionCachingSSLSocket
+
+    def __getattr__(self, name):
+        return getattr(self._context, name)
+
+    def __setattr__(self, name, value):
+        setattr(self._context, name, value)
+
+    def wrap_socket(self, sock, server_hostname=None, **kwargs):
+        if server_hostname is None or 'session' in kwargs:
+            return self._context.wrap_socket(sock, server_hostname=server_hostname, **kwargs)
+        session = self._session_cache.get(server_hostname)
+        if session is not None:
+            kwargs['session'] = session
+        ssl_sock = self._context.wrap_socket(sock, server_hostname=server_hostname, **kwargs)
+        self._session_cache.put(server_hostname, ssl_sock)
+        if isinstance(ssl_sock, _SessionCachingSSLSocket):
+            ssl_sock._session_cache = self._session_cache
+            ssl_sock._session_host = server_hostname
+        return ssl_sock
+
+
+def make_HTTPS_handler(params, ssl_session_cache=None, **kwargs):
     opts_no_check_certificate = params.get('nocheckcertificate', False)
     if hasattr(ssl, 'create_default_context'):  # Python >= 3.4 or 2.7.9
         context = ssl.create_default_context(ssl.Purpose.SERVER_AUTH)
         if opts_no_check_certificate:
             context.check_hostname = False
             context.verify_mode = ssl.CERT_NONE
+        # Python >= 3.6
+        if ssl_session_cache is not None and hasattr(ssl.SSLSocket, 'session'):
+            context = _SessionResumingSSLContext(context, ssl_session_cache)
         try:
             return YoutubeDLHTTPSHandler(params, context=context, **kwargs)
         except TypeError:
@@ -766,6 +1226,144 @@ class ContentTooShortError(Exception):
         self.expected = expected
 
 
+class DNSCache(object):
+    """ Keeps the addresses that each host resolved to for ttl seconds """
+
+    def __init__(self, ttl=60):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def resolve(self, host, port):
+        key = (host, port)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.time():
+                return entry[1]
+        addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        if self._ttl > 0:
+            with self._lock:
+                self._entries[key] = (time.time() + self._ttl, addrs)
+        return addrs
+
+    def invalidate(self, host, port):
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+
+def _interleave_address_families(addrs):
+    # Alternate between the families, starting with the preferred one
+    groups = []
+    for addr in addrs:
+        for group in groups:
+            if group[0][0] == addr[0]:
+                group.append(addr)
+                break
+        else:
+            groups.append([addr])
+    interleaved = []
+    while groups:
+        interleaved.extend(group.pop(0) for group in groups)
+        groups = [group for group in groups if group]
+    return interleaved
+
+
+def _connect_to_address(addr, timeout, source_address):
+    af, socktype, proto, canonname, sa = addr
+    sock = socket.socket(af, socktype, proto)
+    try:
+        if timeout is not socket._GLOBAL_DEFAULT_TIMEOUT:
+            sock.settimeout(timeout)
+        if source_address:
+            sock.bind(source_address)
+        sock.connect(sa)
+    except socket.error:
+        sock.close()
+        raise
+    return sock
+
+
+def _race_connections(addrs, timeout, source_address, delay):
+    """
+    Start a connection to the next address when the previous ones aren't
+    established after delay seconds (or have failed), and return the first
+    one that succeeds (RFC 8305)
+    """
+    cond = threading.Condition()
+    state = {'sock': None, 'pending': 0, 'next_start': 0, 'error': None}
+
+    def attempt(addr):
+        try:
+            sock = _connect_to_address(addr, timeout, source_address)
+        except socket.error as err:
+            with cond:
+                state['pending'] -= 1
+                state['error'] = err
+                state['next_start'] = 0
+                cond.notify_all()
+            return
+        with cond:
+            state['pending'] -= 1
+            if state['sock'] is None:
+                state['sock'] = sock
+                cond.notify_all()
+                return
+        # Another connection won
+        sock.close()
+
+    addrs = list(addrs)
+    with cond:
+        while state['sock'] is None:
+            now = time.time()
+            if addrs and now >= state['next_start']:
+                thread = threading.Thread(target=attempt, args=(addrs.pop(0),))
+                thread.daemon = True
+                thread.start()
+                state['pending'] += 1
+                state['next_start'] = now + delay
+            elif not addrs and not state['pending']:
+                raise state['error']
+            else:
+                cond.wait(state['next_start'] - now if addrs else None)
+        return state['sock']
+
+
+def create_connection(address, timeout=socket._GLOBAL_DEFAULT_TIMEOUT,
+                      source_address=None, dns_cache=None, race_delay=None):
+    """
+    Like socket.create_connection, but the addresses can be resolved with a
+    DNSCache and the connections to them raced, starting a new attempt every
+    race_delay seconds. Only the addresses of the family of source_address
+    are used.
+    """
+    host, port = address
+    if dns_cache is not None:
+        addrs = dns_cache.resolve(host, port)
+    else:
+        addrs = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+    if source_address:
+        family = socket.AF_INET6 if ':' in source_address[0] else socket.AF_INET
+        addrs = [addr for addr in addrs if addr[0] == family]
+    if not addrs:
+        raise socket.error('getaddrinfo returns no usable address')
+    addrs = _interleave_address_families(addrs)
+    try:
+        if race_delay is not None and len(addrs) > 1:
+            return _race_connections(addrs, timeout, source_address, race_delay)
+        err = None
+        for addr in addrs:
+            try:
+                return _connect_to_address(addr, timeout, source_address)
+            except socket.error as _:
+                err = _
+        raise err
+    except socket.error:
+        # The host may have moved, resolve it again for the next connection
+        if dns_cache is not None:
+            dns_cache.invalidate(host, port)
+        raise
+
+
 def _create_http_connection(ydl_handler, http_class, is_https, *args, **kwargs):
     # Working around python 2 bug (see http://bugs.python.org/issue17849) by limiting
     # expected HTTP responses to meet HTTP/1.0 or later (see also
@@ -790,9 +1388,26 @@ def _create_http_connection(ydl_handler, http_class, is_https, *args, **kwargs):
                     self.sock = sock
             hc.connect = functools.partial(_hc_connect, hc)
 
+    dns_cache = getattr(ydl_handler, '_dns_cache', None)
+    race_delay = 0.25 if ydl_handler._params.get('happy_eyeballs') else None
+    # Python 3 only, Python 2 resolves the host in connect()
+    if hasattr(hc, '_create_connection') and (dns_cache is not None or race_delay is not None):
+        hc._create_connection = functools.partial(
+            create_connection, dns_cache=dns_cache, race_delay=race_delay)
+
     return hc
 
 
+def make_http_headers(header_list):
+    """ Returns the headers of a response, like urllib's, from a list of
+    (name, value) pairs """
+    raw = ''.join('%s: %s\r\n' % (k, v) for k, v in header_list) + '\r\n'
+    fp = io.BytesIO(raw.encode('iso-8859-1'))
+    if sys.version_info < (3, 0):
+        return compat_http_client.HTTPMessage(fp)
+    return compat_http_client.parse_headers(fp)
+
+
 def handle_youtubedl_headers(headers):
     filtered_headers = headers
 
@@ -800,9 +1415,262 @@ def handle_youtubedl_headers(headers):
         filtered_headers = dict((k, v) for k, v in filtered_headers.items() if k.lower() != 'accept-encoding')
         del filtered_headers['Youtubedl-no-compression']
 
+    if 'Ytdl-http-cache' in filtered_headers:
+        # Left when no HTTP cache handles the request
+        filtered_headers = dict((k, v) for k, v in filtered_headers.items() if k != 'Ytdl-http-cache')
+
     return filtered_headers
 
 
+class _PooledHTTPResponse(compat_http_client.HTTPResponse):
+    """ Gives its connection back to the pool once the body is read """
+
+    _pool_release = None
+    _body_read = False
+
+    def _read_and_discard_trailer(self):
+        # Python 3: only called after the last chunk
+        compat_http_client.HTTPResponse._read_and_discard_trailer(self)
+        self._body_read = True
+
+    def _release_conn(self):
+        release, self._pool_release = self._pool_release, None
+        if release is not None:
+            release(not self.will_close and (self.length == 0 or self._body_read))
+
+    def _close_conn(self):
+        # Python 3: called when the body is read or the response is closed
+        compat_http_client.HTTPResponse._close_conn(self)
+        self._release_conn()
+
+    def close(self):
+        compat_http_client.HTTPResponse.close(self)
+        self._release_conn()
+
+
+class HTTPConnectionPool(object):
+    """
+    Keeps the connections of the HTTP(S) handlers open between requests.
+
+    Up to maxsize idle connections are kept, each for at most idle_timeout
+    seconds. A connection is given back once its response body has been
+    read, connections whose response is closed early are closed.
+    """
+
+    # Requests that can be sent again if the connection fails
+    _IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, maxsize=16, idle_timeout=30):
+        self._maxsize = maxsize
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # (key, connection, release time), the oldest first
+        self._idle = []
+
+    @staticmethod
+    def _is_dropped(conn):
+        if conn.sock is None:
+            return True
+        try:
+            # An idle connection is only readable when the server closed it
+            return bool(select.select([conn.sock], [], [], 0)[0])
+        except (select.error, socket.error, ValueError):
+            return True
+
+    def _acquire(self, key):
+        stale = []
+        conn = None
+        with self._lock:
+            now = time.time()
+            for i in range(len(self._idle) - 1, -1, -1):
+                idle_key, idle_conn, released = self._idle[i]
+                if now - released > self._idle_timeout:
+                    stale.append(idle_conn)
+                    del self._idle[i]
+                elif idle_key == key and conn is None:
+                    conn = idle_conn
+                    del self._idle[i]
+        for c in stale:
+            c.close()
+        if conn is not None and self._is_dropped(conn):
+            conn.close()
+            return self._acquire(key)
+        return conn
+
+    def _release(self, key, conn, reusable):
+        if not reusable or conn.sock is None:
+            conn.close()
+            return
+        with self._lock:
+            self._idle.append((key, conn, time.time()))
+            dropped = self._idle[:-self._maxsize]
+            del self._idle[:-self._maxsize]
+        for _, c, _ in dropped:
+            c.close()
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for _, conn, _ in idle:
+            conn.close()
+
+    def do_open(self, handler, http_class, req, key, **http_conn_args):
+        """
+        Like urllib's AbstractHTTPHandler.do_open, but sends the request over
+        an idle connection for the same key if there's one
+        """
+        host = req.get_host() if hasattr(req, 'get_host') else req.host
+        if not host:
+            raise compat_urllib_error.URLError('no host given')
+        tunnel_host = getattr(req, '_tunnel_host', None)
+        key = key + (host, tunnel_host)
+
+        headers = dict(req.unredirected_hdrs)
+        headers.update(dict(
+            (k, v) for k, v in req.headers.items() if k not in headers))
+        headers = dict((name.title(), val) for name, val in headers.items())
+        tunnel_headers = {}
+        if tunnel_host and 'Proxy-Authorization' in headers:
+            tunnel_headers['Proxy-Authorization'] = headers.pop('Proxy-Authorization')
+        request_kwargs = {}
+        if sys.version_info >= (3, 6):
+            request_kwargs['encode_chunked'] = req.has_header('Transfer-encoding')
+        selector = req.get_selector() if hasattr(req, 'get_selector') else req.selector
+
+        while True:
+            h = self._acquire(key)
+            reused = h is not None
+            if reused:
+                h.timeout = req.timeout
+                h.sock.settimeout(req.timeout)
+            else:
+                h = http_class(host, timeout=req.timeout, **http_conn_args)
+                h.response_class = _PooledHTTPResponse
+                if tunnel_host:
+                    h.set_tunnel(tunnel_host, headers=tunnel_headers)
+            h.set_debuglevel(handler._debuglevel)
+            sent = False
+            try:
+                try:
+                    h.request(req.get_method(), selector, req.data, headers, **request_kwargs)
+                    sent = True
+                except socket.error as err:  # timeout error
+                    raise compat_urllib_error.URLError(err)
+                r = h.getresponse()
+            except (compat_urllib_error.URLError, compat_http_client.BadStatusLine, socket.error) as err:
+                h.close()
+                # The server may have closed the idle connection, retry with
+                # a new one unless the request may have been processed
+                if (reused and not isinstance(getattr(err, 'reason', err), socket.timeout) and
+                        (not sent or req.get_method() in self._IDEMPOTENT_METHODS)):
+                    continue
+                raise
+            except BaseException:
+                h.close()
+                raise
+            break
+
+        r._pool_release = functools.partial(self._release, key, h)
+        if sys.version_info < (3, 0):
+            # Python 2 returns the response wrapped in an addinfourl
+            r.recv = r.read
+            fp = socket._fileobject(r, close=True)
+            resp = compat_urllib_request.addinfourl(fp, r.msg, req.get_full_url())
+            resp.code = r.status
+            resp.msg = r.reason
+            return resp
+        r.url = req.get_full_url()
+        r.msg = r.reason
+        return r
+
+
+class _DecompressingReader(io.RawIOBase):
+    """
+    Decodes a gzip or deflate encoded stream as it is read.
+
+    Concatenated gzip members are decoded one after the other, anything
+    else after the end of the compressed data is ignored.
+    """
+
+    _CHUNK_SIZE = 64 * 1024
+
+    def __init__(self, fp, encoding):
+        self._fp = fp
+        self._encoding = encoding
+        self._decompressor = None
+        # Compressed data not passed to the decompressor yet
+        self._pending = b''
+        # Whether the decompressor may hold more output without more input
+        self._full = False
+        # Decompressed data, read from self._pos
+        self._buf = b''
+        self._pos = 0
+        self._eof = False
+
+    def readable(self):
+        return True
+
+    def _new_decompressor(self, data):
+        if self._encoding == 'gzip':
+            wbits = 16 + zlib.MAX_WBITS
+        else:
+            # Some servers send raw deflate data instead of the zlib format
+            header = bytearray(data[:2])
+            is_zlib = (
+                len(header) == 2 and header[0] & 0x0f == 8 and
+                (header[0] << 8 | header[1]) % 31 == 0)
+            wbits = zlib.MAX_WBITS if is_zlib else -zlib.MAX_WBITS
+        return zlib.decompressobj(wbits)
+
+    def _decompress_some(self):
+        """ Returns at most _CHUNK_SIZE decompressed bytes, maybe none """
+        if not self._pending and not self._full:
+            data = self._fp.read(self._CHUNK_SIZE)
+            if not data:
+                self._eof = True
+                if self._decompressor is None:
+                    return b''
+                res = self._decompressor.flush()
+                # Python < 3.3 can't tell whether the compressed data ended
+                if not getattr(self._decompressor, 'eof', True):
+                    raise IOError('incomplete compressed body')
+                return res
+            self._pending = data
+        if self._decompressor is None:
+            self._decompressor = self._new_decompressor(self._pending)
+        res = self._decompressor.decompress(self._pending, self._CHUNK_SIZE)
+        self._full = len(res) == self._CHUNK_SIZE
+        self._pending = self._decompressor.unconsumed_tail
+        unused = self._decompressor.unused_data
+        if unused:
+            # The compressed data ended
+            self._full = False
+            if self._encoding == 'gzip' and unused.startswith(b'\x1f\x8b'):
+                self._decompressor = None
+                self._pending = unused
+            else:
+                self._pending = b''
+                self._eof = True
+        return res
+
+    def readinto(self, b):
+        try:
+            while self._pos >= len(self._buf) and not self._eof:
+                self._buf = self._decompress_some()
+                self._pos = 0
+        except zlib.error as err:
+            raise IOError('unable to decompress the response: %s' % err)
+        n = min(len(b), len(self._buf) - self._pos)
+        b[:n] = self._buf[self._pos:self._pos + n]
+        self._pos += n
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._fp.close()
+        io.RawIOBase.close(self)
+
+
 class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
     """Handler for HTTP requests and responses.
 
@@ -821,9 +1689,11 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
     public domain.
     """
 
-    def __init__(self, params, *args, **kwargs):
+    def __init__(self, params, conn_pool=None, dns_cache=None, *args, **kwargs):
         compat_urllib_request.HTTPHandler.__init__(self, *args, **kwargs)
         self._params = params
+        self._conn_pool = conn_pool
+        self._dns_cache = dns_cache
 
     def http_open(self, req):
         conn_class = compat_http_client.HTTPConnection
@@ -833,9 +1703,12 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
             del req.headers['Ytdl-socks-proxy']
 
-        return self.do_open(functools.partial(
-            _create_http_connection, self, conn_class, False),
-            req)
+        http_class = functools.partial(
+            _create_http_connection, self, conn_class, False)
+        if self._conn_pool is not None:
+            return self._conn_pool.do_open(
+                self, http_class, req, ('http', socks_proxy))
+        return self.do_open(http_class, req)
 
     @staticmethod
     def deflate(data):
@@ -885,31 +1758,13 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
 
     def http_response(self, req, resp):
         old_resp = resp
-        # gzip
-        if resp.headers.get('Content-encoding', '') == 'gzip':
-            content = resp.read()
-            gz = gzip.GzipFile(fileobj=io.BytesIO(content), mode='rb')
-            try:
-                uncompressed = io.BytesIO(gz.read())
-            except IOError as original_ioerror:
-                # There may be junk add the end of the file
-                # See http://stackoverflow.com/q/4928560/35070 for details
-                for i in range(1, 1024):
-                    try:
-                        gz = gzip.GzipFile(fileobj=io.BytesIO(content[:-i]), mode='rb')
-                        uncompressed = io.BytesIO(gz.read())
-                    except IOError:
-                        continue
-                    break
-                else:
-                    raise original_ioerror
-            resp = self.addinfourl_wrapper(uncompressed, old_resp.headers, old_resp.url, old_resp.code)
-            resp.msg = old_resp.msg
-            del resp.headers['Content-encoding']
-        # deflate
-        if resp.headers.get('Content-encoding', '') == 'deflate':
-            gz = io.BytesIO(self.deflate(resp.read()))
-            resp = self.addinfourl_wrapper(gz, old_resp.headers, old_resp.url, old_resp.code)
+        # gzip and deflate are decoded as the response is read. There may be
+        # junk at the end of the data, see
+        # http://stackoverflow.com/q/4928560/35070 for details
+        content_encoding = resp.headers.get('Content-encoding', '')
+        if content_encoding in ('gzip', 'deflate'):
+            stream = io.BufferedReader(_DecompressingReader(resp, content_encoding))
+            resp = self.addinfourl_wrapper(stream, old_resp.headers, old_resp.url, old_resp.code)
             resp.msg = old_resp.msg
             del resp.headers['Content-encoding']
         # Percent-encode redirect URL of Location HTTP header to satisfy RFC 3986 (see
@@ -934,10 +1789,24 @@ class YoutubeDLHandler(compat_urllib_request.HTTPHandler):
     https_response = http_response
 
 
+_socks_conn_classes = {}
+_socks_conn_classes_lock = threading.Lock()
+
+
 def make_socks_conn_class(base_class, socks_proxy):
     assert issubclass(base_class, (
         compat_http_client.HTTPConnection, compat_http_client.HTTPSConnection))
 
+    # The same class is returned for every request through the proxy
+    with _socks_conn_classes_lock:
+        conn_class = _socks_conn_classes.get((base_class, socks_proxy))
+        if conn_class is None:
+            conn_class = _socks_conn_classes[(base_class, socks_proxy)] = (
+                _make_socks_conn_class(base_class, socks_proxy))
+    return conn_class
+
+
+def _make_socks_conn_class(base_class, socks_proxy):
     url_components = compat_urlparse.urlparse(socks_proxy)
     if url_components.scheme.lower() == 'socks5':
         socks_type = ProxyType.SOCKS5
@@ -978,10 +1847,12 @@ def make_socks_conn_class(base_class, socks_proxy):
 
 
 class YoutubeDLHTTPSHandler(compat_urllib_request.HTTPSHandler):
-    def __init__(self, params, https_conn_class=None, *args, **kwargs):
+    def __init__(self, params, https_conn_class=None, conn_pool=None, dns_cache=None, *args, **kwargs):
         compat_urllib_request.HTTPSHandler.__init__(self, *args, **kwargs)
         self._https_conn_class = https_conn_class or compat_http_client.HTTPSConnection
         self._params = params
+        self._conn_pool = conn_pool
+        self._dns_cache = dns_cache
 
     def https_open(self, req):
         kwargs = {}
@@ -997,9 +1868,12 @@ class YoutubeDLHTTPSHandler(compat_urllib_request.HTTPSHandler):
             conn_class = make_socks_conn_class(conn_class, socks_proxy)
             del req.headers['Ytdl-socks-proxy']
 
-        return self.do_open(functools.partial(
-            _create_http_connection, self, conn_class, True),
-            req, **kwargs)
+        http_class = functools.partial(
+            _create_http_connection, self, conn_class, True)
+        if self._conn_pool is not None:
+            return self._conn_pool.do_open(
+                self, http_class, req, ('https', socks_proxy), **kwargs)
+        return self.do_open(http_class, req, **kwargs)
 
 
 class YoutubeDLCookieProcessor(compat_urllib_request.HTTPCookieProcessor):
@@ -1404,12 +2278,12 @@ else:
 
 class locked_file(object):
     def __init__(self, filename, mode, encoding=None):
-        assert mode in ['r', 'a', 'w']
+        assert mode in ['r', 'rb', 'a', 'w']
         self.f = io.open(filename, mode, encoding=encoding)
         self.mode = mode
 
     def __enter__(self):
-        exclusive = self.mode != 'r'
+        exclusive = not self.mode.startswith('r')
         try:
             _lock_file(self.f, exclusive)
         except IOError:
@@ -1432,6 +2306,9 @@ class locked_file(object):
     def read(self, *args):
         return self.f.read(*args)
 
+    def seek(self, *args):
+        return self.f.seek(*args)
+
 
 def get_filesystem_encoding():
     encoding = sys.getfilesystemencoding()
@@ -1783,6 +2660,14 @@ class PagedList(object):
         # This is only useful for tests
         return len(self.getslice())
 
+    def getslice(self, start=0, end=None):
+        return list(self.iterslice(start, end))
+
+    def iterslice(self, start=0, end=None):
+        """ Yield the entries in the slice, fetching each page only when it
+        is reached """
+        raise NotImplementedError('This method must be implemented by subclasses')
+
 
 class OnDemandPagedList(PagedList):
     def __init__(self, pagefunc, pagesize, use_cache=False):
@@ -1792,8 +2677,7 @@ class OnDemandPagedList(PagedList):
         if use_cache:
             self._cache = {}
 
-    def getslice(self, start=0, end=None):
-        res = []
+    def iterslice(self, start=0, end=None):
         for pagenum in itertools.count(start // self._pagesize):
             firstid = pagenum * self._pagesize
             nextfirstid = pagenum * self._pagesize + self._pagesize
@@ -1820,7 +2704,8 @@ class OnDemandPagedList(PagedList):
 
             if startv != 0 or endv is not None:
                 page_results = page_results[startv:endv]
-            res.extend(page_results)
+            for entry in page_results:
+                yield entry
 
             # A little optimization - if current page is not "full", ie. does
             # not contain page_size videos then we can assume that this page
@@ -1833,7 +2718,6 @@ class OnDemandPagedList(PagedList):
             # break out early as well
             if end == nextfirstid:
                 break
-        return res
 
 
 class InAdvancePagedList(PagedList):
@@ -1842,8 +2726,7 @@ class InAdvancePagedList(PagedList):
         self._pagecount = pagecount
         self._pagesize = pagesize
 
-    def getslice(self, start=0, end=None):
-        res = []
+    def iterslice(self, start=0, end=None):
         start_page = start // self._pagesize
         end_page = (
             self._pagecount if end is None else (end // self._pagesize + 1))
@@ -1859,10 +2742,11 @@ class InAdvancePagedList(PagedList):
                     only_more -= len(page)
                 else:
                     page = page[:only_more]
-                    res.extend(page)
+                    for entry in page:
+                        yield entry
                     break
-            res.extend(page)
-        return res
+            for entry in page:
+                yield entry
 
 
 def uppercase_escape(s):